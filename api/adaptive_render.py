@@ -0,0 +1,306 @@
+"""
+🧪 Adaptive Render Strategy
+Avval statik HTTP fetch, headless brauzer faqat client-rendered "shell" sahifalar uchun
+
+Statik HTML dan olinadigan signallar:
+- text density   - ko'rinadigan matn / HTML hajmi
+- empty roots    - bo'sh SPA root container lar (<div id="root">, #app, #__next, ...)
+- noscript       - "enable JavaScript" kabi ogohlantirishlar
+- scripts        - script teglar soni (bundle lar)
+
+Qaror domen bo'yicha eslab qolinadi (TTL bilan): shell ekanligi aniqlangan sayt
+keyingi safar statik fetch siz to'g'ridan-to'g'ri brauzerda ochiladi.
+"""
+
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from dom_extract import NodeVisitor, visit_document
+from html_parsers import HTMLDocument, HTMLElement
+from network_blocking import apply_blocking, resolve_profile
+from page_readiness import wait_until_ready
+from style_harvest import StyleHarvest, harvest_styles
+from url_normalize import parse_origin
+
+logger = logging.getLogger(__name__)
+
+# SPA framework lari mount qiladigan root container id lari
+SHELL_ROOT_IDS = frozenset(('root', 'app', '__next', '__nuxt', '___gatsby', 'svelte', 'main-app', 'application'))
+NOSCRIPT_MARKERS = ('enable javascript', 'javascript is required', 'requires javascript', 'turn on javascript',
+                    'javascript enabled', 'javascript to run this app', 'javascript disabled')
+SIGNAL_SKIP_TAGS = ('script', 'style', 'noscript', 'template')
+
+# Shell deb hisoblash chegaralari
+SHELL_MAX_TEXT = 500          # bo'sh root bo'lsa - shundan kam matn
+NOSCRIPT_MAX_TEXT = 1500      # noscript ogohlantirishi bo'lsa
+LOW_DENSITY = 0.02            # matn / HTML nisbati
+LOW_DENSITY_MAX_TEXT = 300
+LOW_DENSITY_MIN_SCRIPTS = 3
+
+STATIC = 'static'
+BROWSER = 'browser'
+
+MAX_RENDER_FAILURES = 3
+
+
+@dataclass
+class ShellSignals:
+    """Statik HTML dan olingan signallar"""
+    html_bytes: int
+    text_chars: int = 0
+    scripts: int = 0
+    elements: int = 0
+    empty_roots: List[str] = field(default_factory=list)
+    noscript_warning: bool = False
+
+    @property
+    def text_density(self) -> float:
+        return round(self.text_chars / self.html_bytes, 4) if self.html_bytes else 0.0
+
+    def to_dict(self):
+        return {
+            'html_bytes': self.html_bytes,
+            'text_chars': self.text_chars,
+            'text_density': self.text_density,
+            'scripts': self.scripts,
+            'elements': self.elements,
+            'empty_roots': self.empty_roots,
+            'noscript_warning': self.noscript_warning,
+        }
+
+
+@dataclass
+class RenderDecision:
+    """Statik natija yetarlimi yoki brauzer kerakmi"""
+    mode: str  # static | browser
+    reason: str
+    signals: Optional[ShellSignals] = None
+    remembered: bool = False
+
+    @property
+    def needs_browser(self) -> bool:
+        return self.mode == BROWSER
+
+    def to_dict(self):
+        return {
+            'mode': self.mode,
+            'reason': self.reason,
+            'remembered': self.remembered,
+            'signals': self.signals.to_dict() if self.signals else None,
+        }
+
+
+def _is_empty(element: HTMLElement) -> bool:
+    """Ichida matn ham, ko'rinadigan element ham yo'q (script / template hisobga olinmaydi)"""
+    for child in element.children():
+        if isinstance(child, str):
+            if child.strip():
+                return False
+        elif child.tag not in SIGNAL_SKIP_TAGS:
+            return False
+    return True
+
+
+class ShellSignalCollector(NodeVisitor):
+    """Signallarni yig'uvchi visitor (visit_document ga PageExtractor bilan birga ulanadi)"""
+
+    skip = frozenset(SIGNAL_SKIP_TAGS)
+
+    def __init__(self, html_bytes: int):
+        self.signals = ShellSignals(html_bytes=html_bytes)
+
+    def text(self, text: str):
+        self.signals.text_chars += len(text.strip())
+
+    def element(self, node: HTMLElement):
+        signals = self.signals
+        signals.elements += 1
+        tag = node.tag
+        if tag == 'script':
+            signals.scripts += 1
+        elif tag == 'noscript' and not signals.noscript_warning:
+            text = node.text().lower()
+            signals.noscript_warning = any(marker in text for marker in NOSCRIPT_MARKERS)
+        else:
+            element_id = node.get('id')
+            if element_id and element_id.lower() in SHELL_ROOT_IDS and _is_empty(node):
+                signals.empty_roots.append(element_id.lower())
+
+
+def collect_signals(doc: HTMLDocument, html_bytes: int) -> ShellSignals:
+    """Document ni bir marta aylanib signallarni yig'ish"""
+    collector = ShellSignalCollector(html_bytes)
+    visit_document(doc, [collector])
+    return collector.signals
+
+
+def classify(signals: ShellSignals) -> RenderDecision:
+    """Signallar bo'yicha qaror"""
+    if signals.empty_roots and signals.text_chars < SHELL_MAX_TEXT:
+        return RenderDecision(BROWSER, f"empty root #{signals.empty_roots[0]}", signals)
+    if signals.noscript_warning and signals.text_chars < NOSCRIPT_MAX_TEXT:
+        return RenderDecision(BROWSER, 'noscript warning', signals)
+    if (
+        signals.text_density < LOW_DENSITY
+        and signals.text_chars < LOW_DENSITY_MAX_TEXT
+        and signals.scripts >= LOW_DENSITY_MIN_SCRIPTS
+    ):
+        return RenderDecision(BROWSER, 'low text density', signals)
+    return RenderDecision(STATIC, 'server-rendered', signals)
+
+
+class DomainMemory:
+    """Sayt -> oxirgi qaror (LRU, TTL bilan)"""
+
+    def __init__(self, max_entries: Optional[int] = None, ttl: Optional[float] = None):
+        self.max_entries = max_entries or int(os.getenv('RENDER_MEMORY_ENTRIES', 5000))
+        self.ttl = ttl if ttl is not None else float(os.getenv('RENDER_MEMORY_TTL', 86400))
+        self._data: 'OrderedDict[str, Tuple[str, str, float]]' = OrderedDict()  # site -> (mode, reason, decided_at)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _site(url: str) -> Optional[str]:
+        origin = parse_origin(url)
+        return origin.site if origin else None
+
+    def get(self, url: str) -> Optional[RenderDecision]:
+        site = self._site(url)
+        if not site:
+            return None
+        with self._lock:
+            item = self._data.get(site)
+            if item is None:
+                return None
+            if time.time() - item[2] > self.ttl:
+                del self._data[site]
+                return None
+            self._data.move_to_end(site)
+        return RenderDecision(item[0], item[1], remembered=True)
+
+    def put(self, url: str, decision: RenderDecision):
+        site = self._site(url)
+        if not site:
+            return
+        with self._lock:
+            self._data[site] = (decision.mode, decision.reason, time.time())
+            self._data.move_to_end(site)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def forget(self, url: str):
+        site = self._site(url)
+        with self._lock:
+            self._data.pop(site, None)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            modes = [mode for mode, _, _ in self._data.values()]
+        return {'domains': len(modes), 'browser': modes.count(BROWSER), 'static': modes.count(STATIC)}
+
+
+class BrowserRenderer:
+    """Pool dagi headless Chrome da sahifani render qilib outerHTML olish"""
+
+    def __init__(self, pool, blocking: str = 'trackers,media'):
+        self.pool = pool
+        self.blocking = resolve_profile(os.getenv('RENDER_BLOCK_PROFILE', blocking))
+        self._lock = threading.Lock()  # render lar executor thread larida parallel
+        self.counters = {'rendered': 0, 'errors': 0}
+        # Render lar uchun alohida executor - pool hajmidan ortiq thread brauzer kutib bloklanmaydi
+        # va default executor (parse, cache I/O) band bo'lib qolmaydi
+        self.executor = ThreadPoolExecutor(max_workers=pool.size, thread_name_prefix='browser-render')
+
+    def render(self, url: str) -> Tuple[str, bytes, Optional[StyleHarvest]]:
+        """URL -> (final_url, render qilingan HTML bytes, computed style lar)"""
+        started = time.time()
+        try:
+            with self.pool.page() as driver:
+                apply_blocking(driver, self.blocking)
+                driver.get(url)
+                wait_until_ready(driver)
+                html = driver.execute_script('return document.documentElement.outerHTML') or ''
+                final_url = driver.current_url or url
+                # Design token lar uchun - xuddi shu sessiyada bitta execute_script
+                harvest = harvest_styles(driver)
+        except Exception:
+            with self._lock:
+                self.counters['errors'] += 1
+            raise
+        with self._lock:
+            self.counters['rendered'] += 1
+        logger.info(f"🧪 Rendered in browser ({time.time() - started:.2f}s): {url}")
+        return final_url, html.encode('utf-8'), harvest
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self.counters)
+
+
+class AdaptiveRenderer:
+    """Statik natijani baholash, kerak bo'lsa brauzerga o'tish va qarorni eslab qolish"""
+
+    def __init__(self, renderer: Optional[BrowserRenderer] = None, memory: Optional[DomainMemory] = None,
+                 cooldown: Optional[float] = None):
+        self.renderer = renderer
+        self.memory = memory or DomainMemory()
+        # Ketma-ket xatoliklardan keyin (Chrome yo'q, crash) brauzer vaqtincha o'chiriladi
+        self.cooldown = cooldown if cooldown is not None else float(os.getenv('RENDER_FAILURE_COOLDOWN', 300))
+        self._failures = 0
+        self._disabled_until = 0.0
+        self._lock = threading.Lock()  # render lar parallel thread larda
+        self.counters = {'static': 0, 'escalated': 0, 'direct': 0, 'fallback': 0}
+
+    @property
+    def enabled(self) -> bool:
+        return self.renderer is not None
+
+    @property
+    def executor(self) -> Optional[ThreadPoolExecutor]:
+        """render() ni shu executor da chaqirish kerak (brauzer pool i hajmida)"""
+        return self.renderer.executor if self.renderer else None
+
+    def remembered(self, url: str) -> Optional[RenderDecision]:
+        """Domen uchun avval brauzer kerak deb topilganmi (statik fetch ni o'tkazib yuborish uchun)"""
+        decision = self.memory.get(url) if self.enabled else None
+        return decision if decision and decision.needs_browser else None
+
+    def decide(self, url: str, signals: ShellSignals) -> RenderDecision:
+        """Statik document signallari bo'yicha qaror (va uni eslab qolish)"""
+        decision = classify(signals)
+        self.memory.put(url, decision)
+        if decision.needs_browser:
+            logger.info(f"🧪 Client-rendered shell detected ({decision.reason}): {url}")
+        return decision
+
+    def render(self, url: str) -> Tuple[str, bytes, Optional[StyleHarvest]]:
+        """Brauzerda render qilish - xatolikda exception (chaqiruvchi statik natijaga qaytadi)"""
+        with self._lock:
+            if time.time() < self._disabled_until:
+                raise RuntimeError('Browser rendering is temporarily disabled after repeated failures')
+        try:
+            result = self.renderer.render(url)
+        except Exception as e:
+            with self._lock:
+                self._failures += 1
+                if self._failures >= MAX_RENDER_FAILURES:
+                    self._disabled_until = time.time() + self.cooldown
+                    self._failures = 0
+                    logger.warning(f"⚠️ Browser rendering disabled for {self.cooldown:.0f}s: {str(e)}")
+            raise
+        with self._lock:
+            self._failures = 0
+        return result
+
+    def stats(self) -> Dict:
+        return {
+            'enabled': self.enabled,
+            **self.counters,
+            'memory': self.memory.stats(),
+            'renderer': self.renderer.stats() if self.renderer else None,
+        }
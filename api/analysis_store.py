@@ -0,0 +1,152 @@
+"""
+🧬 Content-addressed Analysis Store
+Bir xil kontentli sahifalar uchun AI analysis va component larni qayta ishlatish
+
+Kalit - sahifaning normalizatsiya qilingan kontent hash i (URL emas), shuning uchun
+www / apex, tracking parametrlar yoki mirror lar orqali kelgan bir xil sahifa
+scrape dan keyin darhol saqlangan natijani oladi.
+
+Ko'rinadigan matni juda kam sahifalar (client-rendered shell: bo'sh #root + bir xil boilerplate)
+uchun hash berilmaydi - ular bir-biridan farqlanmaydi, natija saqlanmaydi va qaytarilmaydi.
+
+Normalizatsiya:
+- script / style / noscript / template tashlanadi
+- matndagi bo'sh joylar yig'iladi
+- o'zgaruvchan atributlar (nonce, csrf, ...) va canonical / og:url tashlanadi
+- sahifaning o'z host iga (www bilan yoki siz) ishora qiluvchi absolute URL lar nisbiy qilinadi
+"""
+
+import hashlib
+import logging
+import os
+import time
+from typing import Dict, List, Optional
+
+from disk_store import DiskStore
+from dom_extract import NodeVisitor, visit_document
+from html_parsers import HTMLDocument, HTMLElement
+from url_normalize import parse_origin
+
+logger = logging.getLogger(__name__)
+
+FINGERPRINT_VERSION = 'v2'
+
+# Bundan kam ko'rinadigan matnli sahifa - fingerprint yo'q (shell lar to'qnashmasligi uchun)
+MIN_FINGERPRINT_TEXT_CHARS = int(os.getenv('ANALYSIS_MIN_TEXT_CHARS', 100))
+
+FINGERPRINT_SKIP_TAGS = ('script', 'style', 'noscript', 'template')
+
+# Har so'rovda o'zgaradigan yoki URL ga bog'liq atributlar
+VOLATILE_ATTRIBUTES = frozenset((
+    'nonce', 'integrity', 'data-reactid', 'data-react-checksum', 'data-csrf', 'data-token',
+    'data-request-id', 'data-timestamp',
+))
+URL_ATTRIBUTES = frozenset(('href', 'src', 'action', 'poster', 'data-src', 'content'))
+VOLATILE_META = frozenset(('og:url', 'csrf-token', 'csrf-param', 'twitter:url'))
+VOLATILE_LINK_RELS = frozenset(('canonical', 'alternate', 'shortlink'))
+# HTML5 parser lar (selectolax) o'zi qo'shadigan wrapper lar - hash backend ga bog'liq bo'lmasligi uchun
+IMPLIED_TAGS = frozenset(('tbody',))
+
+
+def _is_volatile_element(element: HTMLElement) -> bool:
+    if element.tag == 'meta':
+        name = (element.get('property') or element.get('name') or '').lower()
+        return name in VOLATILE_META
+    if element.tag == 'link':
+        rels = set((element.get('rel') or '').lower().split())
+        return bool(rels & VOLATILE_LINK_RELS)
+    return element.tag == 'base'
+
+
+class ContentFingerprint(NodeVisitor):
+    """Normalizatsiya qilingan kontent hash i - visit_document ga ulanadigan visitor"""
+
+    skip = frozenset(FINGERPRINT_SKIP_TAGS)
+
+    def __init__(self, url: str, min_text_chars: Optional[int] = None):
+        self.page_origin = parse_origin(url)
+        self.min_text_chars = MIN_FINGERPRINT_TEXT_CHARS if min_text_chars is None else min_text_chars
+        self.text_chars = 0
+        self.digest = hashlib.sha256(FINGERPRINT_VERSION.encode('utf-8'))
+
+    def _local_url(self, value: str) -> str:
+        if '//' not in value:
+            return value
+        absolute = 'https:' + value if value.startswith('//') else value
+        origin = parse_origin(absolute)
+        if origin is not None and self.page_origin is not None and origin.same_site(self.page_origin):
+            # scheme://host[:port] qismini olib tashlash
+            return '/' + absolute.split('://', 1)[1].partition('/')[2]
+        return value
+
+    def text(self, text: str):
+        text = ' '.join(text.split())
+        if text:
+            self.text_chars += len(text)
+            self.digest.update(b'T' + text.encode('utf-8') + b'\x00')
+
+    def element(self, node: HTMLElement):
+        if node.tag in FINGERPRINT_SKIP_TAGS or node.tag in IMPLIED_TAGS or _is_volatile_element(node):
+            return
+        attributes = []
+        for name, value in node.attributes():
+            name = name.lower()
+            if name in VOLATILE_ATTRIBUTES or 'csrf' in name:
+                continue
+            if value and name in URL_ATTRIBUTES:
+                value = self._local_url(value)
+            attributes.append(f'{name}={value or ""}')
+        attributes.sort()
+        self.digest.update(f'E{node.tag} {" ".join(attributes)}'.encode('utf-8') + b'\x00')
+
+    def hexdigest(self) -> str:
+        """sha256 hex - ko'rinadigan matn min_text_chars dan kam bo'lsa '' (store ishlatilmaydi)"""
+        if self.text_chars < self.min_text_chars:
+            return ''
+        return self.digest.hexdigest()
+
+
+def content_fingerprint(doc: HTMLDocument, url: str, min_text_chars: Optional[int] = None) -> str:
+    """Normalizatsiya qilingan kontent hash i (sha256 hex, shell lar uchun '')"""
+    fingerprint = ContentFingerprint(url, min_text_chars)
+    visit_document(doc, [fingerprint])
+    return fingerprint.hexdigest()
+
+
+class AnalysisStore:
+    """Kontent hash -> analysis + component lar (disk, LRU eviction)"""
+
+    def __init__(self, directory: Optional[str] = None, max_bytes: Optional[int] = None):
+        directory = directory or os.getenv(
+            'ANALYSIS_STORE_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cache', 'analysis')
+        )
+        max_bytes = max_bytes or int(os.getenv('ANALYSIS_STORE_MAX_MB', 256)) * 1024 * 1024
+        self.store = DiskStore(directory, max_bytes)
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, content_hash: str) -> Optional[Dict]:
+        """Saqlangan natija: {'url', 'stored_at', 'analysis', 'components'} yoki None"""
+        if not content_hash:
+            return None
+        item = self.store.get(content_hash)
+        if item is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return item[0]
+
+    def put(self, content_hash: str, url: str, analysis: Dict, components: List[Dict]):
+        """Natijani saqlash - fallback (AI siz) analysis lar saqlanmaydi"""
+        if not content_hash or analysis.get('ai_provider') == 'fallback':
+            return
+        self.store.put(content_hash, {
+            'url': url,
+            'stored_at': time.time(),
+            'analysis': analysis,
+            'components': components,
+        })
+        logger.info(f"🧬 Stored analysis for content {content_hash[:12]} ({url})")
+
+    def stats(self) -> Dict[str, int]:
+        return {**self.store.stats(), 'hits': self.hits, 'misses': self.misses}
@@ -0,0 +1,176 @@
+"""
+📦 Batch Website Analysis Pipeline
+Ko'p URL ni parallel qayta ishlash: scrape → AI analysis → component generation
+
+- Scraping fetch engine loop ida async bajariladi (SCRAPE concurrency limit)
+- AI chaqiruvlari alohida thread pool da (LLM concurrency limit)
+- URL scrape dan oldin LLM slot ini oladi (LLM concurrency + navbat hajmi): navbat to'lsa yangi
+  scrape lar boshlanmaydi, shuning uchun LLM kutayotgan website_data lar soni shu hajmdan oshmaydi
+- Natijalar har bir URL tugashi bilan qaytariladi (NDJSON streaming uchun)
+"""
+
+import asyncio
+import logging
+import os
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict
+from typing import Dict, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+_DONE = object()
+
+# Natija kutilayotganda batch coroutine holatini tekshirish oralig'i (sekund)
+RESULT_POLL_SECONDS = 1.0
+
+
+class BatchPipeline:
+    """Scraping va LLM uchun alohida limitli ishchi pool"""
+
+    def __init__(
+        self,
+        scraper,
+        ai_generator,
+        scrape_concurrency: Optional[int] = None,
+        llm_concurrency: Optional[int] = None,
+        llm_queue_size: Optional[int] = None,
+        analysis_store=None,
+    ):
+        self.scraper = scraper
+        self.ai_generator = ai_generator
+        self.analysis_store = analysis_store
+        self.scrape_concurrency = scrape_concurrency or int(os.getenv('BATCH_SCRAPE_CONCURRENCY', 32))
+        self.llm_concurrency = llm_concurrency or int(os.getenv('BATCH_LLM_CONCURRENCY', 4))
+        self.llm_queue_size = llm_queue_size or int(os.getenv('BATCH_LLM_QUEUE_SIZE', self.llm_concurrency * 2))
+
+        # Barcha limitlar barcha batch lar uchun umumiy
+        self._llm_pool = ThreadPoolExecutor(max_workers=self.llm_concurrency, thread_name_prefix='batch-llm')
+        self._scrape_semaphore: Optional[asyncio.Semaphore] = None
+        # Bir vaqtda ishlanayotgan URL lar (scrape + LLM kutish + analysis) soni
+        self._llm_semaphore: Optional[asyncio.Semaphore] = None
+
+    def run(self, urls: List[str]) -> Iterator[Dict]:
+        """URL larni qayta ishlash - natijalar tugash tartibida qaytadi"""
+        results: 'queue.Queue' = queue.Queue()
+        cancelled = threading.Event()
+        started = time.time()
+        seen = set()
+
+        future = self.scraper.engine.submit(self._scrape_all(urls, results, cancelled))
+        # Coroutine qanday tugashidan qat'i nazar (xatolik bilan ham) - generator uyg'onadi
+        future.add_done_callback(lambda _: results.put(_DONE))
+        try:
+            while len(seen) < len(urls):
+                try:
+                    item = results.get(timeout=RESULT_POLL_SECONDS)
+                except queue.Empty:
+                    if not future.done():
+                        continue
+                    item = _DONE
+                if item is _DONE:
+                    # Barcha natijalar _DONE dan oldin navbatga qo'yiladi - qolganlari endi kelmaydi
+                    yield from self._unfinished(urls, seen, future, started)
+                    return
+                seen.add(item['index'])
+                yield item
+        finally:
+            # Client uzilib qolsa - qolgan ishlarni to'xtatish
+            pending = len(urls) - len(seen)
+            if pending:
+                cancelled.set()
+                future.cancel()
+                logger.info(f"🛑 Batch cancelled with {pending} URLs pending")
+
+    def _unfinished(self, urls: List[str], seen: set, future, started: float) -> Iterator[Dict]:
+        """Batch coroutine tugagan, lekin natijasi kelmagan URL lar - xatolik sifatida"""
+        error = None if future.cancelled() else future.exception()
+        if error is None:
+            error = RuntimeError('batch finished without a result for this URL')
+        for index, url in enumerate(urls):
+            if index not in seen:
+                seen.add(index)
+                yield self._error(index, url, 'batch', error, started)
+
+    async def _scrape_all(self, urls: List[str], results: 'queue.Queue', cancelled: threading.Event):
+        if self._scrape_semaphore is None:
+            self._scrape_semaphore = asyncio.Semaphore(self.scrape_concurrency)
+            self._llm_semaphore = asyncio.Semaphore(self.llm_concurrency + self.llm_queue_size)
+        await asyncio.gather(*(
+            self._scrape_one(index, url, results, cancelled)
+            for index, url in enumerate(urls)
+        ))
+
+    async def _scrape_one(self, index: int, url: str, results: 'queue.Queue', cancelled: threading.Event):
+        started = time.time()
+        # LLM slot i scrape dan oldin olinadi va analysis tugaguncha ushlab turiladi -
+        # navbat to'la bo'lsa scrape boshlanmaydi
+        async with self._llm_semaphore:
+            async with self._scrape_semaphore:
+                if cancelled.is_set():
+                    return
+                try:
+                    website_data = await self.scraper.scrape_website_async(url)
+                except Exception as e:
+                    results.put(self._error(index, url, 'scrape', e, started))
+                    return
+
+            scrape_time = time.time() - started
+            if cancelled.is_set():
+                return
+            await asyncio.wrap_future(self._llm_pool.submit(
+                self._analyze_one, index, url, website_data, results, cancelled, started, scrape_time
+            ))
+
+    def _analyze_one(self, index, url, website_data, results, cancelled, started, scrape_time):
+        if cancelled.is_set():
+            return
+        try:
+            llm_started = time.time()
+            store = self.analysis_store
+            stored = store.get(website_data.content_hash) if store else None
+            if stored:
+                analysis, components = stored['analysis'], stored['components']
+            else:
+                analysis = self.ai_generator.analyze_website(website_data)
+                components = [asdict(comp) for comp in self.ai_generator.generate_components(analysis)]
+                if store:
+                    store.put(website_data.content_hash, url, analysis, components)
+            results.put({
+                'index': index,
+                'url': url,
+                'success': True,
+                'analysis': analysis,
+                'components': components,
+                'website_data': {
+                    'title': website_data.title,
+                    'meta_data': website_data.meta_data,
+                    'links_count': len(website_data.links),
+                    'images_count': len(website_data.images)
+                },
+                'stats': {
+                    'total_components': len(components),
+                    'scrape_time': round(scrape_time, 3),
+                    'ai_time': round(time.time() - llm_started, 3),
+                    'ai_provider': analysis.get('ai_provider', 'unknown'),
+                    'from_store': stored is not None
+                },
+                'timestamp': int(time.time())
+            })
+        except Exception as e:
+            results.put(self._error(index, url, 'analysis', e, started))
+
+    @staticmethod
+    def _error(index: int, url: str, stage: str, error: Exception, started: float) -> Dict:
+        logger.error(f"❌ Batch item failed ({stage}) {url}: {str(error)}")
+        return {
+            'index': index,
+            'url': url,
+            'success': False,
+            'stage': stage,
+            'error': str(error),
+            'stats': {'elapsed': round(time.time() - started, 3)},
+            'timestamp': int(time.time())
+        }
@@ -0,0 +1,301 @@
+"""
+🧭 Headless Browser Pool
+Screenshot lar uchun oldindan ishga tushirilgan Chrome sessiyalari pool i
+
+- Har so'rov uchun alohida izolyatsiyalangan browser context (CDP Target.createBrowserContext) -
+  cookie, localStorage, cache so'rovlar orasida bo'lishilmaydi
+- Sessiya berilishidan oldin health check
+- N marta ishlatilgandan keyin yoki xotira o'sib ketganda (psutil bo'lsa) qayta ishga tushirish
+- Pool band bo'lsa so'rovlar navbatda kutadi (timeout bilan)
+"""
+
+import atexit
+import logging
+import os
+import queue
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, Optional
+
+try:
+    import psutil
+except ImportError:  # pragma: no cover - ixtiyoriy
+    psutil = None
+
+logger = logging.getLogger(__name__)
+
+
+def create_chrome_driver():
+    """Headless Chrome WebDriver (pool lar uchun factory)"""
+    # selenium faqat brauzer kerak bo'lganda import qilinadi
+    from selenium import webdriver
+    from selenium.webdriver.chrome.options import Options
+
+    chrome_options = Options()
+
+    # Headless mode
+    if os.getenv('HEADLESS_MODE', 'true').lower() == 'true':
+        chrome_options.add_argument('--headless')
+
+    # Performance optimizations
+    chrome_options.add_argument('--no-sandbox')
+    chrome_options.add_argument('--disable-dev-shm-usage')
+    chrome_options.add_argument('--disable-gpu')
+    chrome_options.add_argument('--disable-extensions')
+    chrome_options.add_argument('--disable-logging')
+    chrome_options.add_argument('--silent')
+    chrome_options.add_argument('--window-size=1920,1080')
+    chrome_options.add_argument('--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36')
+
+    # Network event lar (bloklangan so'rovlar sonini hisoblash uchun)
+    chrome_options.set_capability('goog:loggingPrefs', {'performance': 'ALL'})
+    chrome_options.add_experimental_option('perfLoggingPrefs', {'enableNetwork': True, 'enablePage': False})
+
+    # Chrome driver path
+    chrome_driver_path = os.getenv('CHROME_DRIVER_PATH')
+    if chrome_driver_path:
+        return webdriver.Chrome(service=webdriver.ChromeService(chrome_driver_path), options=chrome_options)
+    else:
+        return webdriver.Chrome(options=chrome_options)
+
+
+class BrowserPoolTimeout(Exception):
+    """Belgilangan vaqt ichida bo'sh browser topilmadi"""
+
+
+class BrowserSession:
+    """Bitta Chrome jarayoni va uning WebDriver i"""
+
+    def __init__(self, driver, session_id: int):
+        self.driver = driver
+        self.id = session_id
+        self.created_at = time.time()
+        self.uses = 0
+        self.base_handle = driver.current_window_handle
+        self.baseline_rss = self.rss()
+
+    def rss(self) -> Optional[int]:
+        """chromedriver va barcha Chrome jarayonlari xotirasi (psutil bo'lmasa None)"""
+        if psutil is None:
+            return None
+        try:
+            process = psutil.Process(self.driver.service.process.pid)
+            total = process.memory_info().rss
+            for child in process.children(recursive=True):
+                try:
+                    total += child.memory_info().rss
+                except psutil.Error:
+                    continue
+            return total
+        except (psutil.Error, AttributeError):
+            return None
+
+    def healthy(self) -> bool:
+        try:
+            self.driver.switch_to.window(self.base_handle)
+            return self.driver.execute_script('return 1') == 1
+        except Exception:
+            return False
+
+    def quit(self):
+        try:
+            self.driver.quit()
+        except Exception as e:
+            logger.debug(f"Browser quit failed: {str(e)}")
+
+
+class BrowserPool:
+    """Chrome sessiyalari pool i (thread-safe)"""
+
+    def __init__(
+        self,
+        factory: Callable[[], object],
+        size: Optional[int] = None,
+        max_uses: Optional[int] = None,
+        max_rss_growth_mb: Optional[int] = None,
+        acquire_timeout: Optional[float] = None,
+        window_size=(1920, 1080),
+    ):
+        self.factory = factory
+        self.size = size or int(os.getenv('BROWSER_POOL_SIZE', 2))
+        self.max_uses = max_uses or int(os.getenv('BROWSER_POOL_MAX_USES', 50))
+        self.max_rss_growth = (max_rss_growth_mb or int(os.getenv('BROWSER_POOL_MAX_RSS_GROWTH_MB', 512))) * 1024 * 1024
+        self.acquire_timeout = acquire_timeout or float(os.getenv('BROWSER_POOL_ACQUIRE_TIMEOUT', 30))
+        self.window_size = window_size
+
+        self._idle: 'queue.LifoQueue[BrowserSession]' = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(self.size)
+        self._lock = threading.Lock()
+        self._sessions: Dict[int, BrowserSession] = {}
+        self._next_id = 0
+        self._closed = False
+        self.stats_counters = {'launched': 0, 'recycled': 0, 'unhealthy': 0, 'served': 0, 'waited': 0, 'timeouts': 0}
+        atexit.register(self.close)
+
+    # Sessiya hayot sikli
+    def _launch(self) -> BrowserSession:
+        started = time.time()
+        driver = self.factory()
+        with self._lock:
+            self._next_id += 1
+            session = BrowserSession(driver, self._next_id)
+            self._sessions[session.id] = session
+            self.stats_counters['launched'] += 1
+        logger.info(f"🧭 Browser #{session.id} launched in {time.time() - started:.2f}s")
+        return session
+
+    def _discard(self, session: BrowserSession, reason: str):
+        with self._lock:
+            self._sessions.pop(session.id, None)
+            self.stats_counters['recycled' if reason != 'unhealthy' else 'unhealthy'] += 1
+        logger.info(f"♻️ Browser #{session.id} recycled ({reason}, uses={session.uses})")
+        session.quit()
+
+    def _needs_recycle(self, session: BrowserSession) -> Optional[str]:
+        if session.uses >= self.max_uses:
+            return 'max_uses'
+        if session.baseline_rss is not None:
+            rss = session.rss()
+            if rss is not None and rss - session.baseline_rss > self.max_rss_growth:
+                return 'memory'
+        return None
+
+    def prewarm(self, count: Optional[int] = None):
+        """Sessiyalarni oldindan ishga tushirish (background thread da chaqirish mumkin)"""
+        for _ in range(min(count or self.size, self.size)):
+            if not self._slots.acquire(blocking=False):
+                return
+            try:
+                with self._lock:
+                    if len(self._sessions) >= self.size:
+                        return
+                self._idle.put(self._launch())
+            except Exception as e:
+                logger.warning(f"⚠️ Browser prewarm failed: {str(e)}")
+                return
+            finally:
+                self._slots.release()
+
+    def _acquire(self, timeout: float) -> BrowserSession:
+        started = time.monotonic()
+        if not self._slots.acquire(blocking=False):
+            # Hamma browser band - navbatda kutish
+            with self._lock:
+                self.stats_counters['waited'] += 1
+            if not self._slots.acquire(timeout=timeout):
+                with self._lock:
+                    self.stats_counters['timeouts'] += 1
+                raise BrowserPoolTimeout(f"No browser available within {timeout:g}s (pool size {self.size})")
+        try:
+            while True:
+                try:
+                    session = self._idle.get_nowait()
+                except queue.Empty:
+                    session = self._launch()
+                if session.healthy():
+                    break
+                self._discard(session, 'unhealthy')
+                if time.monotonic() - started > timeout:
+                    raise BrowserPoolTimeout("Browser health check kept failing")
+            return session
+        except BaseException:
+            self._slots.release()
+            raise
+
+    def _release(self, session: BrowserSession, broken: bool = False):
+        try:
+            reason = 'error' if broken else self._needs_recycle(session)
+            if reason or self._closed:
+                self._discard(session, reason or 'shutdown')
+            else:
+                self._idle.put(session)
+        finally:
+            self._slots.release()
+
+    # Izolyatsiyalangan context
+    def _open_context(self, session: BrowserSession):
+        """Yangi browser context va undagi tab - (context_id, handle)"""
+        driver = session.driver
+        try:
+            context_id = driver.execute_cdp_cmd('Target.createBrowserContext', {'disposeOnDetach': True})['browserContextId']
+            target_id = driver.execute_cdp_cmd('Target.createTarget', {
+                'url': 'about:blank',
+                'browserContextId': context_id,
+                'width': self.window_size[0],
+                'height': self.window_size[1],
+            })['targetId']
+            driver.switch_to.window(target_id)
+            return context_id, target_id
+        except Exception as e:
+            # CDP context ishlamasa - oddiy yangi tab (cookie lar keyin tozalanadi)
+            logger.debug(f"Browser context unavailable, using plain tab: {str(e)}")
+            driver.switch_to.new_window('tab')
+            return None, driver.current_window_handle
+
+    def _close_context(self, session: BrowserSession, context_id: Optional[str], handle: str):
+        driver = session.driver
+        try:
+            driver.switch_to.window(handle)
+            if context_id is None:
+                driver.delete_all_cookies()
+                driver.execute_script('try { localStorage.clear(); sessionStorage.clear(); } catch (e) {}')
+            driver.close()
+        finally:
+            driver.switch_to.window(session.base_handle)
+            if context_id is not None:
+                try:
+                    driver.execute_cdp_cmd('Target.disposeBrowserContext', {'browserContextId': context_id})
+                except Exception:
+                    pass
+
+    @contextmanager
+    def page(self, timeout: Optional[float] = None) -> Iterator[object]:
+        """Toza context dagi driver - with bloki tugagach context yopiladi va browser pool ga qaytadi"""
+        if self._closed:
+            raise BrowserPoolTimeout("Browser pool is closed")
+        session = self._acquire(timeout or self.acquire_timeout)
+        broken = False
+        try:
+            context_id, handle = self._open_context(session)
+            try:
+                session.uses += 1
+                with self._lock:
+                    self.stats_counters['served'] += 1
+                yield session.driver
+            finally:
+                try:
+                    self._close_context(session, context_id, handle)
+                except Exception as e:
+                    logger.warning(f"⚠️ Browser #{session.id} context cleanup failed: {str(e)}")
+                    broken = True
+        except BaseException:
+            broken = broken or not session.healthy()
+            raise
+        finally:
+            self._release(session, broken)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            sessions = [
+                {'id': s.id, 'uses': s.uses, 'age': round(time.time() - s.created_at, 1), 'rss': s.rss()}
+                for s in self._sessions.values()
+            ]
+            counters = dict(self.stats_counters)
+        return {
+            'size': self.size,
+            'idle': self._idle.qsize(),
+            'sessions': sessions,
+            'max_uses': self.max_uses,
+            **counters,
+        }
+
+    def close(self):
+        """Barcha browser larni yopish"""
+        self._closed = True
+        while True:
+            try:
+                session = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._discard(session, 'shutdown')
@@ -0,0 +1,232 @@
+"""
+🗜️ Content-Encoding Decoding
+gzip, deflate, br (brotli) va zstd transfer encoding larini streaming decode qilish
+
+- Accept-Encoding o'rnatilgan kutubxonalarga qarab tuziladi
+- Decode qilingan hajm limiti (decompression bomb lardan himoya) - limitga
+  yetganda chiqish kesiladi va truncated belgilanadi
+- Har bir fetch uchun wire bytes / decoded bytes metrikasi
+"""
+
+import zlib
+from dataclasses import dataclass
+from typing import List, Optional
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - ixtiyoriy
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - ixtiyoriy
+    zstandard = None
+
+READ_CHUNK_SIZE = 64 * 1024
+
+
+def available_encodings() -> List[str]:
+    """Decode qila oladigan encoding lar (afzallik tartibida)"""
+    encodings = []
+    if zstandard is not None:
+        encodings.append('zstd')
+    if brotli is not None:
+        encodings.append('br')
+    encodings.extend(['gzip', 'deflate'])
+    return encodings
+
+
+ACCEPT_ENCODING = ', '.join(available_encodings())
+
+
+class ContentDecodingError(Exception):
+    """Javob body sini decode qilib bo'lmadi"""
+
+
+class UnsupportedEncodingError(ContentDecodingError):
+    """Server qo'llab-quvvatlanmaydigan encoding bilan javob berdi"""
+
+
+class _ZlibDecoder:
+    def __init__(self, encoding: str):
+        # gzip va zlib header ni avtomatik aniqlash; raw deflate ga fallback
+        self._encoding = encoding
+        self._decoder = zlib.decompressobj(zlib.MAX_WBITS | 32)
+        self._started = False
+        self.limit_reached = False
+
+    def decode(self, data: bytes, max_length: int) -> bytes:
+        try:
+            output = self._decoder.decompress(data, max_length)
+        except zlib.error:
+            if self._started or self._encoding != 'deflate':
+                raise
+            # Ba'zi serverlar 'deflate' da raw stream yuboradi
+            self._decoder = zlib.decompressobj(-zlib.MAX_WBITS)
+            output = self._decoder.decompress(data, max_length)
+        self._started = True
+        if self._decoder.unconsumed_tail:
+            self.limit_reached = True
+        return output
+
+
+class _BrotliDecoder:
+    # process(output_buffer_limit=...) brotli 1.2.0 dan; eskisida limitsiz process() + kesish
+    bounded = True
+
+    def __init__(self):
+        self._decoder = brotli.Decompressor()
+        self.limit_reached = False
+
+    def _process(self, data: bytes, max_length: int) -> bytes:
+        if _BrotliDecoder.bounded:
+            try:
+                return self._decoder.process(data, output_buffer_limit=max_length)
+            except TypeError:
+                _BrotliDecoder.bounded = False
+        return self._decoder.process(data)
+
+    def decode(self, data: bytes, max_length: int) -> bytes:
+        # output_buffer_limit - yumshoq limit, chiqish biroz oshib ketishi mumkin
+        output = self._process(data, max_length)
+        if len(output) > max_length or (len(output) == max_length and not self._decoder.is_finished()):
+            self.limit_reached = True
+        return output[:max_length]
+
+
+class _LimitReached(Exception):
+    pass
+
+
+class _BoundedSink:
+    def __init__(self):
+        self.parts: List[bytes] = []
+        self.size = 0
+        self.limit = 0
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        room = self.limit - self.size
+        if len(data) > room:
+            self.parts.append(data[:room])
+            self.size += room
+            raise _LimitReached()
+        self.parts.append(data)
+        self.size += len(data)
+        return len(data)
+
+
+class _ZstdDecoder:
+    def __init__(self):
+        # stream_writer chiqishni write_size bo'laklarida beradi - xotira cheklangan
+        self._sink = _BoundedSink()
+        self._writer = zstandard.ZstdDecompressor().stream_writer(self._sink, write_size=READ_CHUNK_SIZE)
+        self.limit_reached = False
+
+    def decode(self, data: bytes, max_length: int) -> bytes:
+        sink = self._sink
+        sink.parts, sink.size, sink.limit = [], 0, max_length
+        try:
+            self._writer.write(data)
+        except _LimitReached:
+            self.limit_reached = True
+        return b''.join(sink.parts)
+
+
+class _IdentityDecoder:
+    limit_reached = False
+
+    def decode(self, data: bytes, max_length: int) -> bytes:
+        if len(data) > max_length:
+            self.limit_reached = True
+            return data[:max_length]
+        return data
+
+
+def _make_decoder(encoding: str):
+    if encoding in ('', 'identity'):
+        return _IdentityDecoder()
+    if encoding in ('gzip', 'x-gzip', 'deflate'):
+        return _ZlibDecoder(encoding)
+    if encoding == 'br' and brotli is not None:
+        return _BrotliDecoder()
+    if encoding == 'zstd' and zstandard is not None:
+        return _ZstdDecoder()
+    raise UnsupportedEncodingError(f"Unsupported Content-Encoding: {encoding}")
+
+
+@dataclass
+class TransferMetrics:
+    """Bitta fetch ning transfer metrikasi"""
+    content_encoding: str
+    wire_bytes: int = 0
+    decoded_bytes: int = 0
+    truncated: bool = False
+
+    @property
+    def ratio(self) -> float:
+        return round(self.decoded_bytes / self.wire_bytes, 2) if self.wire_bytes else 1.0
+
+    def to_dict(self):
+        return {
+            'content_encoding': self.content_encoding,
+            'wire_bytes': self.wire_bytes,
+            'decoded_bytes': self.decoded_bytes,
+            'compression_ratio': self.ratio,
+            'truncated': self.truncated,
+        }
+
+
+class StreamDecoder:
+    """Content-Encoding zanjirini chunk-by-chunk decode qilish (max_bytes gacha)"""
+
+    def __init__(self, content_encoding: Optional[str], max_bytes: int):
+        encodings = [e.strip().lower() for e in (content_encoding or '').split(',') if e.strip()]
+        # "gzip, br" - oxirgi qo'llangan birinchi decode qilinadi
+        self._decoders = [_make_decoder(e) for e in reversed(encodings)]
+        self.max_bytes = max_bytes
+        self.metrics = TransferMetrics(content_encoding=', '.join(encodings) or 'identity')
+
+    @property
+    def finished(self) -> bool:
+        """Limitga yetildi - qolgan wire data ni o'qish shart emas"""
+        return self.metrics.truncated
+
+    def feed(self, chunk: bytes) -> bytes:
+        """Wire chunk -> decode qilingan chunk (limit dan oshmaydi)"""
+        metrics = self.metrics
+        metrics.wire_bytes += len(chunk)
+        if metrics.truncated:
+            return b''
+        remaining = self.max_bytes - metrics.decoded_bytes
+        if remaining <= 0:
+            # zlib / brotli da 0 limit "cheksiz" degani - decode qilmaymiz
+            metrics.truncated = bool(chunk)
+            return b''
+        data = chunk
+        for decoder in self._decoders or [_IdentityDecoder()]:
+            try:
+                data = decoder.decode(data, remaining)
+            except Exception as e:
+                raise ContentDecodingError(f"Failed to decode {metrics.content_encoding} body: {str(e)}")
+            if decoder.limit_reached:
+                metrics.truncated = True
+        metrics.decoded_bytes += len(data)
+        return data
+
+
+def read_decoded(response, max_bytes: int) -> tuple:
+    """requests Response ni (stream=True) o'zimiz decode qilib o'qish.
+
+    Qaytaradi: (content, TransferMetrics)
+    """
+    decoder = StreamDecoder(response.headers.get('Content-Encoding'), max_bytes)
+    parts = []
+    try:
+        for chunk in response.raw.stream(READ_CHUNK_SIZE, decode_content=False):
+            parts.append(decoder.feed(chunk))
+            if decoder.finished:
+                break
+    finally:
+        response.close()
+    return b''.join(parts), decoder.metrics
@@ -0,0 +1,442 @@
+"""
+🎯 Design Token Extraction
+Harvest qilingan computed style lar yoki CSS declaration lardan design token lar (NumPy)
+
+- colors  - histogramma (unikal rang + og'irlik), CIELAB da ΔE bo'yicha klasterlash,
+            rollar: background / text / primary / secondary / accent
+- spacing - margin / padding / gap qiymatlari aniqlangan bazaviy birlikka (4, 8, ...) snap qilinadi
+- fonts   - font stack lar render qilingan matn maydoni bo'yicha tartiblanadi
+            (CSS declaration lardan olinganda - declaration soni bo'yicha)
+- font o'lchamlari va border radius shkalasi
+
+Og'irliklar: matn rangi - taxminiy matn maydoni, background - box maydoni, border - perimetr x qalinlik.
+"""
+
+import colorsys
+import re
+import time
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+# Eski hardcoded designSystem - token topilmagan maydonlar uchun
+DEFAULT_DESIGN_SYSTEM = {
+    'colors': {'primary': '#3B82F6', 'secondary': '#64748B'},
+    'typography': {'fontFamily': 'Inter, sans-serif'},
+    'spacing': {'unit': '8px'},
+}
+
+ROLES = ('text', 'background', 'border', 'other')
+COLOR_MERGE_DELTA_E = 10.0     # shundan yaqin ranglar bitta klaster
+CHROMATIC_MIN_CHROMA = 15.0    # shundan past - neytral (oq, qora, kulrang)
+MAX_UNIQUE_COLORS = 1024
+MAX_PALETTE = 12
+MIN_PALETTE_SHARE = 0.005
+
+SPACING_UNITS = np.array([4, 5, 6, 8, 10, 12], dtype=float)
+SPACING_TOLERANCE = 1.0        # px - birlikka karrali deb hisoblash uchun
+MAX_SPACING = 128.0            # auto margin (centering) kabi katta qiymatlar hisobga olinmaydi
+MIN_SCALE_SHARE = 0.02
+MAX_SPACING_STEPS = 10
+MAX_FONT_SIZES = 8
+MAX_RADII = 5
+FULL_RADIUS = 9999.0           # pill / circle
+MAX_FONTS = 5
+ROOT_FONT_SIZE = 16.0
+# html / body rule lari butun sahifaga ta'sir qiladi (render maydoni yo'q - declaration og'irligi)
+ROOT_SELECTORS = frozenset(('html', 'body', ':root', '*'))
+ROOT_RULE_WEIGHT = 5.0
+
+# sRGB (D65) -> XYZ
+_RGB_TO_XYZ = np.array([
+    [0.4124564, 0.3575761, 0.1804375],
+    [0.2126729, 0.7151522, 0.0721750],
+    [0.0193339, 0.1191920, 0.9503041],
+])
+_WHITE = np.array([0.95047, 1.0, 1.08883])
+
+_HEX_RE = re.compile(r'#([0-9a-fA-F]{3,8})\b')
+_FUNC_RE = re.compile(r'(rgba?|hsla?)\(([^)]*)\)', re.I)
+_LENGTH_RE = re.compile(r'(-?\d*\.?\d+)(px|rem|em)?(?![\w%])', re.I)
+NAMED_COLORS = {'white': (255, 255, 255), 'black': (0, 0, 0)}
+_NAMED_RE = re.compile(r'\b(white|black)\b', re.I)
+
+COLOR_PROPERTIES = {
+    'color': 'text',
+    'background': 'background',
+    'background-color': 'background',
+    'border': 'border',
+    'border-color': 'border',
+    'border-top': 'border',
+    'border-bottom': 'border',
+    'border-left': 'border',
+    'border-right': 'border',
+    'outline': 'border',
+    'outline-color': 'border',
+    'fill': 'other',
+    'stroke': 'other',
+}
+SPACING_PROPERTIES = frozenset((
+    'margin', 'margin-top', 'margin-right', 'margin-bottom', 'margin-left',
+    'padding', 'padding-top', 'padding-right', 'padding-bottom', 'padding-left',
+    'gap', 'row-gap', 'column-gap',
+))
+SPACING_COLUMNS = (
+    'margin_top', 'margin_right', 'margin_bottom', 'margin_left',
+    'padding_top', 'padding_right', 'padding_bottom', 'padding_left', 'gap',
+)
+
+
+@dataclass
+class DesignTokens:
+    """Sahifadan hisoblangan design token lar"""
+    source: str  # computed | stylesheets
+    palette: List[Dict] = field(default_factory=list)
+    roles: Dict[str, str] = field(default_factory=dict)
+    fonts: List[Dict] = field(default_factory=list)
+    font_sizes: List[float] = field(default_factory=list)
+    spacing_unit: Optional[float] = None
+    spacing_scale: List[float] = field(default_factory=list)
+    radii: List[float] = field(default_factory=list)
+    samples: int = 0
+    elapsed_ms: int = 0
+
+    def to_dict(self):
+        return {
+            'source': self.source,
+            'palette': self.palette,
+            'roles': self.roles,
+            'fonts': self.fonts,
+            'font_sizes': self.font_sizes,
+            'spacing_unit': self.spacing_unit,
+            'spacing_scale': self.spacing_scale,
+            'radii': self.radii,
+            'samples': self.samples,
+            'elapsed_ms': self.elapsed_ms,
+        }
+
+
+def _px(value: float) -> str:
+    return f'{value:g}px'
+
+
+def design_system(tokens: Optional[Dict], base: Optional[Dict] = None) -> Dict:
+    """DesignTokens.to_dict() -> designSystem; o'lchanmagan maydonlar base dan (default - eski hardcoded qiymatlar)"""
+    base = DEFAULT_DESIGN_SYSTEM if base is None else base
+    result = {key: dict(value) for key, value in base.items() if isinstance(value, dict)}
+    tokens = tokens or {}
+    colors, typography, spacing = (result.setdefault(key, {}) for key in ('colors', 'typography', 'spacing'))
+
+    colors.update(tokens.get('roles') or {})
+    if tokens.get('palette'):
+        colors['palette'] = [color['hex'] for color in tokens['palette']]
+    if tokens.get('fonts'):
+        typography['fontFamily'] = tokens['fonts'][0]['family']
+        typography['fonts'] = [font['family'] for font in tokens['fonts']]
+    if tokens.get('font_sizes'):
+        typography['scale'] = [_px(size) for size in tokens['font_sizes']]
+    if tokens.get('spacing_unit'):
+        spacing['unit'] = _px(tokens['spacing_unit'])
+    if tokens.get('spacing_scale'):
+        spacing['scale'] = [_px(step) for step in tokens['spacing_scale']]
+    if tokens.get('radii'):
+        result['borderRadius'] = [_px(radius) for radius in tokens['radii']]
+    return {key: value for key, value in result.items() if value}
+
+
+# --- Ranglar ---
+
+def parse_color(text: str) -> Optional[Tuple[int, int, int, float]]:
+    """'#3b82f6' / 'rgb(59 130 246 / .5)' / 'hsl(...)' -> (r, g, b, alpha)"""
+    text = text.strip()
+    match = _HEX_RE.fullmatch(text)
+    if match:
+        digits = match.group(1)
+        if len(digits) in (3, 4):
+            digits = ''.join(char * 2 for char in digits)
+        if len(digits) not in (6, 8):
+            return None
+        alpha = int(digits[6:8], 16) / 255 if len(digits) == 8 else 1.0
+        return int(digits[0:2], 16), int(digits[2:4], 16), int(digits[4:6], 16), alpha
+    match = _FUNC_RE.fullmatch(text)
+    if match:
+        parts = [part for part in re.split(r'[\s,/]+', match.group(2).strip()) if part]
+        if len(parts) < 3:
+            return None
+        try:
+            alpha = float(parts[3][:-1]) / 100 if len(parts) > 3 and parts[3].endswith('%') else (
+                float(parts[3]) if len(parts) > 3 else 1.0
+            )
+            if match.group(1).lower().startswith('rgb'):
+                channels = [float(part[:-1]) * 2.55 if part.endswith('%') else float(part) for part in parts[:3]]
+            else:
+                hue = float(re.sub(r'deg$', '', parts[0])) / 360 % 1
+                red, green, blue = colorsys.hls_to_rgb(hue, float(parts[2].rstrip('%')) / 100,
+                                                       float(parts[1].rstrip('%')) / 100)
+                channels = [red * 255, green * 255, blue * 255]
+        except ValueError:
+            return None
+        red, green, blue = (int(round(min(max(channel, 0), 255))) for channel in channels)
+        return red, green, blue, min(max(alpha, 0.0), 1.0)
+    named = NAMED_COLORS.get(text.lower())
+    return (*named, 1.0) if named else None
+
+
+def find_colors(value: str) -> List[Tuple[int, int, int, float]]:
+    """Declaration qiymatidagi barcha ranglar ('1px solid #ddd', 'linear-gradient(...)')"""
+    tokens = [match.group(0) for match in _HEX_RE.finditer(value)]
+    tokens += [match.group(0) for match in _FUNC_RE.finditer(value)]
+    tokens += [match.group(0) for match in _NAMED_RE.finditer(value)]
+    return [color for color in map(parse_color, tokens) if color]
+
+
+def rgb_to_lab(rgb: np.ndarray) -> np.ndarray:
+    """(N, 3) sRGB 0..255 -> (N, 3) CIELAB (D65)"""
+    channels = rgb / 255.0
+    linear = np.where(channels <= 0.04045, channels / 12.92, ((channels + 0.055) / 1.055) ** 2.4)
+    xyz = linear @ _RGB_TO_XYZ.T / _WHITE
+    f = np.where(xyz > 216 / 24389, np.cbrt(xyz), (24389 / 27 * xyz + 16) / 116)
+    return np.stack([116 * f[:, 1] - 16, 500 * (f[:, 0] - f[:, 1]), 200 * (f[:, 1] - f[:, 2])], axis=1)
+
+
+def cluster_colors(rgb: np.ndarray, weights: np.ndarray, roles: np.ndarray) -> Tuple[List[Dict], Dict[str, str]]:
+    """Rang namunalari (N, 3) + og'irlik + rol indeksi -> (palette, roles)"""
+    if not len(rgb):
+        return [], {}
+    # Histogramma: unikal rang -> rol bo'yicha og'irliklar
+    keys = (rgb[:, 0].astype(np.int64) << 16) | (rgb[:, 1].astype(np.int64) << 8) | rgb[:, 2].astype(np.int64)
+    unique, inverse = np.unique(keys, return_inverse=True)
+    role_weights = np.zeros((len(unique), len(ROLES)))
+    np.add.at(role_weights, (inverse, roles), weights)
+    totals = role_weights.sum(axis=1)
+    order = np.argsort(-totals)[:MAX_UNIQUE_COLORS]
+    unique, role_weights, totals = unique[order], role_weights[order], totals[order]
+    colors = np.stack([(unique >> 16) & 255, (unique >> 8) & 255, unique & 255], axis=1)
+    lab = rgb_to_lab(colors.astype(float))
+
+    # Og'ir rangdan boshlab ΔE < threshold bo'lgan ranglarni unga biriktirish (leader clustering)
+    distances = np.linalg.norm(lab[:, None, :] - lab[None, :, :], axis=2)
+    labels = np.full(len(unique), -1)
+    leaders = []
+    for index in range(len(unique)):
+        if labels[index] >= 0:
+            continue
+        members = (labels < 0) & (distances[index] < COLOR_MERGE_DELTA_E)
+        labels[members] = len(leaders)
+        leaders.append(index)
+    leaders = np.array(leaders)
+
+    cluster_roles = np.zeros((len(leaders), len(ROLES)))
+    np.add.at(cluster_roles, labels, role_weights)
+    cluster_totals = cluster_roles.sum(axis=1)
+    share = cluster_totals / cluster_totals.sum()
+    chroma = np.hypot(lab[leaders, 1], lab[leaders, 2])
+    hexes = ['#%02x%02x%02x' % tuple(colors[leader]) for leader in leaders]
+
+    ranked = np.argsort(-cluster_totals)
+    palette = [
+        {
+            'hex': hexes[cluster],
+            'share': round(float(share[cluster]), 4),
+            'role': ROLES[int(np.argmax(cluster_roles[cluster]))],
+            'lightness': round(float(lab[leaders[cluster], 0]), 1),
+            'chroma': round(float(chroma[cluster]), 1),
+        }
+        for cluster in ranked[:MAX_PALETTE]
+        if share[cluster] >= MIN_PALETTE_SHARE
+    ]
+
+    assigned = {}
+    used = set()
+    for role, column in (('background', ROLES.index('background')), ('text', ROLES.index('text'))):
+        candidates = [cluster for cluster in np.argsort(-cluster_roles[:, column])
+                      if cluster_roles[cluster, column] > 0 and cluster not in used]
+        if candidates:
+            assigned[role] = hexes[candidates[0]]
+            used.add(candidates[0])
+    chromatic = [cluster for cluster in ranked if chroma[cluster] >= CHROMATIC_MIN_CHROMA and cluster not in used]
+    neutral = [cluster for cluster in ranked if chroma[cluster] < CHROMATIC_MIN_CHROMA and cluster not in used]
+    for role, pick in zip(('primary', 'secondary', 'accent'), chromatic + neutral):
+        assigned[role] = hexes[pick]
+    return palette, assigned
+
+
+# --- Spacing, font o'lcham, radius ---
+
+def detect_unit(values: np.ndarray, weights: np.ndarray) -> Optional[float]:
+    """Qiymatlarning eng ko'pini karrali qiladigan eng katta bazaviy birlik"""
+    if not len(values):
+        return None
+    multiples = np.round(values[None, :] / SPACING_UNITS[:, None])
+    residual = np.abs(values[None, :] - multiples * SPACING_UNITS[:, None])
+    coverage = ((residual <= SPACING_TOLERANCE) & (multiples > 0)) @ weights / weights.sum()
+    # Kichik birlik deyarli hamma narsani qamraydi - qamrovi yaqin bo'lsa kattasi afzal
+    good = np.nonzero(coverage >= coverage.max() * 0.85)[0]
+    return float(SPACING_UNITS[good[-1]])
+
+
+def weighted_steps(values: np.ndarray, weights: np.ndarray, limit: int, min_share: float = MIN_SCALE_SHARE) -> List[float]:
+    """Unikal qiymatlar og'irlik bo'yicha - eng ko'p ishlatilgan limit tasi, o'sish tartibida"""
+    if not len(values):
+        return []
+    unique, inverse = np.unique(values, return_inverse=True)
+    totals = np.bincount(inverse, weights=weights)
+    share = totals / totals.sum()
+    top = np.argsort(-totals)[:limit]
+    return sorted(float(unique[index]) for index in top if share[index] >= min_share)
+
+
+def spacing_scale(values: np.ndarray, weights: np.ndarray) -> Tuple[Optional[float], List[float]]:
+    """Spacing qiymatlari -> (bazaviy birlik, snap qilingan shkala)"""
+    keep = (values > 0) & (values <= MAX_SPACING)
+    values, weights = values[keep], weights[keep]
+    unit = detect_unit(values, weights)
+    if unit is None:
+        return None, []
+    snapped = np.maximum(np.round(values / unit), 1) * unit
+    return unit, weighted_steps(snapped, weights, MAX_SPACING_STEPS)
+
+
+def radius_scale(values: np.ndarray, weights: np.ndarray) -> List[float]:
+    keep = values > 0
+    values = np.where(values[keep] >= 100, FULL_RADIUS, np.round(values[keep]))
+    return weighted_steps(values, weights[keep], MAX_RADII)
+
+
+def normalize_font(family: str) -> str:
+    """'"Inter", -apple-system,  sans-serif' -> 'Inter, -apple-system, sans-serif'"""
+    return ', '.join(part.strip().strip('"\'') for part in family.split(',') if part.strip())
+
+
+def rank_fonts(families: List[str], weights: np.ndarray) -> List[Dict]:
+    """Font stack lar og'irlik (matn maydoni) bo'yicha"""
+    if not families:
+        return []
+    unique, inverse = np.unique(np.array([normalize_font(family) for family in families]), return_inverse=True)
+    totals = np.bincount(inverse, weights=weights)
+    if not totals.sum():
+        return []
+    share = totals / totals.sum()
+    return [
+        {'family': str(unique[index]), 'share': round(float(share[index]), 4)}
+        for index in np.argsort(-totals)[:MAX_FONTS]
+        if unique[index] and share[index] >= MIN_SCALE_SHARE
+    ]
+
+
+def _build(source: str, started: float, samples: int, colors, spacing, sizes, radii, fonts) -> DesignTokens:
+    palette, roles = cluster_colors(*colors)
+    unit, scale = spacing_scale(*spacing)
+    return DesignTokens(
+        source=source,
+        palette=palette,
+        roles=roles,
+        fonts=rank_fonts(*fonts),
+        font_sizes=weighted_steps(*sizes, MAX_FONT_SIZES),
+        spacing_unit=unit,
+        spacing_scale=scale,
+        radii=radius_scale(*radii),
+        samples=samples,
+        elapsed_ms=int((time.time() - started) * 1000),
+    )
+
+
+# --- Manbalar ---
+
+def _pack_table(colors: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+    """Harvest colors jadvali ('#rrggbb' / '#rrggbbaa') -> (0xRRGGBB, alpha); boshqa format -> -1"""
+    packed, alpha = [-1], [1.0]
+    for color in colors:
+        parsed = parse_color(color)
+        packed.append((parsed[0] << 16 | parsed[1] << 8 | parsed[2]) if parsed else -1)
+        alpha.append(parsed[3] if parsed else 1.0)
+    # 0-indeks -1 (transparent) uchun - jadval indekslari bittaga suriladi
+    return np.array(packed), np.array(alpha)
+
+
+def tokens_from_harvest(harvest) -> Optional[DesignTokens]:
+    """StyleHarvest (ustunli computed style lar) -> DesignTokens"""
+    if not harvest or not harvest.count:
+        return None
+    started = time.time()
+
+    def column(name):
+        return np.asarray(harvest.column(name), dtype=float)
+
+    area = column('w') * column('h')
+    font_size = column('font_size')
+    # Taxminiy matn maydoni: belgilar x o'rtacha belgi kengligi x qator balandligi (box dan oshmaydi)
+    text_area = np.minimum(column('text') * font_size * 0.5 * column('line_height'), area)
+    border = column('border_width') * 2 * (column('w') + column('h'))
+
+    packed, alpha = _pack_table(harvest.tables.get('colors', []))
+    indexes = np.concatenate([column(name).astype(int) + 1 for name in ('color', 'background', 'border_color')])
+    weights = np.concatenate([text_area, area, border])
+    roles = np.repeat([ROLES.index('text'), ROLES.index('background'), ROLES.index('border')], harvest.count)
+    values = packed[indexes]
+    valid = (values >= 0) & (weights > 0)
+    values, weights, roles = values[valid], weights[valid] * alpha[indexes[valid]], roles[valid]
+    rgb = np.stack([(values >> 16) & 255, (values >> 8) & 255, values & 255], axis=1)
+
+    spacing = np.concatenate([column(name) for name in SPACING_COLUMNS])
+    has_text = np.nonzero(text_area > 0)[0]
+    fonts = harvest.decode('font')
+    return _build(
+        'computed', started, harvest.count,
+        (rgb, weights, roles),
+        (spacing, np.ones(len(spacing))),
+        (np.round(font_size[has_text] * 2) / 2, text_area[has_text]),
+        (column('radius'), np.ones(harvest.count)),
+        ([fonts[index] or '' for index in has_text], text_area[has_text]),
+    )
+
+
+def _lengths(value: str) -> Iterable[float]:
+    """'8px 1rem 0 auto' -> [8, 16, 0] (%, vw, auto o'tkazib yuboriladi)"""
+    for match in _LENGTH_RE.finditer(value):
+        number, unit = float(match.group(1)), (match.group(2) or '').lower()
+        if unit in ('rem', 'em'):
+            yield number * ROOT_FONT_SIZE
+        elif unit == 'px' or number == 0:
+            yield number
+
+
+def tokens_from_stylesheets(stylesheets: List[Dict]) -> Optional[DesignTokens]:
+    """Parse qilingan CSS rule lar (StylesheetStage) -> DesignTokens (og'irlik - declaration soni)"""
+    started = time.time()
+    colors, color_weights, color_roles = [], [], []
+    spacing, sizes, radii, families, family_weights = [], [], [], [], []
+    for sheet in stylesheets or ():
+        for rule in sheet.get('rules', ()):
+            weight = ROOT_RULE_WEIGHT if ROOT_SELECTORS & set(rule.get('selectors', ())) else 1.0
+            for declaration in rule.get('declarations', ()):
+                prop, value = declaration['property'], declaration['value']
+                role = COLOR_PROPERTIES.get(prop) or ('other' if prop.startswith('--') else None)
+                if role:
+                    for red, green, blue, alpha in find_colors(value):
+                        if alpha > 0:
+                            colors.append((red, green, blue))
+                            color_weights.append(alpha * weight)
+                            color_roles.append(ROLES.index(role))
+                if prop in SPACING_PROPERTIES:
+                    spacing.extend(abs(length) for length in _lengths(value))
+                elif prop == 'font-size':
+                    sizes.extend(length for length in _lengths(value) if length > 0)
+                elif prop == 'border-radius':
+                    radii.extend(_lengths(value.split('/')[0]))
+                elif prop == 'font-family' and 'var(' not in value and value.strip():
+                    families.append(value)
+                    family_weights.append(weight)
+    samples = len(colors) + len(spacing) + len(sizes) + len(radii) + len(families)
+    if not samples:
+        return None
+    spacing, sizes, radii = (np.array(values, dtype=float) for values in (spacing, sizes, radii))
+    return _build(
+        'stylesheets', started, samples,
+        (np.array(colors, dtype=int).reshape(-1, 3), np.array(color_weights), np.array(color_roles, dtype=int)),
+        (spacing, np.ones(len(spacing))),
+        (np.round(sizes * 2) / 2, np.ones(len(sizes))),
+        (radii, np.ones(len(radii))),
+        (families, np.array(family_weights)),
+    )
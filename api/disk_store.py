@@ -0,0 +1,153 @@
+"""
+💾 Disk Store
+Restartdan keyin ham saqlanadigan oddiy key-value disk storage
+
+Har bir yozuv ikki fayldan iborat:
+- <hash>.json - metadata (JSON)
+- <hash>.bin  - ixtiyoriy binary body
+
+Umumiy hajm max_bytes dan oshsa eng eski (LRU, mtime bo'yicha) yozuvlar o'chiriladi.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+from typing import Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class DiskStore:
+    """Thread-safe, hajmi cheklangan disk key-value store"""
+
+    def __init__(self, directory: str, max_bytes: int):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        os.makedirs(self.directory, exist_ok=True)
+        self._total_bytes = sum(size for _, size, _ in self._scan())
+
+    def _paths(self, key: str) -> Tuple[str, str]:
+        digest = hashlib.sha256(key.encode('utf-8')).hexdigest()
+        base = os.path.join(self.directory, digest)
+        return base + '.json', base + '.bin'
+
+    def _scan(self):
+        """(base_path, size, mtime) ro'yxati - har bir yozuv uchun"""
+        entries: Dict[str, list] = {}
+        with os.scandir(self.directory) as it:
+            for item in it:
+                base, ext = os.path.splitext(item.path)
+                if ext not in ('.json', '.bin'):
+                    continue
+                try:
+                    stat = item.stat()
+                except FileNotFoundError:
+                    continue
+                entry = entries.setdefault(base, [0, 0.0])
+                entry[0] += stat.st_size
+                if ext == '.json':
+                    entry[1] = stat.st_mtime
+        return [(base, size, mtime) for base, (size, mtime) in entries.items()]
+
+    @staticmethod
+    def _write_atomic(path: str, data: bytes):
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    @staticmethod
+    def _size(path: str) -> int:
+        try:
+            return os.path.getsize(path)
+        except FileNotFoundError:
+            return 0
+
+    def get(self, key: str, with_blob: bool = False) -> Optional[Tuple[Dict, Optional[bytes]]]:
+        """Yozuvni o'qish - (metadata, blob) yoki None"""
+        meta_path, blob_path = self._paths(key)
+        try:
+            with open(meta_path, 'rb') as f:
+                meta = json.loads(f.read())
+            blob = None
+            if with_blob and os.path.exists(blob_path):
+                with open(blob_path, 'rb') as f:
+                    blob = f.read()
+            # LRU uchun access vaqtini yangilash
+            os.utime(meta_path, None)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"⚠️ Corrupted cache entry dropped: {str(e)}")
+            self.delete(key)
+            return None
+        return meta, blob
+
+    def put(self, key: str, meta: Dict, blob: Optional[bytes] = None):
+        """Yozuvni saqlash (mavjud bo'lsa almashtiriladi)"""
+        meta_path, blob_path = self._paths(key)
+        meta_bytes = json.dumps(meta, ensure_ascii=False).encode('utf-8')
+        with self._lock:
+            previous = self._size(meta_path) + self._size(blob_path)
+            if blob is not None:
+                self._write_atomic(blob_path, blob)
+            elif os.path.exists(blob_path):
+                os.remove(blob_path)
+            self._write_atomic(meta_path, meta_bytes)
+            self._total_bytes += len(meta_bytes) + (len(blob) if blob is not None else 0) - previous
+            if self._total_bytes > self.max_bytes:
+                self._evict()
+
+    def update_meta(self, key: str, meta: Dict):
+        """Faqat metadata ni yangilash (blob o'zgarmaydi)"""
+        meta_path, _ = self._paths(key)
+        meta_bytes = json.dumps(meta, ensure_ascii=False).encode('utf-8')
+        with self._lock:
+            previous = self._size(meta_path)
+            self._write_atomic(meta_path, meta_bytes)
+            self._total_bytes += len(meta_bytes) - previous
+
+    def delete(self, key: str):
+        """Yozuvni o'chirish"""
+        with self._lock:
+            for path in self._paths(key):
+                size = self._size(path)
+                if size or os.path.exists(path):
+                    try:
+                        os.remove(path)
+                    except FileNotFoundError:
+                        continue
+                    self._total_bytes -= size
+
+    def _evict(self):
+        """Hajm limitiga tushguncha eng eski yozuvlarni o'chirish (lock ichida)"""
+        entries = sorted(self._scan(), key=lambda entry: entry[2])
+        total = sum(size for _, size, _ in entries)
+        target = int(self.max_bytes * 0.9)
+        evicted = 0
+        for base, size, _ in entries:
+            if total <= target:
+                break
+            for ext in ('.json', '.bin'):
+                try:
+                    os.remove(base + ext)
+                except FileNotFoundError:
+                    pass
+            total -= size
+            evicted += 1
+        self._total_bytes = total
+        if evicted:
+            logger.info(f"🧹 Evicted {evicted} entries from {self.directory}")
+
+    def stats(self) -> Dict[str, int]:
+        """Store statistikasi"""
+        return {'total_bytes': self._total_bytes, 'max_bytes': self.max_bytes}
@@ -0,0 +1,267 @@
+"""
+🦴 DOM Distillation
+LLM prompt uchun sahifaning ixcham tuzilma skeleti
+
+Skelet uch qismdan iborat:
+- Layout   - landmark va blok elementlar daraxti; takrorlanuvchi sibling lar
+             (card, li, ...) bitta qatorga ×N bilan yig'iladi, bo'sh wrapper lar olib tashlanadi
+- Headings - h1-h6 ierarxiyasi
+- Classes  - eng ko'p ishlatilgan class nomlari (dizayn lug'ati)
+
+Natija token budjetiga moslanadi: sig'masa avval eng chuqur qatorlar tashlanadi.
+
+Class / heading statistikasi SkeletonCollector visitor ida (PageExtractor bilan bitta
+aylanishda) yig'iladi; layout daraxti esa faqat ko'rsatiladigan qismini aylanadi -
+takrorlanuvchi sibling larning ichiga kirilmaydi.
+"""
+
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import List, Optional, Tuple
+
+from dom_extract import NodeVisitor, visit_document
+from html_parsers import HTMLDocument, HTMLElement
+
+# Skeletga umuman kirmaydigan taglar
+DISTILL_SKIP_TAGS = frozenset(('script', 'style', 'noscript', 'template', 'head', 'link', 'meta', 'br', 'wbr'))
+
+# Ichiga kirilmaydigan, faqat barg sifatida ko'rsatiladigan taglar
+LEAF_TAGS = frozenset((
+    'a', 'img', 'picture', 'button', 'input', 'select', 'textarea', 'video', 'audio',
+    'iframe', 'svg', 'canvas', 'hr', 'label',
+))
+
+# Matn darajasidagi (inline) taglar - ko'rsatilmaydi
+INLINE_TAGS = frozenset((
+    'span', 'b', 'i', 'em', 'strong', 'small', 'code', 'abbr', 'sup', 'sub', 'mark',
+    'u', 's', 'q', 'cite', 'time', 'kbd', 'var', 'font',
+))
+
+LANDMARK_TAGS = frozenset(('header', 'nav', 'main', 'footer', 'aside', 'section', 'article', 'form'))
+HEADING_TAGS = ('h1', 'h2', 'h3', 'h4', 'h5', 'h6')
+
+# Qisqa matn ko'rsatiladigan taglar
+SNIPPET_TAGS = {'h1': 60, 'h2': 60, 'h3': 50, 'h4': 40, 'h5': 40, 'h6': 40, 'button': 30, 'a': 30, 'label': 30}
+
+MAX_DEPTH = 24
+MIN_LAYOUT_DEPTH = 2
+MAX_PATTERN_PERIOD = 3
+MAX_CLASSES_PER_NODE = 3
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(text: str) -> int:
+    """Taxminiy token soni (~4 belgi = 1 token)"""
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def _snippet(text: str, limit: int) -> str:
+    text = ' '.join(text.split())
+    return text if len(text) <= limit else text[:limit - 1] + '…'
+
+
+@dataclass
+class DomSkeleton:
+    """Distillation natijasi"""
+    layout: List[Tuple[int, str]] = field(default_factory=list)  # (depth, qator)
+    headings: List[Tuple[int, str]] = field(default_factory=list)  # (level, matn)
+    classes: Counter = field(default_factory=Counter)
+    elements: int = 0
+
+    def render(self, token_budget: int) -> str:
+        """Budjetga sig'adigan matn ko'rinishi"""
+        char_budget = token_budget * CHARS_PER_TOKEN
+
+        class_line = self._render_classes(char_budget * 15 // 100)
+        heading_lines = self._render_headings(char_budget * 25 // 100)
+        sections_size = len(class_line) + sum(len(line) + 1 for line in heading_lines)
+        layout_lines = self._render_layout(char_budget - sections_size - len('Layout:\nHeadings:\n'))
+
+        parts = ['Layout:', *layout_lines]
+        if heading_lines:
+            parts.extend(['Headings:', *heading_lines])
+        if class_line:
+            parts.append(class_line)
+        return '\n'.join(parts)
+
+    def _render_layout(self, budget: int) -> List[str]:
+        lines = self.layout
+        if not lines:
+            return []
+        # Sig'maguncha eng chuqur darajani tashlash (yuqori 3 daraja saqlanadi, keyin dum kesiladi)
+        max_depth = max(depth for depth, _ in lines)
+        while max_depth > MIN_LAYOUT_DEPTH and sum(2 * depth + len(text) + 1 for depth, text in lines if depth <= max_depth) > budget:
+            max_depth -= 1
+        rendered, size = [], 0
+        for depth, text in lines:
+            if depth > max_depth:
+                continue
+            line = '  ' * depth + text
+            if size + len(line) + 1 > budget:
+                rendered.append('…')
+                break
+            rendered.append(line)
+            size += len(line) + 1
+        return rendered
+
+    def _render_headings(self, budget: int) -> List[str]:
+        # Ketma-ket bir xil heading lar bitta qatorga
+        grouped: List[Tuple[int, str, int]] = []
+        for level, text in self.headings:
+            if grouped and grouped[-1][:2] == (level, text):
+                grouped[-1] = (level, text, grouped[-1][2] + 1)
+            else:
+                grouped.append((level, text, 1))
+
+        rendered, size = [], len('Headings:') + 1
+        for index, (level, text, count) in enumerate(grouped):
+            line = '  ' * (level - 1) + f'h{level} {text}' + (f' ×{count}' if count > 1 else '')
+            if size + len(line) + 1 > budget:
+                rendered.append(f'… (+{len(grouped) - index} more)')
+                break
+            rendered.append(line)
+            size += len(line) + 1
+        return rendered
+
+    def _render_classes(self, budget: int) -> str:
+        line = 'Classes:'
+        for name, count in self.classes.most_common():
+            item = f' {name}({count})' if count > 1 else f' {name}'
+            if len(line) + len(item) > budget:
+                break
+            line += item
+        return line if line != 'Classes:' else ''
+
+
+def _repeat_at(signatures: List, index: int) -> Tuple[int, int]:
+    """index dan boshlanuvchi eng uzun takrorlanuvchi naqsh: (period, takrorlar soni)"""
+    best_period, best_repeats = 1, 1
+    for period in range(1, MAX_PATTERN_PERIOD + 1):
+        block = signatures[index:index + period]
+        if len(block) < period:
+            break
+        repeats = 1
+        while signatures[index + period * repeats:index + period * (repeats + 1)] == block:
+            repeats += 1
+        # period > 1 faqat aniq yutuq bo'lsa (h3, p, h3, p ...)
+        if repeats > 1 and period * repeats > best_period * best_repeats and (period == 1 or repeats > best_repeats):
+            best_period, best_repeats = period, repeats
+    return best_period, best_repeats
+
+
+def _classes(element: HTMLElement) -> List[str]:
+    return (element.get('class') or '').split()
+
+
+class SkeletonCollector(NodeVisitor):
+    """Skelet statistikasi (class lar, heading lar, elementlar soni) - document aylanishidagi visitor"""
+
+    skip = DISTILL_SKIP_TAGS
+
+    def __init__(self):
+        self.skeleton = DomSkeleton()
+
+    def element(self, node: HTMLElement):
+        tag = node.tag
+        if tag in DISTILL_SKIP_TAGS or tag == 'html':
+            return
+        skeleton = self.skeleton
+        skeleton.elements += 1
+        skeleton.classes.update(_classes(node))
+        if tag in HEADING_TAGS:
+            text = _snippet(node.text(), 80)
+            if text:
+                skeleton.headings.append((int(tag[1]), text))
+
+
+class DomDistiller:
+    """Parse qilingan document dan skelet yaratish"""
+
+    def __init__(self, max_depth: int = MAX_DEPTH):
+        self.max_depth = max_depth
+
+    def distill(self, doc: HTMLDocument, collector: Optional[SkeletonCollector] = None) -> DomSkeleton:
+        """collector - shu document uchun visit_document da to'ldirilgan statistika (bo'lmasa alohida aylanish)"""
+        if collector is None:
+            collector = SkeletonCollector()
+            visit_document(doc, [collector])
+        skeleton = collector.skeleton
+        body = doc.find('body')
+        roots = [body] if body is not None else [node for node in doc.top_nodes() if isinstance(node, HTMLElement)]
+        for root in roots:
+            self._walk(root, 0, skeleton)
+        return skeleton
+
+    def _label(self, element: HTMLElement, classes: List[str]) -> str:
+        label = element.tag
+        element_id = element.get('id')
+        if element_id:
+            label += f'#{element_id[:30]}'
+        if classes:
+            label += ''.join(f'.{name[:30]}' for name in classes[:MAX_CLASSES_PER_NODE])
+        role = element.get('role')
+        if role:
+            label += f'[role={role}]'
+        if element.tag in SNIPPET_TAGS:
+            text = _snippet(element.text(), SNIPPET_TAGS[element.tag])
+            if text:
+                label += f' "{text}"'
+        elif element.tag == 'img':
+            alt = element.get('alt')
+            if alt:
+                label += f' "{_snippet(alt, 30)}"'
+        return label
+
+    def _walk(self, element: HTMLElement, depth: int, skeleton: DomSkeleton, repeat: int = 1):
+        while True:
+            classes = _classes(element)
+            tag = element.tag
+            children = [
+                child for child in element.children()
+                if isinstance(child, HTMLElement) and child.tag not in DISTILL_SKIP_TAGS
+            ]
+
+            # id / class / role siz, yagona child li wrapper - qator chiqarilmaydi
+            is_wrapper = (
+                tag in ('div', 'span') and len(children) == 1 and repeat == 1
+                and not classes and not element.get('id') and not element.get('role')
+            )
+            if not is_wrapper:
+                break
+            element = children[0]
+
+        label = self._label(element, classes)
+        if repeat > 1:
+            label += f' ×{repeat}'
+        skeleton.layout.append((depth, label))
+
+        if tag in LEAF_TAGS or tag in HEADING_TAGS or depth >= self.max_depth:
+            return
+
+        # Takrorlanuvchi sibling lar bitta qatorga: bitta element (card ×6) yoki
+        # bir nechta elementdan iborat naqsh (h3 + p ×4); takrorlarning ichiga kirilmaydi
+        signatures = [self._signature(child) for child in children]
+        index = 0
+        while index < len(children):
+            period, repeats = _repeat_at(signatures, index)
+            block = children[index:index + period]
+            if period == 1:
+                if block[0].tag not in INLINE_TAGS:
+                    self._walk(block[0], depth + 1, skeleton, repeat=repeats)
+            else:
+                skeleton.layout.append((depth + 1, f'[pattern ×{repeats}]'))
+                for node in block:
+                    if node.tag not in INLINE_TAGS:
+                        self._walk(node, depth + 2, skeleton)
+            index += period * repeats
+
+    @staticmethod
+    def _signature(element: HTMLElement) -> Tuple[str, Tuple[str, ...]]:
+        return element.tag, tuple(sorted(_classes(element)))
+
+
+def distill_dom(doc: HTMLDocument, token_budget: int, max_depth: Optional[int] = None,
+                collector: Optional[SkeletonCollector] = None) -> str:
+    """Document -> token budjetiga mos skelet matni"""
+    skeleton = DomDistiller(max_depth or MAX_DEPTH).distill(doc, collector)
+    return skeleton.render(token_budget)
@@ -0,0 +1,234 @@
+"""
+🔎 Single-pass DOM Extraction
+Sahifadan meta, OG, link, rasm, style va matnni bitta aylanishda olish
+
+Har bir ma'lumot turi uchun alohida find_all o'rniga document bir marta
+aylanib chiqiladi va tag bo'yicha handler chaqiriladi. Limitga yetgan
+kategoriya uchun yig'ish to'xtatiladi.
+
+Boshqa collector lar (content fingerprint, shell signallar, skelet statistikasi) ham
+NodeVisitor sifatida xuddi shu aylanishga ulanadi - visit_document(doc, [...]).
+"""
+
+from dataclasses import dataclass, field
+from typing import Dict, FrozenSet, List, Optional, Sequence
+from html_parsers import SKIP_TEXT_TAGS, HTMLDocument, HTMLElement
+from url_normalize import UrlResolver, canonicalize_url
+
+LINK_LIMIT = 20
+IMAGE_LIMIT = 50
+STYLESHEET_LIMIT = 10
+INLINE_CSS_LIMIT = 5000
+INLINE_CSS_PARSE_LIMIT = 256 * 1024
+INTERNAL_LINK_LIMIT = 500
+
+
+@dataclass
+class PageExtract:
+    """Bitta aylanish natijasi"""
+    title: Optional[str] = None
+    meta_data: Dict[str, str] = field(default_factory=dict)
+    links: List[Dict[str, str]] = field(default_factory=list)
+    images: List[Dict[str, str]] = field(default_factory=list)
+    styles: Dict[str, object] = field(default_factory=dict)
+    text: str = ''
+    inline_css: str = ''
+    internal_links: List[str] = field(default_factory=list)
+
+
+class NodeVisitor:
+    """Bitta document aylanishiga ulanadigan collector"""
+
+    # Bu taglarning ichidagi node lar visitor ga berilmaydi (elementning o'zi beriladi)
+    skip: FrozenSet[str] = frozenset(SKIP_TEXT_TAGS)
+
+    def element(self, node: HTMLElement):
+        pass
+
+    def text(self, text: str):
+        pass
+
+
+def visit_document(doc: HTMLDocument, visitors: Sequence[NodeVisitor]):
+    """Document ni bir marta aylanib, har node ni hamma visitor ga berish.
+
+    Aylanish visitor lar skip larining umumiy qismi bilan; qolgan skip taglar
+    depth bo'yicha har visitor uchun alohida yopiladi.
+    """
+    common_skip = frozenset.intersection(*(frozenset(visitor.skip) for visitor in visitors))
+    hidden_below = [None] * len(visitors)  # visitor uchun yopilgan skip element depth i
+    pairs = list(enumerate(visitors))
+    for depth, node in doc.walk(common_skip):
+        if isinstance(node, str):
+            for index, visitor in pairs:
+                hidden = hidden_below[index]
+                if hidden is not None:
+                    if depth > hidden:
+                        continue
+                    hidden_below[index] = None
+                visitor.text(node)
+            continue
+        tag = node.tag
+        for index, visitor in pairs:
+            hidden = hidden_below[index]
+            if hidden is not None:
+                if depth > hidden:
+                    continue
+                hidden_below[index] = None
+            visitor.element(node)
+            if tag in visitor.skip and tag not in common_skip:
+                hidden_below[index] = depth
+
+
+class PageExtractor(NodeVisitor):
+    """Visitor asosidagi bir martalik extraction"""
+
+    def __init__(
+        self,
+        base_url: str,
+        link_limit: int = LINK_LIMIT,
+        image_limit: int = IMAGE_LIMIT,
+        stylesheet_limit: int = STYLESHEET_LIMIT,
+        inline_css_limit: int = INLINE_CSS_LIMIT,
+        internal_link_limit: int = INTERNAL_LINK_LIMIT,
+    ):
+        self.base_url = base_url
+        # Base URL bir marta parse qilinadi; ichki / tashqi - origin taqqoslash bilan
+        self.resolver = UrlResolver(base_url)
+        self.link_limit = link_limit
+        self.image_limit = image_limit
+        self.stylesheet_limit = stylesheet_limit
+        self.inline_css_limit = inline_css_limit
+        self.internal_link_limit = internal_link_limit
+
+        self._handlers = {
+            'title': self._visit_title,
+            'meta': self._visit_meta,
+            'html': self._visit_html,
+            'a': self._visit_anchor,
+            'img': self._visit_image,
+            'style': self._visit_style,
+            'link': self._visit_link,
+        }
+
+        self.reset()
+
+    def reset(self):
+        """Yangi document uchun holatni tozalash"""
+        self._result = PageExtract()
+        self._inline_css: List[str] = []
+        self._inline_css_size = 0
+        self._external_css: List[str] = []
+        self._lang_seen = False
+        self._internal_seen = set()
+        self._text_parts: List[str] = []
+
+    def extract(self, doc: HTMLDocument) -> PageExtract:
+        """Document ni bir marta aylanib, hamma ma'lumotni yig'ish"""
+        self.reset()
+        visit_document(doc, [self])
+        return self.result()
+
+    # NodeVisitor
+    def element(self, node: HTMLElement):
+        handler = self._handlers.get(node.tag)
+        if handler is not None:
+            handler(node)
+
+    def text(self, text: str):
+        self._text_parts.append(text)
+
+    def result(self) -> PageExtract:
+        """Aylanish tugagandan keyingi natija"""
+        result = self._result
+        inline_css = ''.join(self._inline_css)
+        if inline_css.strip():
+            result.styles['inline'] = inline_css[:self.inline_css_limit]
+            result.inline_css = inline_css[:INLINE_CSS_PARSE_LIMIT]
+        result.styles['external'] = self._external_css
+        result.text = ''.join(self._text_parts)
+        return result
+
+    # Tag handler lari
+    def _visit_title(self, node: HTMLElement):
+        if self._result.title is None:
+            self._result.title = node.text()
+
+    def _visit_meta(self, node: HTMLElement):
+        meta_data = self._result.meta_data
+        name = node.get('name')
+        if name in ('description', 'keywords') and name not in meta_data:
+            meta_data[name] = node.get('content', '')
+
+        # Open Graph
+        property_name = node.get('property')
+        if property_name and property_name.startswith('og:'):
+            meta_data[f"og_{property_name.replace('og:', '')}"] = node.get('content', '')
+
+    def _visit_html(self, node: HTMLElement):
+        if self._lang_seen:
+            return
+        self._lang_seen = True
+        lang = node.get('lang')
+        if lang:
+            self._result.meta_data['language'] = lang
+
+    def _visit_anchor(self, node: HTMLElement):
+        href = node.get('href')
+        if not href:
+            return
+        links = self._result.links
+        collect_link = len(links) < self.link_limit
+        collect_internal = len(self._internal_seen) < self.internal_link_limit
+        if not (collect_link or collect_internal):
+            return
+
+        absolute_url = self.resolver.resolve(href)
+        is_external = not self.resolver.is_internal(absolute_url)
+
+        # Crawler uchun ichki sahifalar (canonical ko'rinishda, takrorlanmas)
+        if collect_internal and not is_external:
+            target = canonicalize_url(absolute_url)
+            if target not in self._internal_seen:
+                self._internal_seen.add(target)
+                self._result.internal_links.append(target)
+
+        if collect_link:
+            links.append({
+                'text': node.text().strip(),
+                'href': href,
+                'absolute_url': absolute_url,
+                'is_external': is_external
+            })
+
+    def _visit_image(self, node: HTMLElement):
+        images = self._result.images
+        if len(images) >= self.image_limit:
+            return
+        src = node.get('src')
+        if not src:
+            return
+        images.append({
+            'src': src,
+            'absolute_url': self.resolver.resolve(src),
+            'alt': node.get('alt', ''),
+            'width': node.get('width', ''),
+            'height': node.get('height', '')
+        })
+
+    def _visit_style(self, node: HTMLElement):
+        # To'liq inline CSS stylesheet stage uchun kattaroq limit bilan yig'iladi
+        if self._inline_css_size >= INLINE_CSS_PARSE_LIMIT:
+            return
+        css = node.text() + '\n'
+        self._inline_css.append(css)
+        self._inline_css_size += len(css)
+
+    def _visit_link(self, node: HTMLElement):
+        if len(self._external_css) >= self.stylesheet_limit:
+            return
+        if 'stylesheet' not in (node.get('rel') or '').split():
+            return
+        href = node.get('href')
+        if href:
+            self._external_css.append(self.resolver.resolve(href))
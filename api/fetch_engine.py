@@ -0,0 +1,262 @@
+"""
+⚡ Async Fetch Engine
+asyncio + aiohttp asosidagi sahifa yuklash mexanizmi
+
+Features:
+- Bitta process ichida yuzlab parallel fetch
+- Host bo'yicha connection limit (umumiy HTTP pool konfiguratsiyasidan)
+- Global concurrency cap
+- Sync kod (Flask route lar) uchun thread-safe wrapper
+- gzip / deflate / br / zstd body lar streaming decode qilinadi (decode limiti bilan)
+"""
+
+import asyncio
+import concurrent.futures
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Dict, Optional, Tuple, TypeVar
+from urllib.parse import urlparse
+
+import aiohttp
+
+from content_encoding import ACCEPT_ENCODING, ContentDecodingError, StreamDecoder
+from html_parsers import content_type_charset
+from http_pool import get_http_pool
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar('T')
+
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+    'Accept-Language': 'en-US,en;q=0.5',
+    'Accept-Encoding': ACCEPT_ENCODING,
+    'Connection': 'keep-alive',
+}
+
+
+HTML_CONTENT_TYPES = ('text/html', 'application/xhtml+xml')
+
+# Content-Type noto'g'ri ko'rsatilgan binary fayllarni aniqlash uchun
+BINARY_SIGNATURES = (b'%PDF', b'PK\x03\x04', b'\x89PNG', b'GIF8', b'\xff\xd8\xff', b'\x1f\x8b')
+
+CHUNK_SIZE = 64 * 1024
+
+
+class FetchError(Exception):
+    """Fetch jarayonidagi xatolik"""
+
+
+class UnsupportedContentError(FetchError):
+    """Javob kutilgan content turida emas"""
+
+
+def looks_binary(chunk: bytes) -> bool:
+    """Birinchi chunk bo'yicha binary kontentni aniqlash"""
+    head = chunk[:1024]
+    return head.startswith(BINARY_SIGNATURES) or b'\x00' in head
+
+
+@dataclass
+class FetchResult:
+    """Yuklangan sahifa natijasi"""
+    url: str
+    status: int
+    headers: Dict[str, str]  # kalitlar kichik harfda ('etag', 'last-modified', ...)
+    content: bytes
+    elapsed: float = 0.0
+    meta: Dict[str, object] = field(default_factory=dict)
+
+
+class AsyncFetchEngine:
+    """Event loop alohida thread da ishlaydigan async fetch engine.
+
+    Session va connector faqat engine loop ida yashaydi. Boshqa loop yoki
+    oddiy thread lardan kelgan chaqiruvlar shu loop ga yo'naltiriladi.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: Optional[int] = None,
+        per_host_limit: Optional[int] = None,
+        timeout: Optional[float] = None,
+        headers: Optional[Dict[str, str]] = None,
+    ):
+        self.pool = get_http_pool()
+        self.max_concurrency = max_concurrency or int(os.getenv('SCRAPER_MAX_CONCURRENCY', 200))
+        self.per_host_limit = per_host_limit
+        self.timeout = timeout or float(os.getenv('API_TIMEOUT', 30))
+        self.headers = dict(headers or DEFAULT_HEADERS)
+        # max_bytes berilmagan fetch lar uchun ham decode qilingan hajm cheklovi
+        self.max_decoded_bytes = int(os.getenv('FETCH_MAX_DECODED_BYTES', 50 * 1024 * 1024))
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._host_semaphores: Dict[str, asyncio.Semaphore] = {}
+        self._lock = threading.Lock()
+
+    # Event loop boshqaruvi
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        """Background event loop ni ishga tushirish (lazy)"""
+        with self._lock:
+            if self._loop is None or self._loop.is_closed():
+                loop = asyncio.new_event_loop()
+                thread = threading.Thread(target=loop.run_forever, name='fetch-engine', daemon=True)
+                thread.start()
+                self._loop, self._thread = loop, thread
+                logger.info(
+                    f"⚡ Fetch engine started (max_concurrency={self.max_concurrency}, "
+                    f"per_host={self.per_host_limit or self.pool.per_host})"
+                )
+            return self._loop
+
+    def run(self, coro: Awaitable[T]) -> T:
+        """Coroutine ni engine loop ida bajarib, natijani sync qaytarish"""
+        loop = self._ensure_loop()
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop:
+            raise RuntimeError('AsyncFetchEngine.run() cannot be called from the engine loop; await instead')
+        return asyncio.run_coroutine_threadsafe(coro, loop).result()
+
+    def submit(self, coro: Awaitable[T]) -> 'concurrent.futures.Future[T]':
+        """Coroutine ni engine loop ga yuborish (natijani kutmasdan)"""
+        return asyncio.run_coroutine_threadsafe(coro, self._ensure_loop())
+
+    async def _in_engine_loop(self, coro: Awaitable[T]) -> T:
+        """Coroutine ni engine loop ida bajarish (istalgan loop dan await qilsa bo'ladi)"""
+        loop = self._ensure_loop()
+        if asyncio.get_running_loop() is loop:
+            return await coro
+        return await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(coro, loop))
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Shared ClientSession (faqat engine loop ichida chaqiriladi)"""
+        if self._session is None or self._session.closed:
+            # Host limitlari _host_semaphore orqali; DNS cache va statistika umumiy pool dan
+            connector = aiohttp.TCPConnector(
+                limit=self.max_concurrency,
+                limit_per_host=0,
+                use_dns_cache=False,
+                resolver=self.pool.aiohttp_resolver(),
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                headers=self.headers,
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+                # Decode ni o'zimiz qilamiz - wire/decoded byte lar va decode limiti uchun
+                auto_decompress=False,
+                trace_configs=[self.pool.aiohttp_trace_config()],
+            )
+        return self._session
+
+    def _host_semaphore(self, url: str) -> asyncio.Semaphore:
+        """Host bo'yicha connection limiti (HTTP_POOL_PER_HOST / HTTP_POOL_HOST_LIMITS)"""
+        host = (urlparse(url).hostname or '').lower()
+        semaphore = self._host_semaphores.get(host)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self.per_host_limit or self.pool.limit_for(host))
+            self._host_semaphores[host] = semaphore
+        return semaphore
+
+    # Public API
+    async def fetch(
+        self,
+        url: str,
+        headers: Optional[Dict[str, str]] = None,
+        max_bytes: Optional[int] = None,
+        content_types: Optional[Tuple[str, ...]] = None,
+        open_feed: Optional[Callable[[Optional[str]], Callable[[bytes], None]]] = None,
+    ) -> FetchResult:
+        """URL ni yuklash - 4xx/5xx javoblarda FetchError.
+
+        max_bytes      - decode qilingan body shu hajmga yetganda o'qish to'xtatiladi (meta['truncated'])
+        content_types  - ruxsat etilgan Content-Type lar; boshqasi body o'qilmasdan rad etiladi
+        open_feed      - body o'qishdan oldin Content-Type charset i bilan chaqiriladi; qaytargan
+                         funksiya har bir chunk bilan chaqiriladi (incremental parser uchun)
+        """
+        return await self._in_engine_loop(self._fetch(url, headers, max_bytes, content_types, open_feed))
+
+    async def _fetch(self, url, headers=None, max_bytes=None, content_types=None, open_feed=None) -> FetchResult:
+        session = self._get_session()
+        started = time.monotonic()
+        try:
+            async with self._host_semaphore(url), session.get(url, headers=headers, allow_redirects=True) as response:
+                if response.status >= 400:
+                    raise FetchError(f"{response.status} {response.reason} for url: {response.url}")
+
+                if content_types and response.status != 304:
+                    mime = response.headers.get('Content-Type', '').split(';')[0].strip().lower()
+                    if mime and mime not in content_types:
+                        raise UnsupportedContentError(f"Unsupported content type '{mime}' for url: {response.url}")
+
+                limit = min(max_bytes, self.max_decoded_bytes) if max_bytes is not None else self.max_decoded_bytes
+                decoder = StreamDecoder(response.headers.get('Content-Encoding'), limit)
+                feed = open_feed(content_type_charset(response.headers.get('Content-Type'))) if open_feed else None
+                chunks = []
+                async for raw_chunk in response.content.iter_chunked(CHUNK_SIZE):
+                    chunk = decoder.feed(raw_chunk)
+                    if not chunks and chunk and content_types and looks_binary(chunk):
+                        raise UnsupportedContentError(f"Binary content served as HTML for url: {response.url}")
+                    if chunk:
+                        chunks.append(chunk)
+                        if feed is not None:
+                            feed(chunk)
+                    if decoder.finished:
+                        logger.info(f"✂️ Byte budget ({limit}) reached, stopped reading: {response.url}")
+                        break
+
+                transfer = decoder.metrics
+                self.pool.stats.record_transfer(transfer)
+                logger.debug(
+                    f"📦 {response.url}: {transfer.wire_bytes} wire -> {transfer.decoded_bytes} decoded bytes "
+                    f"({transfer.content_encoding})"
+                )
+                return FetchResult(
+                    url=str(response.url),
+                    status=response.status,
+                    headers={k.lower(): v for k, v in response.headers.items()},
+                    content=b''.join(chunks),
+                    elapsed=time.monotonic() - started,
+                    meta={
+                        'truncated': transfer.truncated,
+                        'bytes': transfer.decoded_bytes,
+                        'wire_bytes': transfer.wire_bytes,
+                        'content_encoding': transfer.content_encoding,
+                    },
+                )
+        except ContentDecodingError as e:
+            raise FetchError(f"{str(e)} for url: {url}")
+        except asyncio.TimeoutError:
+            raise FetchError(f"Timeout after {self.timeout}s for url: {url}")
+        except aiohttp.ClientError as e:
+            raise FetchError(str(e))
+
+    def fetch_sync(self, url: str, headers: Optional[Dict[str, str]] = None, **kwargs) -> FetchResult:
+        """fetch() ning sync varianti"""
+        return self.run(self._fetch(url, headers, **kwargs))
+
+    def close(self):
+        """Session va event loop ni yopish"""
+        with self._lock:
+            loop, self._loop = self._loop, None
+        if loop is None or loop.is_closed():
+            return
+
+        async def _shutdown():
+            if self._session is not None and not self._session.closed:
+                await self._session.close()
+            self._session = None
+
+        asyncio.run_coroutine_threadsafe(_shutdown(), loop).result()
+        loop.call_soon_threadsafe(loop.stop)
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+        loop.close()
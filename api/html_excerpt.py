@@ -0,0 +1,234 @@
+"""
+✂️ Bounded HTML Excerpt
+Butun document ni serialize qilmasdan, belgilar budjeti tugaguncha HTML excerpt yaratish
+
+- excerpt_html     - document tartibida, budjet tugaganda to'xtaydi (ochiq taglar yopiladi)
+- structured_excerpt - tuzilmani saqlovchi excerpt: <head>, landmark lar
+  (header/nav/aside/footer) va birinchi N ta bo'lim, qolganlari comment bilan qisqartiriladi
+
+Ikkalasi ham tree ni lazy aylanadi (HTMLElement.children) va document ni o'zgartirmaydi.
+"""
+
+from html import escape
+from typing import Iterable, List, Optional, Tuple
+
+from html_parsers import HTMLDocument, HTMLElement
+
+# Excerpt ga kirmaydigan taglar (ichidagi kontent bilan birga)
+EXCERPT_SKIP_TAGS = ('script', 'style', 'noscript', 'template', 'svg')
+
+VOID_TAGS = frozenset((
+    'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input', 'link', 'meta',
+    'param', 'source', 'track', 'wbr',
+))
+
+LANDMARK_TAGS = ('header', 'nav', 'aside', 'footer')
+HEAD_KEEP_TAGS = ('title', 'meta', 'link', 'base')
+
+DEFAULT_MAX_SECTIONS = 5
+
+
+def _start_tag(element: HTMLElement) -> str:
+    parts = [element.tag]
+    for name, value in element.attributes():
+        parts.append(name if value is None else f'{name}="{escape(value)}"')
+    return f"<{' '.join(parts)}>"
+
+
+def _is_blank(node) -> bool:
+    return isinstance(node, str) and not node.strip()
+
+
+class _ExcerptWriter:
+    """Budjet hisobini yurituvchi yozuvchi"""
+
+    def __init__(self, skip: Iterable[str]):
+        self.parts: List[str] = []
+        self.size = 0
+        self.skip = frozenset(skip)
+
+    def write(self, text: str):
+        self.parts.append(text)
+        self.size += len(text)
+
+    def subtree(self, node, limit: int) -> bool:
+        """node ni (element yoki matn) limit pozitsiyasigacha yozish.
+
+        Sig'magan joyda to'xtaydi, ochiq taglarni yopadi va False qaytaradi.
+        """
+        stack = [iter((node,))]
+        closers: List[str] = []
+        reserve = 0  # ochiq taglarni yopish uchun kerakli joy
+        while stack:
+            child = next(stack[-1], None)
+            if child is None:
+                stack.pop()
+                if closers:
+                    closer = closers.pop()
+                    reserve -= len(closer)
+                    self.write(closer)
+                continue
+
+            room = limit - self.size - reserve
+            if isinstance(child, str):
+                text = escape(child, quote=False)
+                if len(text) > room:
+                    self._write_partial(child, room)
+                    break
+                self.write(text)
+                continue
+
+            tag = child.tag
+            if tag in self.skip:
+                continue
+            start = _start_tag(child)
+            closer = '' if tag in VOID_TAGS else f'</{tag}>'
+            if len(start) + len(closer) > room:
+                break
+            self.write(start)
+            if closer:
+                closers.append(closer)
+                reserve += len(closer)
+                stack.append(child.children())
+        else:
+            return True
+
+        for closer in reversed(closers):
+            self.write(closer)
+        return False
+
+    def _write_partial(self, text: str, room: int):
+        # Entity (&amp;) o'rtasidan kesilmasligi uchun xom matn kesiladi
+        cut = text[:max(room, 0)]
+        escaped = escape(cut, quote=False)
+        while len(escaped) > room and cut:
+            cut = cut[:len(cut) - (len(escaped) - room)]
+            escaped = escape(cut, quote=False)
+        if escaped:
+            self.write(escaped)
+
+    def result(self) -> str:
+        return ''.join(self.parts)
+
+
+def excerpt_html(doc: HTMLDocument, budget: int, skip: Iterable[str] = EXCERPT_SKIP_TAGS) -> str:
+    """Document boshidan budget belgigacha HTML (to'g'ri yopilgan taglar bilan)"""
+    writer = _ExcerptWriter(skip)
+    for node in doc.top_nodes():
+        if not writer.subtree(node, budget):
+            break
+    return writer.result()
+
+
+def _significant_children(element: HTMLElement, skip) -> List:
+    return [
+        child for child in element.children()
+        if not _is_blank(child) and not (isinstance(child, HTMLElement) and child.tag in skip)
+    ]
+
+
+def _find_child(nodes, tag: str) -> Optional[HTMLElement]:
+    for node in nodes:
+        if isinstance(node, HTMLElement) and node.tag == tag:
+            return node
+    return None
+
+
+def _body_blocks(body: HTMLElement, skip, max_sections: int) -> Tuple[List[HTMLElement], List, int]:
+    """body dagi wrapper lar, tanlangan bloklar va tashlab ketilgan bo'limlar soni.
+
+    Yagona child li wrapper lar (<div id="root">) ichiga kiriladi, <main> ning
+    child lari bo'lim hisoblanadi. Bloklar ro'yxatida ('raw', html) - o'zgarmas
+    tag (<main> / </main>), qolganlari budjet ulushi oladigan node lar.
+    """
+    wrappers = []
+    children = _significant_children(body, skip)
+    while (
+        len(children) == 1
+        and isinstance(children[0], HTMLElement)
+        and children[0].tag not in LANDMARK_TAGS + ('main',)
+    ):
+        wrappers.append(children[0])
+        children = _significant_children(children[0], skip)
+
+    blocks = []
+    sections = 0
+    omitted = 0
+
+    def add_section(node):
+        nonlocal sections, omitted
+        if sections < max_sections:
+            blocks.append(node)
+            sections += 1
+        else:
+            omitted += 1
+
+    for child in children:
+        if isinstance(child, HTMLElement) and child.tag in LANDMARK_TAGS:
+            blocks.append(child)
+        elif isinstance(child, HTMLElement) and child.tag == 'main':
+            # main ning o'zi saqlanadi, ichidagi bo'limlar sanaladi
+            blocks.append(('raw', _start_tag(child)))
+            for section in _significant_children(child, skip):
+                add_section(section)
+            blocks.append(('raw', '</main>'))
+        else:
+            add_section(child)
+    return wrappers, blocks, omitted
+
+
+def structured_excerpt(
+    doc: HTMLDocument,
+    budget: int,
+    max_sections: int = DEFAULT_MAX_SECTIONS,
+    skip: Iterable[str] = EXCERPT_SKIP_TAGS,
+) -> str:
+    """Tuzilmani saqlovchi excerpt: head, landmark lar va birinchi max_sections ta bo'lim.
+
+    Budjet bloklar orasida teng bo'linadi; ishlatilmagan joy keyingi bloklarga o'tadi.
+    """
+    skip = frozenset(skip)
+    html = _find_child(doc.top_nodes(), 'html')
+    if html is None:
+        return excerpt_html(doc, budget, skip)
+
+    writer = _ExcerptWriter(skip)
+    top = list(html.children())
+    head = _find_child(top, 'head')
+    body = _find_child(top, 'body')
+    # Ba'zi backend lar (html.parser) <body> yaratmaydi
+    body = body or html
+
+    wrappers, blocks, omitted = _body_blocks(body, skip | {'head'}, max_sections)
+    openers = [html] + ([body] if body is not html else []) + wrappers
+    closing = ''.join(f'</{element.tag}>' for element in reversed(openers))
+    omitted_note = f'<!-- {omitted} more sections omitted -->' if omitted else ''
+    end = budget - len(closing) - len(omitted_note)
+
+    writer.write(_start_tag(html))
+    if head is not None:
+        # head - faqat title / meta / link (budjetning ko'pi bilan 1/4 qismi)
+        head_limit = writer.size + max(end // 4, 0)
+        writer.write('<head>')
+        for node in head.children():
+            if isinstance(node, HTMLElement) and node.tag in HEAD_KEEP_TAGS:
+                if not writer.subtree(node, head_limit - len('</head>')):
+                    break
+        writer.write('</head>')
+    for element in openers[1:]:
+        writer.write(_start_tag(element))
+
+    reserve = sum(len(block[1]) for block in blocks if isinstance(block, tuple))
+    remaining = sum(1 for block in blocks if not isinstance(block, tuple))
+    for block in blocks:
+        if isinstance(block, tuple):
+            writer.write(block[1])
+            reserve -= len(block[1])
+            continue
+        share = max((end - reserve - writer.size) // remaining, 0)
+        remaining -= 1
+        writer.subtree(block, writer.size + share)
+
+    writer.write(omitted_note)
+    writer.write(closing)
+    return writer.result()
@@ -0,0 +1,500 @@
+"""
+🧩 HTML Parser Backends
+Scraper uchun almashtiriladigan HTML parser lar
+
+Backend lar:
+- html.parser - BeautifulSoup + Python html.parser (default, eng sekin)
+- lxml        - lxml.html (C, tez)
+- selectolax  - selectolax Lexbor (C, eng tez)
+
+Backend HTML_PARSER_BACKEND environment o'zgaruvchisi orqali tanlanadi.
+Hamma backend bir xil HTMLDocument / HTMLElement interfeysini beradi, shuning uchun
+scraper ning _extract_* helper lari backend ga bog'liq emas.
+
+Encoding hamma backend da bir xil aniqlanadi (resolve_encoding): BOM -> HTTP Content-Type
+charset i (parse / feeder ning encoding argumenti) -> <meta charset> -> utf-8.
+"""
+
+import codecs
+import os
+from typing import Iterable, Iterator, List, Optional, Tuple, Union
+
+SKIP_TEXT_TAGS = ('script', 'style')
+# <template> ichi inert (document tree ning qismi emas) - hamma backend da har doim o'tkazib yuboriladi
+INERT_TAGS = frozenset(('template',))
+
+DEFAULT_ENCODING = 'utf-8'
+# <meta charset> shu hajmdagi boshlang'ich qismdan qidiriladi
+SNIFF_BYTES = 4096
+
+
+def _known_encoding(name: Optional[str]) -> Optional[str]:
+    if not name:
+        return None
+    try:
+        return codecs.lookup(name.strip()).name
+    except LookupError:
+        return None
+
+
+def content_type_charset(content_type: Optional[str]) -> Optional[str]:
+    """'text/html; charset="windows-1251"' -> 'windows-1251' (yo'q bo'lsa None)"""
+    for param in (content_type or '').split(';')[1:]:
+        name, _, value = param.partition('=')
+        if name.strip().lower() == 'charset':
+            return value.strip().strip('"\'') or None
+    return None
+
+
+def resolve_encoding(head: bytes, encoding: Optional[str] = None) -> str:
+    """Document encoding i (Python codec nomi): BOM -> berilgan charset -> <meta charset> -> utf-8"""
+    from bs4.dammit import EncodingDetector
+
+    _, bom = EncodingDetector.strip_byte_order_mark(head[:4])
+    declared = EncodingDetector.find_declared_encoding(head[:SNIFF_BYTES], is_html=True)
+    for candidate in (bom, encoding, declared):
+        known = _known_encoding(candidate)
+        if known:
+            return known
+    return DEFAULT_ENCODING
+
+
+def decode_html(content: bytes, encoding: Optional[str] = None) -> str:
+    """Bytes -> str (resolve_encoding bo'yicha, noto'g'ri byte lar U+FFFD)"""
+    return content.decode(resolve_encoding(content, encoding), errors='replace')
+
+
+class HTMLElement:
+    """Backend ga bog'liq bo'lmagan element interfeysi"""
+
+    tag: str
+
+    def get(self, name: str, default: Optional[str] = None) -> Optional[str]:
+        """Atribut qiymati (ko'p qiymatli atributlar bo'sh joy bilan birlashtiriladi)"""
+        raise NotImplementedError
+
+    def text(self) -> str:
+        """Element ichidagi barcha matn"""
+        raise NotImplementedError
+
+    def attributes(self) -> List[Tuple[str, Optional[str]]]:
+        """Barcha atributlar (name, value) - qiymatsiz atributda value None"""
+        raise NotImplementedError
+
+    def children(self) -> Iterator[Union['HTMLElement', str]]:
+        """Bevosita child lar - elementlar va matn bo'laklari (comment larsiz), lazy"""
+        raise NotImplementedError
+
+
+class HTMLDocument:
+    """Backend ga bog'liq bo'lmagan document interfeysi"""
+
+    backend: str
+
+    def find_all(self, tag: str) -> Iterator[HTMLElement]:
+        """Berilgan tag dagi elementlar (document tartibida)"""
+        raise NotImplementedError
+
+    def find(self, tag: str) -> Optional[HTMLElement]:
+        """Birinchi mos element"""
+        return next(iter(self.find_all(tag)), None)
+
+    def top_nodes(self) -> Iterator[Union[HTMLElement, str]]:
+        """Document ning eng yuqori darajadagi node lari (odatda bitta <html>)"""
+        raise NotImplementedError
+
+    def walk(self, skip: Iterable[str] = SKIP_TEXT_TAGS) -> Iterator[Tuple[int, Union[HTMLElement, str]]]:
+        """Document ni bir marta aylanib chiqish (document tartibida) - (depth, node).
+
+        Elementlar HTMLElement, matn bo'laklari str sifatida qaytadi; eng yuqori node lar depth 0,
+        element ichidagi matn - element depth + 1. skip taglar (va <template>) ichiga
+        kirilmaydi - elementning o'zi qaytadi.
+        """
+        raise NotImplementedError
+
+    def iter_nodes(self, skip: Iterable[str] = SKIP_TEXT_TAGS) -> Iterator[Union[HTMLElement, str]]:
+        """walk() bilan bir xil, depth siz"""
+        return (node for _, node in self.walk(skip))
+
+    def text(self, skip: Iterable[str] = SKIP_TEXT_TAGS) -> str:
+        """Document matni (skip taglar ichidagi matnsiz). Document o'zgarmaydi."""
+        return ''.join(node for node in self.iter_nodes(skip) if isinstance(node, str))
+
+    def serialize(self, skip: Iterable[str] = SKIP_TEXT_TAGS) -> str:
+        """skip taglarni olib tashlab HTML ga aylantirish.
+
+        Eslatma: skip qilingan taglar document dan butunlay olib tashlanadi,
+        shuning uchun serialize() oxirgi qadam bo'lishi kerak.
+        """
+        raise NotImplementedError
+
+
+# BeautifulSoup backend
+class SoupElement(HTMLElement):
+    __slots__ = ('node', 'tag')
+
+    def __init__(self, node):
+        self.node = node
+        self.tag = node.name
+
+    def get(self, name, default=None):
+        value = self.node.get(name, default)
+        if isinstance(value, list):
+            return ' '.join(value)
+        return value
+
+    def text(self):
+        return self.node.get_text()
+
+    def attributes(self):
+        return [(name, ' '.join(value) if isinstance(value, list) else value) for name, value in self.node.attrs.items()]
+
+    def children(self):
+        return _soup_children(self.node)
+
+
+def _soup_children(node):
+    from bs4 import CData, NavigableString, Tag
+
+    text_types = (NavigableString, CData)
+    for child in node.children:
+        if isinstance(child, Tag):
+            yield SoupElement(child)
+        elif type(child) in text_types:
+            yield str(child)
+
+
+class SoupDocument(HTMLDocument):
+    def __init__(self, soup, backend: str):
+        self.soup = soup
+        self.backend = backend
+
+    def find_all(self, tag):
+        return (SoupElement(node) for node in self.soup.find_all(tag))
+
+    def top_nodes(self):
+        return _soup_children(self.soup)
+
+    def walk(self, skip=SKIP_TEXT_TAGS):
+        from bs4 import CData, NavigableString, Tag
+
+        skip = INERT_TAGS.union(skip)
+        text_types = (NavigableString, CData)
+        # Explicit stack - skip taglarning ichiga (nested elementlar bilan birga) kirilmaydi
+        stack = [(0, node) for node in reversed(self.soup.contents)]
+        while stack:
+            depth, node = stack.pop()
+            if isinstance(node, Tag):
+                yield depth, SoupElement(node)
+                if node.name not in skip:
+                    stack.extend((depth + 1, child) for child in reversed(node.contents))
+            elif type(node) in text_types:
+                yield depth, str(node)
+
+    def serialize(self, skip=SKIP_TEXT_TAGS):
+        for node in self.soup(list(skip)):
+            node.decompose()
+        return str(self.soup)
+
+
+class SoupBackend:
+    """BeautifulSoup asosidagi backend (html.parser tree builder)"""
+
+    def __init__(self, features: str = 'html.parser'):
+        from bs4 import BeautifulSoup
+
+        self._bs = BeautifulSoup
+        self.features = features
+        self.name = features
+
+    def parse(self, content: bytes, encoding: Optional[str] = None) -> HTMLDocument:
+        return SoupDocument(
+            self._bs(content, self.features, from_encoding=resolve_encoding(content, encoding)), self.name
+        )
+
+    def feeder(self, encoding: Optional[str] = None) -> 'BufferedFeeder':
+        return BufferedFeeder(self, encoding)
+
+
+# lxml backend
+class LxmlElement(HTMLElement):
+    __slots__ = ('node', 'tag')
+
+    def __init__(self, node):
+        self.node = node
+        self.tag = node.tag
+
+    def get(self, name, default=None):
+        return self.node.get(name, default)
+
+    def text(self):
+        return self.node.text_content()
+
+    def attributes(self):
+        return list(self.node.attrib.items())
+
+    def children(self):
+        node = self.node
+        if node.text:
+            yield node.text
+        for child in node:
+            if isinstance(child.tag, str):
+                yield LxmlElement(child)
+            if child.tail:
+                yield child.tail
+
+
+class LxmlDocument(HTMLDocument):
+    backend = 'lxml'
+
+    def __init__(self, root):
+        self.root = root
+
+    def find_all(self, tag):
+        return (LxmlElement(node) for node in self.root.iter(tag))
+
+    def top_nodes(self):
+        return iter([LxmlElement(self.root)])
+
+    def walk(self, skip=SKIP_TEXT_TAGS):
+        skip = INERT_TAGS.union(skip)
+        # (node, tail, depth) stack - tail False: elementga kirish, True: tail matni
+        stack = [(self.root, False, 0)]
+        while stack:
+            node, tail, depth = stack.pop()
+            if tail:
+                if node.tail:
+                    yield depth, node.tail
+                continue
+            if node is not self.root:
+                stack.append((node, True, depth))
+            if not isinstance(node.tag, str):
+                # Comment / processing instruction
+                continue
+            yield depth, LxmlElement(node)
+            if node.tag in skip:
+                continue
+            if node.text:
+                yield depth + 1, node.text
+            stack.extend((child, False, depth + 1) for child in reversed(node))
+
+    def serialize(self, skip=SKIP_TEXT_TAGS):
+        import lxml.html
+
+        for node in list(self.root.iter(*skip)):
+            node.drop_tree()
+        return lxml.html.tostring(self.root, encoding='unicode')
+
+
+class LxmlBackend:
+    """lxml.html asosidagi backend"""
+
+    name = 'lxml'
+
+    def __init__(self):
+        import lxml.html
+
+        self._html = lxml.html
+        # huge_tree - chuqur nesting li sahifalarda libxml2 256 daraja limitini olib tashlaydi.
+        # libxml2 ga har doim utf-8 beriladi (meta siz sahifani u latin-1 deb o'qiydi) -
+        # boshqa encoding lar Python da utf-8 ga o'giriladi
+        self._parser = lxml.html.HTMLParser(huge_tree=True, encoding=DEFAULT_ENCODING)
+
+    def parse(self, content: bytes, encoding: Optional[str] = None) -> HTMLDocument:
+        resolved = resolve_encoding(content, encoding)
+        if resolved != DEFAULT_ENCODING:
+            content = content.decode(resolved, errors='replace').encode(DEFAULT_ENCODING)
+        try:
+            root = self._html.document_fromstring(content, parser=self._parser)
+        except Exception:
+            # Bo'sh yoki buzilgan document
+            root = self._html.document_fromstring('<html></html>', parser=self._parser)
+        return LxmlDocument(root)
+
+    def feeder(self, encoding: Optional[str] = None) -> 'LxmlFeeder':
+        return LxmlFeeder(self, encoding)
+
+
+# selectolax backend
+class SelectolaxElement(HTMLElement):
+    __slots__ = ('node', 'tag')
+
+    def __init__(self, node):
+        self.node = node
+        self.tag = node.tag
+
+    def get(self, name, default=None):
+        attributes = self.node.attributes
+        if name not in attributes:
+            return default
+        value = attributes[name]
+        return '' if value is None else value
+
+    def text(self):
+        return self.node.text(deep=True)
+
+    def attributes(self):
+        return list(self.node.attributes.items())
+
+    def children(self):
+        child = self.node.child
+        while child is not None:
+            tag = child.tag
+            if tag == '-text':
+                yield child.text_content or ''
+            elif not tag.startswith(('-', '_')):
+                yield SelectolaxElement(child)
+            child = child.next
+
+
+class SelectolaxDocument(HTMLDocument):
+    backend = 'selectolax'
+
+    def __init__(self, tree):
+        self.tree = tree
+
+    def find_all(self, tag):
+        return (SelectolaxElement(node) for node in self.tree.css(tag))
+
+    def find(self, tag):
+        node = self.tree.css_first(tag)
+        return SelectolaxElement(node) if node is not None else None
+
+    def top_nodes(self):
+        root = self.tree.root
+        return iter([SelectolaxElement(root)] if root is not None else [])
+
+    def walk(self, skip=SKIP_TEXT_TAGS):
+        skip = INERT_TAGS.union(skip)
+        root = self.tree.root
+        stack = [(0, root)] if root is not None else []
+        while stack:
+            depth, node = stack.pop()
+            tag = node.tag
+            if tag == '-text':
+                yield depth, node.text_content or ''
+                continue
+            if tag.startswith(('-', '_')):
+                # Comment / doctype
+                continue
+            yield depth, SelectolaxElement(node)
+            if tag in skip:
+                continue
+            children = []
+            child = node.child
+            while child is not None:
+                children.append((depth + 1, child))
+                child = child.next
+            stack.extend(reversed(children))
+
+    def serialize(self, skip=SKIP_TEXT_TAGS):
+        self.tree.strip_tags(list(skip))
+        return self.tree.html or ''
+
+
+class SelectolaxBackend:
+    """selectolax (Lexbor) asosidagi backend"""
+
+    name = 'selectolax'
+
+    def __init__(self):
+        from selectolax.lexbor import LexborHTMLParser
+
+        self._parser = LexborHTMLParser
+
+    def parse(self, content: bytes, encoding: Optional[str] = None) -> HTMLDocument:
+        return SelectolaxDocument(self._parser(decode_html(content, encoding)))
+
+    def feeder(self, encoding: Optional[str] = None) -> 'BufferedFeeder':
+        return BufferedFeeder(self, encoding)
+
+
+# Incremental (chunk-by-chunk) parsing
+class BufferedFeeder:
+    """Incremental parse qila olmaydigan backend lar uchun: chunk larni yig'ib close() da parse qiladi"""
+
+    def __init__(self, backend, encoding: Optional[str] = None):
+        self.backend = backend
+        self.encoding = encoding
+        self._chunks = []
+
+    def feed(self, chunk: bytes):
+        self._chunks.append(chunk)
+
+    def close(self) -> HTMLDocument:
+        content = b''.join(self._chunks)
+        self._chunks = []
+        return self.backend.parse(content, self.encoding)
+
+
+class LxmlFeeder:
+    """lxml feed parser - chunk lar yuklanish davomida parse qilinadi
+
+    Encoding birinchi SNIFF_BYTES yig'ilganda aniqlanadi; utf-8 bo'lmasa chunk lar
+    incremental decoder orqali utf-8 ga o'giriladi.
+    """
+
+    def __init__(self, backend: LxmlBackend, encoding: Optional[str] = None):
+        self.backend = backend
+        self.encoding = encoding
+        self._parser = backend._html.HTMLParser(huge_tree=True, encoding=DEFAULT_ENCODING)
+        self._head: List[bytes] = []
+        self._head_size = 0
+        self._decoder = None
+        self._started = False
+        self._fed = False
+
+    def _start(self):
+        head = b''.join(self._head)
+        self._head = []
+        resolved = resolve_encoding(head, self.encoding)
+        if resolved != DEFAULT_ENCODING:
+            self._decoder = codecs.getincrementaldecoder(resolved)(errors='replace')
+        self._started = True
+        self._feed(head)
+
+    def _feed(self, chunk: bytes, final: bool = False):
+        if self._decoder is not None:
+            chunk = self._decoder.decode(chunk, final).encode(DEFAULT_ENCODING)
+        if chunk:
+            self._parser.feed(chunk)
+            self._fed = True
+
+    def feed(self, chunk: bytes):
+        if self._started:
+            self._feed(chunk)
+            return
+        self._head.append(chunk)
+        self._head_size += len(chunk)
+        if self._head_size >= SNIFF_BYTES:
+            self._start()
+
+    def close(self) -> HTMLDocument:
+        if not self._started:
+            self._start()
+        self._feed(b'', final=True)
+        if not self._fed:
+            return self.backend.parse(b'')
+        try:
+            root = self._parser.close()
+        except Exception:
+            return self.backend.parse(b'')
+        return LxmlDocument(root.getroottree().getroot())
+
+
+BACKENDS = {
+    'html.parser': SoupBackend,
+    'lxml': LxmlBackend,
+    'selectolax': SelectolaxBackend,
+}
+
+
+def get_parser_backend(name: Optional[str] = None):
+    """Konfiguratsiya bo'yicha parser backend ni yaratish"""
+    name = (name or os.getenv('HTML_PARSER_BACKEND', 'html.parser')).strip().lower()
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown HTML parser backend: {name} (available: {', '.join(BACKENDS)})")
+    try:
+        return BACKENDS[name]()
+    except ImportError as e:
+        raise ImportError(f"HTML parser backend '{name}' is not installed: {str(e)}")
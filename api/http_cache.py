@@ -0,0 +1,107 @@
+"""
+🗄️ Conditional-GET HTTP Cache
+Scrape qilingan sahifalar uchun disk cache
+
+Har bir URL uchun body, ETag, Last-Modified va parse qilingan natija saqlanadi
+(kalit - canonical URL, tracking parametrlarsiz).
+Keyingi so'rovda If-None-Match / If-Modified-Since bilan revalidatsiya qilinadi -
+304 javobda download ham, parsing ham o'tkazib yuboriladi.
+"""
+
+import os
+import time
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+from disk_store import DiskStore
+from url_normalize import canonicalize_url
+
+
+@dataclass
+class CacheEntry:
+    """Cache dagi bitta sahifa"""
+    url: str
+    etag: Optional[str]
+    last_modified: Optional[str]
+    stored_at: float
+    payload: Dict
+    body: Optional[bytes] = None
+
+    def conditional_headers(self) -> Dict[str, str]:
+        """Revalidatsiya uchun header lar"""
+        headers = {}
+        if self.etag:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified:
+            headers['If-Modified-Since'] = self.last_modified
+        return headers
+
+    @property
+    def revalidatable(self) -> bool:
+        return bool(self.etag or self.last_modified)
+
+
+def _lower_keys(headers) -> Dict[str, str]:
+    """Header nomlari case-insensitive ('ETag', 'Etag', 'etag' - bir xil)"""
+    return {name.lower(): value for name, value in (headers or {}).items()}
+
+
+class HTTPCache:
+    """ETag / Last-Modified asosidagi persistent HTTP cache"""
+
+    def __init__(self, directory: Optional[str] = None, max_bytes: Optional[int] = None):
+        directory = directory or os.getenv(
+            'HTTP_CACHE_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cache', 'http')
+        )
+        max_bytes = max_bytes or int(os.getenv('HTTP_CACHE_MAX_MB', 512)) * 1024 * 1024
+        self.store = DiskStore(directory, max_bytes)
+
+    def get(self, url: str) -> Optional[CacheEntry]:
+        """URL uchun cache yozuvini olish (body siz)"""
+        item = self.store.get(canonicalize_url(url))
+        if item is None:
+            return None
+        meta, _ = item
+        return CacheEntry(
+            url=meta['url'],
+            etag=meta.get('etag'),
+            last_modified=meta.get('last_modified'),
+            stored_at=meta.get('stored_at', 0),
+            payload=meta.get('payload', {}),
+        )
+
+    def get_body(self, url: str) -> Optional[bytes]:
+        """Saqlangan raw body"""
+        item = self.store.get(canonicalize_url(url), with_blob=True)
+        return item[1] if item else None
+
+    def put(self, url: str, headers: Dict[str, str], body: bytes, payload: Dict):
+        """Yangi javobni saqlash - validator bo'lmasa saqlanmaydi"""
+        headers = _lower_keys(headers)
+        etag = headers.get('etag')
+        last_modified = headers.get('last-modified')
+        if not (etag or last_modified):
+            return
+        if 'no-store' in (headers.get('cache-control') or ''):
+            return
+        self.store.put(canonicalize_url(url), {
+            'url': url,
+            'etag': etag,
+            'last_modified': last_modified,
+            'stored_at': time.time(),
+            'payload': payload,
+        }, body)
+
+    def refresh(self, entry: CacheEntry, headers: Dict[str, str]):
+        """304 dan keyin validator larni yangilash"""
+        headers = _lower_keys(headers)
+        self.store.update_meta(canonicalize_url(entry.url), {
+            'url': entry.url,
+            'etag': headers.get('etag') or entry.etag,
+            'last_modified': headers.get('last-modified') or entry.last_modified,
+            'stored_at': time.time(),
+            'payload': entry.payload,
+        })
+
+    def delete(self, url: str):
+        self.store.delete(canonicalize_url(url))
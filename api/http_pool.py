@@ -0,0 +1,356 @@
+"""
+🔌 Shared HTTP Connection Pool
+Loyihadagi barcha tashqi HTTP so'rovlar uchun umumiy connection pool qatlami
+
+- Host bo'yicha pool hajmi (default + HTTP_POOL_HOST_LIMITS override lari)
+- Keep-alive connection lar so'rovlar va thread lar orasida qayta ishlatiladi
+- TTL li DNS cache (requests/urllib3 va aiohttp uchun bitta)
+- Pool statistikasi (yangi / qayta ishlatilgan connection, DNS hit/miss, wire/decoded byte lar)
+
+requests yo'li: thread-local Session lar bitta umumiy HTTPAdapter (urllib3 PoolManager) dan foydalanadi;
+DNS cache faqat shu adapter yaratgan connection larda (urllib3 global funksiyalari o'zgartirilmaydi).
+aiohttp yo'li: fetch engine shu modul dagi resolver, trace config va host limitlaridan foydalanadi.
+"""
+
+import ipaddress
+import logging
+import os
+import socket
+import threading
+import time
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+
+import requests
+from content_encoding import ACCEPT_ENCODING, TransferMetrics, read_decoded
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.exceptions import ConnectTimeoutError, NameResolutionError
+from urllib3.poolmanager import PoolManager
+
+logger = logging.getLogger(__name__)
+
+
+def _parse_host_limits(value: str) -> Dict[str, int]:
+    """'cdn.example.com=32,api.example.com=4' -> {host: limit}"""
+    limits = {}
+    for item in value.split(','):
+        host, sep, limit = item.strip().partition('=')
+        if sep and host.strip() and limit.strip().isdigit():
+            limits[host.strip().lower()] = int(limit)
+    return limits
+
+
+class DNSCache:
+    """getaddrinfo natijalarini TTL bilan saqlash"""
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._entries: Dict[Tuple, Tuple[float, List]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _get(self, key) -> Optional[List]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry[0] > time.monotonic():
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+            return None
+
+    def _put(self, key, infos: List):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, infos)
+
+    def resolve(self, host: str, port: int, family: int = socket.AF_UNSPEC) -> List:
+        """Sync resolve (urllib3 yo'li uchun)"""
+        key = (host, port, family)
+        infos = self._get(key)
+        if infos is None:
+            infos = socket.getaddrinfo(host, port, family, socket.SOCK_STREAM)
+            self._put(key, infos)
+        return infos
+
+    async def resolve_async(self, loop, host: str, port: int, family: int = socket.AF_UNSPEC) -> List:
+        """Async resolve (aiohttp yo'li uchun) - miss bo'lsa loop.getaddrinfo"""
+        key = (host, port, family)
+        infos = self._get(key)
+        if infos is None:
+            infos = await loop.getaddrinfo(host, port, family=family, type=socket.SOCK_STREAM)
+            self._put(key, infos)
+        return infos
+
+    def invalidate(self, host: str):
+        with self._lock:
+            for key in [key for key in self._entries if key[0] == host]:
+                del self._entries[key]
+
+    def stats(self) -> Dict[str, int]:
+        return {'entries': len(self._entries), 'hits': self.hits, 'misses': self.misses}
+
+
+class PoolStats:
+    """Host bo'yicha connection statistikasi (aiohttp yo'li uchun)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._hosts: Dict[str, Dict[str, int]] = defaultdict(lambda: {'requests': 0, 'new_connections': 0, 'reused_connections': 0})
+        self._transfer: Dict[str, Dict[str, int]] = defaultdict(lambda: {'responses': 0, 'wire_bytes': 0, 'decoded_bytes': 0})
+
+    def record(self, host: str, field: str):
+        with self._lock:
+            self._hosts[host][field] += 1
+
+    def record_transfer(self, metrics: TransferMetrics):
+        """Encoding bo'yicha wire va decoded byte lar yig'indisi"""
+        with self._lock:
+            totals = self._transfer[metrics.content_encoding]
+            totals['responses'] += 1
+            totals['wire_bytes'] += metrics.wire_bytes
+            totals['decoded_bytes'] += metrics.decoded_bytes
+
+    def snapshot(self) -> Dict[str, Dict[str, int]]:
+        with self._lock:
+            return {host: dict(counts) for host, counts in self._hosts.items()}
+
+    def transfer_snapshot(self) -> Dict[str, Dict[str, int]]:
+        with self._lock:
+            return {encoding: dict(totals) for encoding, totals in self._transfer.items()}
+
+
+def _is_ip(host: str) -> bool:
+    try:
+        ipaddress.ip_address(host.strip('[]'))
+        return True
+    except ValueError:
+        return False
+
+
+class _CachedDNSMixin:
+    """Socket ochishda host ni DNS cache orqali resolve qiluvchi urllib3 connection"""
+
+    def __init__(self, *args, dns_cache: Optional[DNSCache] = None, **kwargs):
+        self.dns_cache = dns_cache
+        super().__init__(*args, **kwargs)
+
+    def _new_conn(self):
+        host = self._dns_host
+        if self.dns_cache is None or _is_ip(host):
+            return super()._new_conn()
+        try:
+            infos = self.dns_cache.resolve(host, self.port)
+        except socket.gaierror as e:
+            raise NameResolutionError(self.host, self, e) from e
+
+        # TLS SNI / sertifikat tekshiruvi self.host bilan - faqat ulanish manzili almashtiriladi
+        last_error = None
+        try:
+            for _, _, _, _, sockaddr in infos:
+                self._dns_host = sockaddr[0]
+                try:
+                    return super()._new_conn()
+                except ConnectTimeoutError as e:
+                    last_error = e
+        finally:
+            self._dns_host = host
+        # Hech bir manzil ishlamadi - eski yozuv bo'lishi mumkin
+        self.dns_cache.invalidate(host)
+        if last_error is not None:
+            raise last_error
+        raise NameResolutionError(self.host, self, socket.gaierror(f'getaddrinfo returned no addresses for {host}'))
+
+
+class _CachedDNSHTTPConnection(_CachedDNSMixin, HTTPConnection):
+    pass
+
+
+class _CachedDNSHTTPSConnection(_CachedDNSMixin, HTTPSConnection):
+    pass
+
+
+_CACHED_DNS_CONNECTIONS = {'http': _CachedDNSHTTPConnection, 'https': _CachedDNSHTTPSConnection}
+
+
+class _HostSizedPoolManager(PoolManager):
+    """Host bo'yicha maxsize beradigan, connection larni DNS cache bilan yaratadigan PoolManager"""
+
+    def __init__(self, *args, host_limits: Optional[Dict[str, int]] = None, dns: Optional[DNSCache] = None,
+                 **kwargs):
+        self.host_limits = host_limits or {}
+        self.dns = dns
+        super().__init__(*args, **kwargs)
+
+    def _new_pool(self, scheme, host, port, request_context=None):
+        limit = self.host_limits.get(host.lower())
+        if limit:
+            request_context = dict(request_context or self.connection_pool_kw)
+            request_context['maxsize'] = limit
+        pool = super()._new_pool(scheme, host, port, request_context=request_context)
+        if self.dns is not None and scheme in _CACHED_DNS_CONNECTIONS:
+            pool.ConnectionCls = _CACHED_DNS_CONNECTIONS[scheme]
+            pool.conn_kw['dns_cache'] = self.dns
+        return pool
+
+
+class _SharedAdapter(HTTPAdapter):
+    def __init__(self, host_limits: Dict[str, int], dns: Optional[DNSCache] = None, **kwargs):
+        self.host_limits = host_limits
+        self.dns = dns
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, connections, maxsize, block=False, **pool_kwargs):
+        self.poolmanager = _HostSizedPoolManager(
+            num_pools=connections, maxsize=maxsize, block=block, host_limits=self.host_limits, dns=self.dns,
+            **pool_kwargs
+        )
+
+
+class HTTPConnectionPool:
+    """Butun process uchun umumiy connection pool"""
+
+    def __init__(self):
+        self.per_host = int(os.getenv('HTTP_POOL_PER_HOST', 10))
+        self.max_hosts = int(os.getenv('HTTP_POOL_MAX_HOSTS', 100))
+        self.host_limits = _parse_host_limits(os.getenv('HTTP_POOL_HOST_LIMITS', ''))
+        self.dns = DNSCache(float(os.getenv('HTTP_DNS_CACHE_TTL', 300)))
+        self.stats = PoolStats()
+
+        self._adapter = _SharedAdapter(
+            self.host_limits,
+            dns=self.dns,
+            pool_connections=self.max_hosts,
+            pool_maxsize=self.per_host,
+            max_retries=0,
+        )
+        self._local = threading.local()
+
+    def limit_for(self, host: str) -> int:
+        """Host uchun connection limiti"""
+        return self.host_limits.get(host.lower(), self.per_host)
+
+    # requests yo'li
+    def session(self) -> requests.Session:
+        """Joriy thread uchun Session (adapter - ya'ni connection lar - umumiy)"""
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = requests.Session()
+            session.mount('http://', self._adapter)
+            session.mount('https://', self._adapter)
+            self._local.session = session
+        return session
+
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        return self.session().request(method, url, **kwargs)
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        return self.request('GET', url, **kwargs)
+
+    def get_decoded(self, url: str, max_bytes: int, **kwargs) -> Tuple[requests.Response, bytes, TransferMetrics]:
+        """GET - body ni o'zimiz streaming decode qilamiz (max_bytes gacha).
+
+        4xx/5xx javoblarda HTTPError. Qaytaradi: (response, content, metrics)
+        """
+        headers = {'Accept-Encoding': ACCEPT_ENCODING, **(kwargs.pop('headers', None) or {})}
+        response = self.get(url, headers=headers, stream=True, **kwargs)
+        if response.status_code >= 400:
+            response.close()
+            response.raise_for_status()
+        content, metrics = read_decoded(response, max_bytes)
+        self.stats.record_transfer(metrics)
+        return response, content, metrics
+
+    # aiohttp yo'li
+    def aiohttp_resolver(self):
+        """DNS cache ishlatadigan aiohttp resolver (engine loop ichida yaratiladi)"""
+        from aiohttp.abc import AbstractResolver
+
+        dns = self.dns
+
+        class CachedResolver(AbstractResolver):
+            async def resolve(self, host, port=0, family=socket.AF_INET):
+                import asyncio
+
+                infos = await dns.resolve_async(asyncio.get_running_loop(), host, port, family)
+                return [
+                    {
+                        'hostname': host,
+                        'host': sockaddr[0],
+                        'port': sockaddr[1],
+                        'family': info_family,
+                        'proto': proto,
+                        'flags': socket.AI_NUMERICHOST | socket.AI_NUMERICSERV,
+                    }
+                    for info_family, _, proto, _, sockaddr in infos
+                ]
+
+            async def close(self):
+                pass
+
+        return CachedResolver()
+
+    def aiohttp_trace_config(self):
+        """aiohttp connection statistikasi uchun trace config"""
+        import aiohttp
+
+        stats = self.stats
+        trace_config = aiohttp.TraceConfig()
+
+        async def on_request_start(session, context, params):
+            context.host = params.url.host or ''
+            stats.record(context.host, 'requests')
+
+        async def on_connection_create_end(session, context, params):
+            stats.record(getattr(context, 'host', ''), 'new_connections')
+
+        async def on_connection_reuseconn(session, context, params):
+            stats.record(getattr(context, 'host', ''), 'reused_connections')
+
+        trace_config.on_request_start.append(on_request_start)
+        trace_config.on_connection_create_end.append(on_connection_create_end)
+        trace_config.on_connection_reuseconn.append(on_connection_reuseconn)
+        return trace_config
+
+    # Statistika
+    def snapshot(self) -> Dict:
+        """Pool statistikasi"""
+        requests_pools = {}
+        pools = self._adapter.poolmanager.pools
+        for key in pools.keys():
+            pool = pools.get(key)
+            if pool is None:
+                continue
+            requests_pools[f'{key.key_scheme}://{key.key_host}:{key.key_port}'] = {
+                'requests': pool.num_requests,
+                'new_connections': pool.num_connections,
+                'reused_connections': max(pool.num_requests - pool.num_connections, 0),
+                'idle_connections': pool.pool.qsize() if pool.pool is not None else 0,
+                'maxsize': pool.pool.maxsize if pool.pool is not None else 0,
+            }
+        return {
+            'config': {
+                'per_host': self.per_host,
+                'max_hosts': self.max_hosts,
+                'host_limits': self.host_limits,
+                'dns_ttl': self.dns.ttl,
+            },
+            'dns': self.dns.stats(),
+            'requests_pools': requests_pools,
+            'async_hosts': self.stats.snapshot(),
+            'transfer': self.stats.transfer_snapshot(),
+        }
+
+
+_pool: Optional[HTTPConnectionPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_http_pool() -> HTTPConnectionPool:
+    """Process bo'yicha yagona connection pool"""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = HTTPConnectionPool()
+            logger.info(f"🔌 HTTP connection pool ready (per_host={_pool.per_host}, max_hosts={_pool.max_hosts})")
+        return _pool
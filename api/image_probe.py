@@ -0,0 +1,206 @@
+"""
+🖼️ Image Metadata Probe
+Rasmning faqat birinchi bir necha KB ini (HTTP Range) yuklab, haqiqiy o'lcham va formatni aniqlash
+
+- Header byte lardan decode: PNG, GIF, JPEG, WebP, BMP, ICO, AVIF/HEIF, SVG
+- Barcha rasmlar parallel probe qilinadi
+- Natijalar URL bo'yicha cache lanadi
+"""
+
+import asyncio
+import base64
+import logging
+import os
+import re
+import struct
+from collections import OrderedDict
+from typing import Dict, List, Optional
+from urllib.parse import unquote
+
+from url_normalize import canonicalize_url
+
+logger = logging.getLogger(__name__)
+
+# Header ni o'qish uchun yetarli - JPEG da EXIF katta bo'lsa bir marta kattaroq range so'raladi
+PROBE_BYTES = 16 * 1024
+PROBE_RETRY_BYTES = 128 * 1024
+
+_JPEG_SOF_MARKERS = {0xC0, 0xC1, 0xC2, 0xC3, 0xC5, 0xC6, 0xC7, 0xC9, 0xCA, 0xCB, 0xCD, 0xCE, 0xCF}
+_SVG_TAG_RE = re.compile(rb'<svg\b[^>]*>', re.I | re.S)
+_SVG_ATTR_RE = re.compile(rb'\b(width|height|viewBox)\s*=\s*["\']([^"\']*)["\']', re.I)
+
+
+class NeedMoreData(Exception):
+    """Header to'liq emas - ko'proq byte kerak"""
+
+
+def _svg_length(value: bytes) -> Optional[int]:
+    match = re.match(rb'\s*([\d.]+)\s*(px)?\s*$', value)
+    return int(float(match.group(1))) if match else None
+
+
+def _probe_jpeg(data: bytes) -> Dict:
+    index = 2
+    length = len(data)
+    while index < length:
+        # Marker oldidagi 0xFF lar
+        while index < length and data[index] != 0xFF:
+            index += 1
+        while index < length and data[index] == 0xFF:
+            index += 1
+        if index >= length:
+            break
+        marker = data[index]
+        index += 1
+        if marker in (0xD8, 0x01) or 0xD0 <= marker <= 0xD7:
+            continue
+        if index + 2 > length:
+            break
+        segment_length = struct.unpack('>H', data[index:index + 2])[0]
+        if marker in _JPEG_SOF_MARKERS:
+            if index + 7 > length:
+                break
+            height, width = struct.unpack('>HH', data[index + 3:index + 7])
+            return {'format': 'jpeg', 'width': width, 'height': height}
+        index += segment_length
+    raise NeedMoreData()
+
+
+def probe_image_header(data: bytes) -> Optional[Dict]:
+    """Header byte lardan format va intrinsic o'lchamni aniqlash.
+
+    Format tanilmasa None, header kesilgan bo'lsa NeedMoreData.
+    """
+    if data.startswith(b'\x89PNG\r\n\x1a\n'):
+        if len(data) < 24:
+            raise NeedMoreData()
+        width, height = struct.unpack('>II', data[16:24])
+        return {'format': 'png', 'width': width, 'height': height}
+
+    if data[:6] in (b'GIF87a', b'GIF89a'):
+        if len(data) < 10:
+            raise NeedMoreData()
+        width, height = struct.unpack('<HH', data[6:10])
+        return {'format': 'gif', 'width': width, 'height': height}
+
+    if data.startswith(b'\xff\xd8'):
+        return _probe_jpeg(data)
+
+    if data[:4] == b'RIFF' and data[8:12] == b'WEBP':
+        if len(data) < 30:
+            raise NeedMoreData()
+        chunk = data[12:16]
+        if chunk == b'VP8 ':
+            width, height = struct.unpack('<HH', data[26:30])
+            return {'format': 'webp', 'width': width & 0x3FFF, 'height': height & 0x3FFF}
+        if chunk == b'VP8L':
+            bits = int.from_bytes(data[21:25], 'little')
+            return {'format': 'webp', 'width': (bits & 0x3FFF) + 1, 'height': ((bits >> 14) & 0x3FFF) + 1}
+        if chunk == b'VP8X':
+            width = int.from_bytes(data[24:27], 'little') + 1
+            height = int.from_bytes(data[27:30], 'little') + 1
+            return {'format': 'webp', 'width': width, 'height': height}
+        return None
+
+    if data.startswith(b'BM'):
+        if len(data) < 26:
+            raise NeedMoreData()
+        width, height = struct.unpack('<ii', data[18:26])
+        return {'format': 'bmp', 'width': width, 'height': abs(height)}
+
+    if data[:4] == b'\x00\x00\x01\x00':
+        if len(data) < 8:
+            raise NeedMoreData()
+        # ICO - birinchi rasm; 0 qiymat 256 degani
+        return {'format': 'ico', 'width': data[6] or 256, 'height': data[7] or 256}
+
+    if data[4:8] == b'ftyp' and data[8:12] in (b'avif', b'avis', b'heic', b'heix', b'mif1', b'msf1'):
+        index = data.find(b'ispe')
+        if index == -1 or index + 16 > len(data):
+            raise NeedMoreData()
+        width, height = struct.unpack('>II', data[index + 8:index + 16])
+        image_format = 'avif' if data[8:12] in (b'avif', b'avis') else 'heif'
+        return {'format': image_format, 'width': width, 'height': height}
+
+    head = data[:1024].lstrip()
+    if head.startswith((b'<?xml', b'<svg', b'<!--')) or b'<svg' in head:
+        tag = _SVG_TAG_RE.search(data)
+        if not tag:
+            raise NeedMoreData()
+        attrs = {name.lower(): value for name, value in _SVG_ATTR_RE.findall(tag.group())}
+        width = _svg_length(attrs.get(b'width', b''))
+        height = _svg_length(attrs.get(b'height', b''))
+        if (width is None or height is None) and b'viewbox' in attrs:
+            parts = attrs[b'viewbox'].replace(b',', b' ').split()
+            if len(parts) == 4:
+                width = width or int(float(parts[2]))
+                height = height or int(float(parts[3]))
+        return {'format': 'svg', 'width': width, 'height': height}
+
+    return None
+
+
+def _decode_data_uri(uri: str) -> Optional[bytes]:
+    header, _, payload = uri.partition(',')
+    try:
+        if header.endswith(';base64'):
+            return base64.b64decode(payload[:PROBE_RETRY_BYTES * 2])
+        return unquote(payload).encode('utf-8')
+    except ValueError:
+        return None
+
+
+class ImageProbe:
+    """Rasmlarni Range so'rovlari bilan parallel probe qilish"""
+
+    def __init__(self, engine, max_entries: Optional[int] = None):
+        self.engine = engine
+        self._cache: 'OrderedDict[str, Optional[Dict]]' = OrderedDict()
+        self._max_entries = max_entries or int(os.getenv('IMAGE_PROBE_CACHE_ENTRIES', 5000))
+
+    async def probe_all(self, images: List[Dict[str, str]]) -> List[Dict[str, str]]:
+        """images ro'yxatiga intrinsic_width / intrinsic_height / format qo'shish"""
+        results = await asyncio.gather(*(self.probe(image['absolute_url']) for image in images))
+        for image, info in zip(images, results):
+            if info:
+                image['format'] = info['format']
+                image['intrinsic_width'] = info['width']
+                image['intrinsic_height'] = info['height']
+        return images
+
+    async def probe(self, url: str) -> Optional[Dict]:
+        """Bitta rasm - natija cache lanadi (xatolik ham)"""
+        key = url if url.startswith('data:') else canonicalize_url(url, strip_tracking=False)
+        if key in self._cache:
+            self._cache.move_to_end(key)
+            return self._cache[key]
+
+        info = await self._probe_uncached(url)
+        self._cache[key] = info
+        while len(self._cache) > self._max_entries:
+            self._cache.popitem(last=False)
+        return info
+
+    async def _probe_uncached(self, url: str) -> Optional[Dict]:
+        if url.startswith('data:'):
+            data = _decode_data_uri(url)
+            try:
+                return probe_image_header(data) if data else None
+            except NeedMoreData:
+                return None
+
+        for size in (PROBE_BYTES, PROBE_RETRY_BYTES):
+            try:
+                response = await self.engine.fetch(
+                    url, headers={'Range': f'bytes=0-{size - 1}'}, max_bytes=size
+                )
+                return probe_image_header(response.content)
+            except NeedMoreData:
+                if len(response.content) < size:
+                    # Fayl tugadi - ko'proq byte yo'q
+                    return None
+                continue
+            except Exception as e:
+                logger.debug(f"Image probe failed {url}: {str(e)}")
+                return None
+        return None
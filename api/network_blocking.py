@@ -0,0 +1,137 @@
+"""
+🚫 Network Blocking Profiles
+Headless sahifa yuklashda keraksiz so'rovlarni brauzer network qatlamida bloklash
+
+Profillar (bir nechtasini birlashtirish mumkin: "trackers,media"):
+- trackers  - analytics, reklama, tracking pixel, chat / social widget lar
+- media     - video / audio fayllar va embed player lar
+- fonts     - web font lar (fonts.googleapis.com, *.woff2, ...)
+- allow_all - hech narsa bloklanmaydi
+
+Bloklash CDP Network.setBlockedURLs orqali, bloklangan so'rovlar soni
+chromedriver performance log idan (Network.loadingFailed, blockedReason=inspector) olinadi.
+"""
+
+import json
+import logging
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+BLOCK_PATTERNS = {
+    'trackers': (
+        '*google-analytics.com*', '*googletagmanager.com*', '*googleadservices.com*',
+        '*doubleclick.net*', '*googlesyndication.com*', '*adservice.google.*',
+        '*connect.facebook.net*', '*facebook.com/tr*', '*analytics.tiktok.com*', '*snap.licdn.com*',
+        '*static.ads-twitter.com*', '*bat.bing.com*', '*clarity.ms*', '*hotjar.com*', '*hotjar.io*',
+        '*segment.com*', '*segment.io*', '*mixpanel.com*', '*amplitude.com*', '*fullstory.com*',
+        '*mc.yandex.ru*', '*criteo.com*', '*criteo.net*', '*taboola.com*', '*outbrain.com*',
+        '*adnxs.com*', '*amazon-adsystem.com*', '*scorecardresearch.com*', '*quantserve.com*',
+        '*newrelic.com*', '*nr-data.net*', '*sentry-cdn.com*', '*intercom.io*', '*intercomcdn.com*',
+        '*widget.intercom.io*', '*js.driftt.com*', '*crisp.chat*', '*tawk.to*', '*zdassets.com*',
+        '*onesignal.com*', '*optimizely.com*', '*cookielaw.org*', '*cookiebot.com*',
+    ),
+    'media': (
+        '*.mp4', '*.mp4?*', '*.webm', '*.webm?*', '*.m3u8*', '*.mpd*', '*.mov', '*.mov?*',
+        '*.mp3', '*.mp3?*', '*.ogg', '*.ogg?*', '*.wav', '*.wav?*',
+        '*youtube.com/embed*', '*youtube-nocookie.com*', '*player.vimeo.com*', '*vimeocdn.com*',
+    ),
+    'fonts': (
+        '*fonts.googleapis.com*', '*fonts.gstatic.com*', '*use.typekit.net*', '*use.fontawesome.com*',
+        '*.woff', '*.woff?*', '*.woff2', '*.woff2?*', '*.ttf', '*.ttf?*', '*.otf', '*.otf?*', '*.eot', '*.eot?*',
+    ),
+}
+ALLOW_ALL = 'allow_all'
+
+
+@dataclass(frozen=True)
+class BlockingProfile:
+    """Bloklash profili - nomlar va URL pattern lar"""
+    names: Tuple[str, ...] = ()
+    patterns: Tuple[str, ...] = ()
+
+    @property
+    def key(self) -> str:
+        return '+'.join(self.names) or ALLOW_ALL
+
+
+def resolve_profile(spec) -> BlockingProfile:
+    """'trackers,media' / ['trackers', 'fonts'] / 'allow_all' -> BlockingProfile"""
+    if isinstance(spec, str):
+        spec = spec.split(',')
+    names = []
+    for name in spec or ():
+        name = name.strip().lower()
+        if not name or name == ALLOW_ALL:
+            continue
+        if name not in BLOCK_PATTERNS:
+            raise ValueError(f"Unknown blocking profile: {name} ({', '.join((*BLOCK_PATTERNS, ALLOW_ALL))})")
+        if name not in names:
+            names.append(name)
+    names.sort()
+    patterns = tuple(pattern for name in names for pattern in BLOCK_PATTERNS[name])
+    return BlockingProfile(tuple(names), patterns)
+
+
+@dataclass
+class BlockingReport:
+    """Bitta capture davomida bloklangan so'rovlar"""
+    profile: str
+    requests: Optional[int] = None
+    blocked: Optional[int] = None
+    blocked_by_type: Dict[str, int] = field(default_factory=dict)
+
+    def to_dict(self):
+        return {
+            'profile': self.profile,
+            'requests': self.requests,
+            'blocked': self.blocked,
+            'blocked_by_type': self.blocked_by_type,
+        }
+
+
+def apply_blocking(driver, profile: BlockingProfile):
+    """Joriy tab uchun bloklashni yoqish (driver.get dan oldin chaqiriladi)"""
+    drain_performance_log(driver)
+    if not profile.patterns:
+        return
+    driver.execute_cdp_cmd('Network.enable', {})
+    driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': list(profile.patterns)})
+
+
+def drain_performance_log(driver):
+    """Oldingi so'rovlardan qolgan performance log yozuvlarini tashlash (pool dagi driver)"""
+    try:
+        driver.get_log('performance')
+    except Exception:
+        pass
+
+
+def collect_report(driver, profile: BlockingProfile) -> BlockingReport:
+    """Performance log dan so'rovlar va bloklanganlar sonini hisoblash"""
+    report = BlockingReport(profile.key)
+    try:
+        entries = driver.get_log('performance')
+    except Exception as e:
+        logger.debug(f"Performance log unavailable: {str(e)}")
+        return report
+
+    requests, blocked = 0, Counter()
+    for entry in entries:
+        try:
+            message = json.loads(entry['message'])['message']
+        except (KeyError, TypeError, ValueError):
+            continue
+        method = message.get('method')
+        if method == 'Network.requestWillBeSent':
+            requests += 1
+        elif method == 'Network.loadingFailed':
+            params = message.get('params', {})
+            if params.get('blockedReason') == 'inspector':
+                blocked[params.get('type', 'Other')] += 1
+    report.requests = requests
+    report.blocked = sum(blocked.values())
+    report.blocked_by_type = dict(blocked)
+    return report
@@ -0,0 +1,107 @@
+"""
+⏱️ Page Readiness
+Screenshot dan oldin sahifa tayyorligini aniqlash (qat'iy time.sleep o'rniga)
+
+Kutish quyidagilarning hammasi bajarilganda tugaydi:
+- network_idle - document yuklangan va idle_ms davomida yangi resource (img, css, xhr, ...) tugamagan
+- dom_quiet    - quiet_ms davomida DOM mutation bo'lmagan
+- fonts        - document.fonts.ready
+Yoki hard deadline tugaganda. Natijada kutishni qaysi signal tugatgani qaytariladi.
+"""
+
+import logging
+import os
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+# Brauzer ichida ishlaydigan kutish skripti (execute_async_script)
+READINESS_SCRIPT = """
+const deadlineMs = arguments[0], quietMs = arguments[1], idleMs = arguments[2], done = arguments[3];
+const start = performance.now();
+let lastMutation = start, lastResource = start, mutations = 0;
+let fontsAt = document.fonts ? null : start;
+
+const mutationObserver = new MutationObserver(list => { mutations += list.length; lastMutation = performance.now(); });
+mutationObserver.observe(document.documentElement, {childList: true, subtree: true, attributes: true, characterData: true});
+let resourceObserver = null;
+try {
+  resourceObserver = new PerformanceObserver(() => { lastResource = performance.now(); });
+  resourceObserver.observe({type: 'resource'});
+} catch (e) {}
+if (document.fonts) document.fonts.ready.then(() => { fontsAt = performance.now(); });
+
+function finish(signal) {
+  mutationObserver.disconnect();
+  if (resourceObserver) resourceObserver.disconnect();
+  done({
+    signal: signal,
+    elapsed_ms: Math.round(performance.now() - start),
+    mutations: mutations,
+    resources: performance.getEntriesByType('resource').length,
+    fonts_ready: fontsAt !== null
+  });
+}
+
+(function tick() {
+  const now = performance.now();
+  if (now - start >= deadlineMs) return finish('deadline');
+  const networkIdle = document.readyState === 'complete' && now - lastResource >= idleMs;
+  const domQuiet = now - lastMutation >= quietMs;
+  if (networkIdle && domQuiet && fontsAt !== null) {
+    // Oxirgi bo'lib bajarilgan shart kutishni tugatgan signal hisoblanadi
+    const satisfied = {network_idle: lastResource + idleMs, dom_quiet: lastMutation + quietMs, fonts: fontsAt};
+    return finish(Object.keys(satisfied).reduce((a, b) => satisfied[a] >= satisfied[b] ? a : b));
+  }
+  setTimeout(tick, 50);
+})();
+"""
+
+
+@dataclass
+class ReadinessResult:
+    """Kutish natijasi"""
+    signal: str  # network_idle | dom_quiet | fonts | deadline | error
+    elapsed_ms: int
+    mutations: int = 0
+    resources: int = 0
+    fonts_ready: bool = False
+
+    def to_dict(self):
+        return {
+            'signal': self.signal,
+            'elapsed_ms': self.elapsed_ms,
+            'mutations': self.mutations,
+            'resources': self.resources,
+            'fonts_ready': self.fonts_ready,
+        }
+
+
+def wait_until_ready(
+    driver,
+    deadline: Optional[float] = None,
+    quiet_ms: Optional[int] = None,
+    idle_ms: Optional[int] = None,
+) -> ReadinessResult:
+    """Sahifa tayyor bo'lguncha (yoki deadline sekund o'tguncha) kutish"""
+    deadline = deadline or float(os.getenv('SCREENSHOT_READY_DEADLINE', 8))
+    quiet_ms = quiet_ms or int(os.getenv('SCREENSHOT_DOM_QUIET_MS', 500))
+    idle_ms = idle_ms or int(os.getenv('SCREENSHOT_NETWORK_IDLE_MS', 500))
+
+    started = time.time()
+    try:
+        driver.set_script_timeout(deadline + 2)
+        result = driver.execute_async_script(READINESS_SCRIPT, int(deadline * 1000), quiet_ms, idle_ms)
+        return ReadinessResult(
+            signal=result.get('signal', 'error'),
+            elapsed_ms=int(result.get('elapsed_ms', 0)),
+            mutations=int(result.get('mutations', 0)),
+            resources=int(result.get('resources', 0)),
+            fonts_ready=bool(result.get('fonts_ready')),
+        )
+    except Exception as e:
+        # Skript ishlamasa (navigatsiya, yopilgan tab, ...) - shu paytgacha kutilgan vaqt bilan davom etiladi
+        logger.warning(f"⚠️ Readiness detection failed: {str(e)}")
+        return ReadinessResult(signal='error', elapsed_ms=int((time.time() - started) * 1000))
@@ -0,0 +1,153 @@
+"""
+📸 Screenshot Cache
+Bir xil sahifa / viewport uchun qayta screenshot olmaslik
+
+Kalit - canonical URL + viewport (width x height) + device scale factor + variant
+(masalan network blocking profili - bloklangan font / media screenshot ni o'zgartiradi).
+Manba PNG disk da saqlanadi (DiskStore, LRU eviction), encoding (webp / jpeg) har so'rovda.
+
+- TTL ichida - to'g'ridan-to'g'ri qaytariladi
+- revalidate=True yoki TTL tugagan bo'lsa - ETag / Last-Modified bo'yicha HEAD so'rov;
+  sahifa o'zgarmagan bo'lsa (304 yoki bir xil ETag) capture qayta ishlatiladi
+- HEAD faqat cache da yozuv bo'lganda: birinchi capture validator siz saqlanadi,
+  eskirgan yozuv qayta olinganda validator lar ham yoziladi
+"""
+
+import logging
+import os
+import time
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+
+from disk_store import DiskStore
+from url_normalize import canonicalize_url
+
+logger = logging.getLogger(__name__)
+
+HEAD_TIMEOUT = 5
+
+
+@dataclass(frozen=True)
+class Viewport:
+    """Capture o'lchami"""
+    width: int = 1920
+    height: int = 1080
+    device_scale_factor: float = 1.0
+    mobile: bool = False
+
+    @property
+    def key(self) -> str:
+        return f'{self.width}x{self.height}@{self.device_scale_factor:g}' + ('-mobile' if self.mobile else '')
+
+
+# Responsive breakpoint lar uchun tayyor viewport lar
+VIEWPORT_PRESETS = {
+    'desktop': Viewport(1440, 900, 1.0),
+    'laptop': Viewport(1280, 800, 1.0),
+    'tablet': Viewport(768, 1024, 2.0, mobile=True),
+    'mobile': Viewport(390, 844, 3.0, mobile=True),
+}
+
+
+class ScreenshotCache:
+    """(URL, viewport) -> PNG capture, TTL va HEAD revalidatsiya bilan"""
+
+    def __init__(self, http_pool, directory: Optional[str] = None, max_bytes: Optional[int] = None,
+                 ttl: Optional[float] = None):
+        directory = directory or os.getenv(
+            'SCREENSHOT_CACHE_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cache', 'screenshots')
+        )
+        max_bytes = max_bytes or int(os.getenv('SCREENSHOT_CACHE_MAX_MB', 256)) * 1024 * 1024
+        self.ttl = ttl if ttl is not None else float(os.getenv('SCREENSHOT_CACHE_TTL', 600))
+        self.http_pool = http_pool
+        self.store = DiskStore(directory, max_bytes)
+        self.counters = {'hits': 0, 'revalidated': 0, 'misses': 0, 'stale': 0}
+
+    @staticmethod
+    def _key(url: str, viewport: Viewport, variant: str) -> str:
+        return f'{canonicalize_url(url)}|{viewport.key}|{variant}'
+
+    def _validators(self, url: str, conditional: Optional[Dict[str, str]] = None) -> Tuple[Optional[int], Dict[str, str]]:
+        """HEAD so'rov - (status, {'etag', 'last_modified'}); xatolikda (None, {})"""
+        try:
+            response = self.http_pool.request(
+                'HEAD', url, headers=conditional or {}, timeout=HEAD_TIMEOUT, allow_redirects=True
+            )
+            response.close()
+        except Exception as e:
+            logger.debug(f"Screenshot revalidation HEAD failed for {url}: {str(e)}")
+            return None, {}
+        return response.status_code, {
+            'etag': response.headers.get('ETag'),
+            'last_modified': response.headers.get('Last-Modified'),
+        }
+
+    def _still_valid(self, url: str, meta: Dict) -> Optional[bool]:
+        """Sahifa o'zgarmaganmi - validator bo'lmasa yoki HEAD ishlamasa None"""
+        etag, last_modified = meta.get('etag'), meta.get('last_modified')
+        if not (etag or last_modified):
+            return None
+        conditional = {}
+        if etag:
+            conditional['If-None-Match'] = etag
+        if last_modified:
+            conditional['If-Modified-Since'] = last_modified
+        status, validators = self._validators(url, conditional)
+        if status is None:
+            return None
+        if status == 304:
+            return True
+        # Ba'zi serverlar HEAD da conditional header larni e'tiborsiz qoldiradi
+        if etag and validators['etag']:
+            return validators['etag'] == etag
+        if last_modified and validators['last_modified']:
+            return validators['last_modified'] == last_modified
+        return False
+
+    def get(self, url: str, viewport: Viewport, revalidate: bool = False,
+            variant: str = '') -> Tuple[Optional[bytes], Optional[Dict]]:
+        """Saqlangan capture - (png, meta), meta['cache'] = 'hit' | 'revalidated'
+
+        Yozuv yo'q bo'lsa (None, None); eskirgan bo'lsa (None, eski meta) - qayta capture da
+        validator lar olinishi kerakligini bildiradi.
+        """
+        key = self._key(url, viewport, variant)
+        item = self.store.get(key, with_blob=True)
+        if item is None or item[1] is None:
+            self.counters['misses'] += 1
+            return None, None
+        meta, png = item
+        fresh = time.time() - meta.get('stored_at', 0) < self.ttl
+
+        if fresh and not revalidate:
+            self.counters['hits'] += 1
+            return png, {**meta, 'cache': 'hit'}
+
+        valid = self._still_valid(url, meta)
+        if valid or (valid is None and fresh):
+            if valid:
+                self.store.update_meta(key, {**meta, 'stored_at': time.time()})
+            self.counters['revalidated' if valid else 'hits'] += 1
+            return png, {**meta, 'cache': 'revalidated' if valid else 'hit'}
+
+        self.counters['stale'] += 1
+        self.store.delete(key)
+        return None, meta
+
+    def fetch_validators(self, url: str) -> Dict[str, str]:
+        """Sahifaning hozirgi ETag / Last-Modified i (bir nechta put uchun bitta HEAD)"""
+        return self._validators(url)[1]
+
+    def put(self, url: str, viewport: Viewport, png: bytes, extra: Optional[Dict] = None,
+            validators: Optional[Dict[str, str]] = None, variant: str = ''):
+        """Yangi capture ni saqlash (validator lar berilsa - keyingi revalidatsiya uchun)"""
+        self.store.put(self._key(url, viewport, variant), {
+            'url': url,
+            'viewport': viewport.key,
+            'stored_at': time.time(),
+            **(validators or {}),
+            **(extra or {}),
+        }, png)
+
+    def stats(self) -> Dict[str, int]:
+        return {**self.store.stats(), **self.counters, 'ttl': int(self.ttl)}
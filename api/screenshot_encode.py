@@ -0,0 +1,173 @@
+"""
+🖼️ Screenshot Encoding
+Chrome PNG screenshot ini WebP / JPEG / PNG ga o'girish va kichraytirish
+
+- Javob rasmning o'zi bo'lsa encoding sinxron (request thread da) - browser allaqachon pool ga qaytgan
+- Bir nechta rasm (multi, capture) worker thread larda parallel encode qilinadi
+- max_width berilsa proporsional kichraytiriladi (LANCZOS)
+- Blob rejimi: encoding fonda boshlanadi, client ga darhol id / URL qaytariladi;
+  rasm blob so'ralganda (kerak bo'lsa encoding tugashini kutib) beriladi
+"""
+
+import io
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, Optional, Union
+
+from PIL import Image
+
+# format -> (Pillow format, MIME type)
+IMAGE_FORMATS = {
+    'webp': ('WEBP', 'image/webp'),
+    'jpeg': ('JPEG', 'image/jpeg'),
+    'jpg': ('JPEG', 'image/jpeg'),
+    'png': ('PNG', 'image/png'),
+}
+DEFAULT_QUALITY = 80
+MIN_WIDTH = 16
+
+
+class UnsupportedImageFormat(ValueError):
+    """Qo'llab-quvvatlanmaydigan rasm formati"""
+
+
+@dataclass
+class EncodedImage:
+    """Encode qilingan screenshot"""
+    data: bytes
+    format: str
+    mime_type: str
+    width: int
+    height: int
+    source_bytes: int
+    encode_ms: int
+
+    def to_dict(self):
+        return {
+            'format': self.format,
+            'mime_type': self.mime_type,
+            'width': self.width,
+            'height': self.height,
+            'bytes': len(self.data),
+            'source_bytes': self.source_bytes,
+            'encode_ms': self.encode_ms,
+        }
+
+
+def format_info(fmt: str) -> Dict[str, str]:
+    """Hali encode qilinmagan (blob) rasm uchun format va MIME type"""
+    fmt = fmt.lower()
+    if fmt not in IMAGE_FORMATS:
+        raise UnsupportedImageFormat(f"Unsupported image format: {fmt}")
+    return {'format': 'jpeg' if fmt == 'jpg' else fmt, 'mime_type': IMAGE_FORMATS[fmt][1]}
+
+
+def encode_screenshot(png: bytes, fmt: str = 'webp', quality: int = DEFAULT_QUALITY,
+                      max_width: Optional[int] = None) -> EncodedImage:
+    """PNG bytes -> tanlangan format (ixtiyoriy kichraytirish bilan)"""
+    fmt = fmt.lower()
+    if fmt not in IMAGE_FORMATS:
+        raise UnsupportedImageFormat(f"Unsupported image format: {fmt}")
+    pil_format, mime_type = IMAGE_FORMATS[fmt]
+    quality = max(1, min(int(quality), 100))
+
+    started = time.time()
+    image = Image.open(io.BytesIO(png))
+    image.load()
+    if max_width and image.width > max_width:
+        width = max(int(max_width), MIN_WIDTH)
+        height = max(round(image.height * width / image.width), 1)
+        image = image.resize((width, height), Image.LANCZOS)
+
+    output = io.BytesIO()
+    if pil_format == 'JPEG':
+        image.convert('RGB').save(output, 'JPEG', quality=quality, optimize=True, progressive=True)
+    elif pil_format == 'WEBP':
+        image.save(output, 'WEBP', quality=quality, method=4)
+    else:
+        image.save(output, 'PNG', compress_level=6)
+
+    return EncodedImage(
+        data=output.getvalue(),
+        format='jpeg' if fmt == 'jpg' else fmt,
+        mime_type=mime_type,
+        width=image.width,
+        height=image.height,
+        source_bytes=len(png),
+        encode_ms=int((time.time() - started) * 1000),
+    )
+
+
+class ScreenshotEncoder:
+    """Encoding worker pool i + blob rejimi uchun xotiradagi LRU"""
+
+    def __init__(self, workers: Optional[int] = None, blob_entries: Optional[int] = None,
+                 blob_ttl: Optional[float] = None):
+        workers = workers or int(os.getenv('SCREENSHOT_ENCODE_WORKERS', 2))
+        self.blob_entries = blob_entries or int(os.getenv('SCREENSHOT_BLOB_ENTRIES', 50))
+        self.blob_ttl = blob_ttl or float(os.getenv('SCREENSHOT_BLOB_TTL', 300))
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='screenshot-encode')
+        self._blobs: 'OrderedDict[str, tuple]' = OrderedDict()  # id -> (EncodedImage | Future, saved_at)
+        self._lock = threading.Lock()
+
+    def submit(self, png: bytes, fmt: str = 'webp', quality: int = DEFAULT_QUALITY,
+               max_width: Optional[int] = None) -> 'Future[EncodedImage]':
+        """Encoding ni worker ga berish (bir nechta rasm parallel encode qilinadi)"""
+        return self._pool.submit(encode_screenshot, png, fmt, quality, max_width)
+
+    def encode(self, png: bytes, fmt: str = 'webp', quality: int = DEFAULT_QUALITY,
+               max_width: Optional[int] = None) -> EncodedImage:
+        """Sinxron encoding (chaqiruvchi thread da) - javob rasmning o'zi bo'lganda baribir kutiladi"""
+        return encode_screenshot(png, fmt, quality, max_width)
+
+    def submit_blob(self, png: bytes, fmt: str = 'webp', quality: int = DEFAULT_QUALITY,
+                    max_width: Optional[int] = None) -> str:
+        """Encoding ni fonda boshlash va darhol blob id qaytarish"""
+        format_info(fmt)  # noto'g'ri format - blob so'ralganda emas, shu yerda xatolik
+        return self.put_blob(self.submit(png, fmt, quality, max_width))
+
+    def put_blob(self, image: Union[EncodedImage, 'Future[EncodedImage]']) -> str:
+        blob_id = uuid.uuid4().hex
+        with self._lock:
+            self._blobs[blob_id] = (image, time.time())
+            while len(self._blobs) > self.blob_entries:
+                self._blobs.popitem(last=False)
+        return blob_id
+
+    def get_blob(self, blob_id: str, timeout: Optional[float] = 30) -> Optional[EncodedImage]:
+        """Saqlangan rasm - encoding hali tugamagan bo'lsa natija kutiladi (xatolik qayta ko'tariladi)"""
+        with self._lock:
+            item = self._blobs.get(blob_id)
+            if item is None:
+                return None
+            if time.time() - item[1] > self.blob_ttl:
+                del self._blobs[blob_id]
+                return None
+        image = item[0]
+        if not isinstance(image, Future):
+            return image
+        try:
+            return image.result(timeout=timeout)
+        except Exception:
+            if image.done():
+                # Muvaffaqiyatsiz encoding saqlanmaydi
+                with self._lock:
+                    self._blobs.pop(blob_id, None)
+            raise
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            entries = [image for image, _ in self._blobs.values()]
+        pending = [image for image in entries if isinstance(image, Future) and not image.done()]
+        images = [image.result() if isinstance(image, Future) else image for image in entries
+                  if not isinstance(image, Future) or (image.done() and not image.exception())]
+        return {
+            'blobs': len(entries),
+            'pending_blobs': len(pending),
+            'blob_bytes': sum(len(image.data) for image in images),
+        }
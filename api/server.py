@@ -1,15 +1,13 @@
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request, jsonify
 from flask_cors import CORS
 from flask_limiter import Limiter
 from flask_limiter.util import get_remote_address
 import requests
-from bs4 import BeautifulSoup
 import base64
 import json
 import os
+import threading
 import time
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
@@ -24,9 +22,27 @@ from anthropic import Anthropic
 import google.generativeai as genai
 from groq import Groq
 
+from http_pool import get_http_pool
+from html_parsers import content_type_charset, get_parser_backend
+from dom_extract import PageExtractor
+from html_excerpt import excerpt_html
+from browser_pool import BrowserPool, BrowserPoolTimeout, create_chrome_driver
+from page_readiness import wait_until_ready
+from screenshot_encode import DEFAULT_QUALITY, IMAGE_FORMATS, ScreenshotEncoder, format_info
+from screenshot_cache import VIEWPORT_PRESETS, ScreenshotCache, Viewport
+from network_blocking import apply_blocking, collect_report, resolve_profile
+from style_harvest import harvest_styles
+from design_tokens import tokens_from_harvest
+
 # Load environment variables
 load_dotenv()
 
+# Umumiy connection pool (keep-alive, DNS cache)
+http_pool = get_http_pool()
+
+# HTML parser backend (HTML_PARSER_BACKEND: html.parser / lxml / selectolax)
+html_parser = get_parser_backend()
+
 app = Flask(__name__)
 
 # CORS configuration
@@ -35,7 +51,7 @@ CORS(app, origins=[
     "http://localhost:3001", 
     "http://localhost:5173",
     os.getenv('FRONTEND_URL', 'http://localhost:3000')
-])
+], expose_headers=['X-Screenshot-Width', 'X-Screenshot-Height', 'X-Readiness-Signal', 'X-Screenshot-Cache'])
 
 # Rate limiting
 limiter = Limiter(
@@ -71,28 +87,29 @@ if GROQ_API_KEY:
 
 def setup_chrome_driver():
     """Chrome driver ni setup qilish with improved options"""
-    chrome_options = Options()
-    
-    # Headless mode
-    if os.getenv('HEADLESS_MODE', 'true').lower() == 'true':
-        chrome_options.add_argument('--headless')
-    
-    # Performance optimizations
-    chrome_options.add_argument('--no-sandbox')
-    chrome_options.add_argument('--disable-dev-shm-usage')
-    chrome_options.add_argument('--disable-gpu')
-    chrome_options.add_argument('--disable-extensions')
-    chrome_options.add_argument('--disable-logging')
-    chrome_options.add_argument('--silent')
-    chrome_options.add_argument('--window-size=1920,1080')
-    chrome_options.add_argument('--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36')
-    
-    # Chrome driver path
-    chrome_driver_path = os.getenv('CHROME_DRIVER_PATH')
-    if chrome_driver_path:
-        return webdriver.Chrome(service=webdriver.ChromeService(chrome_driver_path), options=chrome_options)
-    else:
-        return webdriver.Chrome(options=chrome_options)
+    return create_chrome_driver()
+
+# Oldindan ishga tushirilgan Chrome sessiyalari (screenshot lar uchun)
+browser_pool = BrowserPool(setup_chrome_driver)
+if os.getenv('BROWSER_POOL_PREWARM', 'true').lower() == 'true':
+    threading.Thread(target=browser_pool.prewarm, name='browser-prewarm', daemon=True).start()
+
+# Screenshot encoding (webp / jpeg / png) worker lari
+screenshot_encoder = ScreenshotEncoder()
+
+# Screenshot cache (URL + viewport + DPR, TTL va HEAD revalidatsiya)
+DEFAULT_VIEWPORT = Viewport(1920, 1080, 1.0)
+# Viewport o'zgargandan keyin qayta tinchlanish uchun deadline (sekund)
+RESIZE_READY_DEADLINE = float(os.getenv('SCREENSHOT_RESIZE_DEADLINE', 3))
+MAX_VIEWPORTS = 6
+CONTENT_TEXT_LIMIT = 5000
+CONTENT_SKIP_TAGS = ('script', 'style', 'noscript')
+# /api/capture: render qilingan outerHTML uchun maksimal hajm
+RENDERED_HTML_MAX_BYTES = int(os.getenv('RENDERED_HTML_MAX_BYTES', 5 * 1024 * 1024))
+
+# Screenshot lar uchun default network blocking profili (trackers / media / fonts / allow_all)
+DEFAULT_BLOCKING = resolve_profile(os.getenv('SCREENSHOT_BLOCK_PROFILE', 'trackers'))
+screenshot_cache = ScreenshotCache(http_pool) if os.getenv('SCREENSHOT_CACHE_ENABLED', 'true').lower() == 'true' else None
 
 def get_ai_provider():
     """Available AI provider ni aniqlash - Groq prioritet"""
@@ -349,6 +366,147 @@ Qaytaradigan JSON format:
 
 Faqat valid JSON qaytaring, boshqa matn yo'q."""
 
+def apply_viewport(driver, viewport):
+    """Joriy tab o'lchami va DPR ini o'rnatish (CDP device metrics)"""
+    driver.execute_cdp_cmd('Emulation.setDeviceMetricsOverride', {
+        'width': viewport.width,
+        'height': viewport.height,
+        'deviceScaleFactor': viewport.device_scale_factor,
+        'mobile': viewport.mobile,
+    })
+
+def load_page(driver, url, viewport, blocking):
+    """Tab da sahifani ochib, tayyor bo'lguncha kutish - readiness"""
+    if viewport != DEFAULT_VIEWPORT:
+        apply_viewport(driver, viewport)
+    
+    # Tracker / media / font so'rovlarini network qatlamida bloklash
+    apply_blocking(driver, blocking)
+    
+    # Website ni yuklash
+    driver.get(url)
+    
+    # Page loading ni kutish
+    WebDriverWait(driver, 10).until(
+        EC.presence_of_element_located((By.TAG_NAME, "body"))
+    )
+    
+    # Dynamic content: network idle + DOM sokinligi + font lar (deadline bilan)
+    return wait_until_ready(driver)
+
+def capture_viewports(url, viewports, blocking):
+    """Sahifani bir marta yuklab, har bir viewport uchun PNG olish - ([(png, readiness), ...], blocking report)"""
+    captures = []
+    # Pool dan tayyor Chrome (har so'rov uchun alohida browser context)
+    with browser_pool.page() as driver:
+        readiness = load_page(driver, url, viewports[0], blocking)
+        
+        # Screenshot olish
+        captures.append((driver.get_screenshot_as_png(), readiness))
+        
+        # Qolgan breakpoint lar: qayta yuklamasdan o'lchamni o'zgartirib, layout tinchlanishini kutish
+        for viewport in viewports[1:]:
+            apply_viewport(driver, viewport)
+            readiness = wait_until_ready(driver, deadline=RESIZE_READY_DEADLINE)
+            captures.append((driver.get_screenshot_as_png(), readiness))
+        
+        report = collect_report(driver, blocking)
+    return captures, report
+
+def capture_rendered(url, viewport, blocking, styles=False):
+    """Bitta yuklashda screenshot va render qilingan DOM - (png, outerHTML, final_url, readiness, blocking report, style harvest)"""
+    harvest = None
+    with browser_pool.page() as driver:
+        readiness = load_page(driver, url, viewport, blocking)
+        png = driver.get_screenshot_as_png()
+        rendered_html = driver.execute_script('return document.documentElement.outerHTML') or ''
+        final_url = driver.current_url or url
+        # Computed style lar (rang, font, spacing, box) - bitta execute_script
+        if styles:
+            harvest = harvest_styles(driver)
+        report = collect_report(driver, blocking)
+    return png, rendered_html, final_url, readiness, report, harvest
+
+def take_screenshots(url, viewports, use_cache=True, revalidate=False, blocking=None):
+    """Har bir viewport uchun cache dan yoki yangi capture - [(png, {'readiness', 'blocking', 'cache', 'viewport'}), ...]"""
+    blocking = blocking or DEFAULT_BLOCKING
+    results = [None] * len(viewports)
+    stale = False
+    if use_cache and screenshot_cache:
+        for index, viewport in enumerate(viewports):
+            png, meta = screenshot_cache.get(url, viewport, revalidate=revalidate, variant=blocking.key)
+            stale = stale or (png is None and meta is not None)
+            if png is not None:
+                results[index] = (png, {
+                    'readiness': meta.get('readiness', {}),
+                    'blocking': meta.get('blocking', {}),
+                    'cache': meta['cache'],
+                    'viewport': viewport.key,
+                })
+    
+    missing = [index for index, result in enumerate(results) if result is None]
+    if missing:
+        captures, report = capture_viewports(url, [viewports[index] for index in missing], blocking)
+        # HEAD faqat eskirgan yozuv bo'lganda - yangi URL capture i qo'shimcha so'rovsiz
+        validators = screenshot_cache.fetch_validators(url) if screenshot_cache and stale else None
+        for index, (png, readiness) in zip(missing, captures):
+            info = {'readiness': readiness.to_dict(), 'blocking': report.to_dict()}
+            if screenshot_cache:
+                screenshot_cache.put(url, viewports[index], png, info, validators, variant=blocking.key)
+            results[index] = (png, {
+                **info,
+                'cache': 'miss' if use_cache else 'bypass',
+                'viewport': viewports[index].key,
+            })
+    return results
+
+def take_screenshot(url, viewport=None, use_cache=True, revalidate=False, blocking=None):
+    """Cache dan yoki yangi capture - (png, {'readiness', 'blocking', 'cache', 'viewport'})"""
+    return take_screenshots(url, [viewport or DEFAULT_VIEWPORT], use_cache, revalidate, blocking)[0]
+
+def parse_blocking(data):
+    """So'rovdagi block: 'trackers,media' / ['fonts'] / 'allow_all' (berilmasa default profil)"""
+    if 'block' not in data:
+        return DEFAULT_BLOCKING
+    return resolve_profile(data.get('block'))
+
+def parse_flag(data, name, default=False):
+    """So'rovdagi boolean: true / false, 1 / 0 yoki ularning satr ko'rinishi ("false" - False)"""
+    value = data.get(name, default)
+    if value is None or isinstance(value, bool):
+        return default if value is None else value
+    if isinstance(value, int) and value in (0, 1):
+        return bool(value)
+    if isinstance(value, str) and value.strip().lower() in ('true', '1', 'yes', 'false', '0', 'no', ''):
+        return value.strip().lower() in ('true', '1', 'yes')
+    raise ValueError(f"{name} true yoki false bo'lishi kerak")
+
+def parse_viewport(value):
+    """Viewport: preset nomi ('mobile') yoki {'width', 'height', 'device_scale_factor', 'mobile'}"""
+    if isinstance(value, str):
+        if value not in VIEWPORT_PRESETS:
+            raise ValueError(f"viewport {', '.join(VIEWPORT_PRESETS)} dan biri bo'lishi kerak")
+        return VIEWPORT_PRESETS[value]
+    if value is None:
+        value = {}
+    if not isinstance(value, dict):
+        raise ValueError("viewport preset nomi yoki {'width', 'height', ...} obyekti bo'lishi kerak")
+    return Viewport(
+        width=min(max(int(value.get('width') or DEFAULT_VIEWPORT.width), 240), 3840),
+        height=min(max(int(value.get('height') or DEFAULT_VIEWPORT.height), 240), 4320),
+        device_scale_factor=min(max(float(value.get('device_scale_factor') or 1), 0.5), 4.0),
+        mobile=parse_flag(value, 'mobile'),
+    )
+
+def parse_image_options(data):
+    """So'rovdagi format / quality / max_width - (format, quality, max_width)"""
+    fmt = str(data.get('format') or 'webp').lower()
+    if fmt not in IMAGE_FORMATS:
+        raise ValueError(f"format {', '.join(sorted(IMAGE_FORMATS))} dan biri bo'lishi kerak")
+    quality = int(data.get('quality') or DEFAULT_QUALITY)
+    max_width = data.get('max_width')
+    return fmt, quality, int(max_width) if max_width else None
+
 @app.route('/api/screenshot', methods=['POST'])
 @limiter.limit("10 per minute")
 def capture_screenshot():
@@ -366,25 +524,18 @@ def capture_screenshot():
         
         print(f"Taking screenshot of: {url}")
         
-        # Setup Chrome driver
-        driver = None
         try:
-            driver = setup_chrome_driver()
-            
-            # Website ni yuklash
-            driver.get(url)
-            
-            # Page loading ni kutish
-            WebDriverWait(driver, 10).until(
-                EC.presence_of_element_located((By.TAG_NAME, "body"))
+            viewport = parse_viewport(data.get('viewport'))
+            blocking = parse_blocking(data)
+            use_cache, revalidate = parse_flag(data, 'cache', True), parse_flag(data, 'revalidate')
+        except (TypeError, ValueError) as e:
+            return jsonify({'error': f'Noto\'g\'ri parametrlar: {str(e)}', 'success': False}), 400
+        
+        try:
+            screenshot, info = take_screenshot(
+                url, viewport, use_cache=use_cache, revalidate=revalidate, blocking=blocking
             )
             
-            # Extra wait for dynamic content
-            time.sleep(3)
-            
-            # Screenshot olish
-            screenshot = driver.get_screenshot_as_png()
-            
             # Base64 ga aylantirish
             screenshot_base64 = base64.b64encode(screenshot).decode('utf-8')
             screenshot_url = f"data:image/png;base64,{screenshot_base64}"
@@ -392,10 +543,18 @@ def capture_screenshot():
             return jsonify({
                 'screenshot': screenshot_url,
                 'url': url,
+                **info,
                 'timestamp': int(time.time()),
                 'success': True
             })
             
+        except BrowserPoolTimeout as e:
+            print(f"Screenshot queue timeout: {str(e)}")
+            return jsonify({
+                'error': 'Barcha browser lar band, keyinroq urinib ko\'ring',
+                'success': False
+            }), 503
+            
         except Exception as e:
             print(f"Screenshot error: {str(e)}")
             return jsonify({
@@ -403,10 +562,6 @@ def capture_screenshot():
                 'success': False
             }), 500
             
-        finally:
-            if driver:
-                driver.quit()
-            
     except Exception as e:
         print(f"General error: {str(e)}")
         return jsonify({
@@ -414,6 +569,204 @@ def capture_screenshot():
             'success': False
         }), 500
 
+@app.route('/api/screenshot/image', methods=['POST'])
+@limiter.limit("10 per minute")
+def capture_screenshot_image():
+    """Screenshot ni binary rasm (webp / jpeg / png) sifatida qaytarish.
+    
+    mode=bytes (default) - rasm to'g'ridan-to'g'ri response body da
+    mode=blob            - JSON da blob URL, rasm /api/screenshot/blob/<id> dan olinadi
+    """
+    try:
+        data = request.get_json() or {}
+        url = data.get('url')
+        
+        if not url:
+            return jsonify({'error': 'URL required', 'success': False}), 400
+        
+        if not url.startswith(('http://', 'https://')):
+            url = 'https://' + url
+        
+        try:
+            fmt, quality, max_width = parse_image_options(data)
+            viewport = parse_viewport(data.get('viewport'))
+            blocking = parse_blocking(data)
+            use_cache, revalidate = parse_flag(data, 'cache', True), parse_flag(data, 'revalidate')
+        except (TypeError, ValueError) as e:
+            return jsonify({'error': f'Noto\'g\'ri rasm parametrlari: {str(e)}', 'success': False}), 400
+        
+        try:
+            screenshot, info = take_screenshot(
+                url, viewport, use_cache=use_cache, revalidate=revalidate, blocking=blocking
+            )
+        except BrowserPoolTimeout as e:
+            print(f"Screenshot queue timeout: {str(e)}")
+            return jsonify({
+                'error': 'Barcha browser lar band, keyinroq urinib ko\'ring',
+                'success': False
+            }), 503
+        
+        if data.get('mode') == 'blob':
+            # Encoding fonda - blob id darhol qaytariladi, rasm blob URL so'ralganda kutiladi
+            blob_id = screenshot_encoder.submit_blob(screenshot, fmt, quality, max_width)
+            return jsonify({
+                'blob_id': blob_id,
+                'blob_url': f'/api/screenshot/blob/{blob_id}',
+                'image': format_info(fmt),
+                'url': url,
+                **info,
+                'timestamp': int(time.time()),
+                'success': True
+            })
+        
+        # Javob rasmning o'zi - encoding sinxron (browser allaqachon pool ga qaytgan)
+        image = screenshot_encoder.encode(screenshot, fmt, quality, max_width)
+        
+        return Response(image.data, mimetype=image.mime_type, headers={
+            'Cache-Control': 'no-store',
+            'X-Screenshot-Width': str(image.width),
+            'X-Screenshot-Height': str(image.height),
+            'X-Readiness-Signal': info['readiness'].get('signal', ''),
+            'X-Screenshot-Cache': info['cache'],
+        })
+        
+    except Exception as e:
+        print(f"Screenshot image error: {str(e)}")
+        return jsonify({
+            'error': f'Screenshot olishda xatolik: {str(e)}',
+            'success': False
+        }), 500
+
+@app.route('/api/screenshot/multi', methods=['POST'])
+@limiter.limit("5 per minute")
+def capture_screenshot_multi():
+    """Bir nechta viewport (desktop / tablet / mobile) screenshot lari - sahifa bir marta yuklanadi.
+    
+    viewports: ['desktop', 'mobile', {'width': 1024, 'height': 768}, ...]
+    mode=blob bo'lsa data URL o'rniga blob URL lar qaytariladi
+    """
+    try:
+        data = request.get_json() or {}
+        url = data.get('url')
+        
+        if not url:
+            return jsonify({'error': 'URL required', 'success': False}), 400
+        
+        if not url.startswith(('http://', 'https://')):
+            url = 'https://' + url
+        
+        try:
+            names = data.get('viewports') or ['desktop', 'tablet', 'mobile']
+            if not isinstance(names, list) or len(names) > MAX_VIEWPORTS:
+                raise ValueError(f'viewports {MAX_VIEWPORTS} tagacha elementli ro\'yxat bo\'lishi kerak')
+            viewports = [parse_viewport(name) for name in names]
+            fmt, quality, max_width = parse_image_options(data)
+            blocking = parse_blocking(data)
+            use_cache, revalidate = parse_flag(data, 'cache', True), parse_flag(data, 'revalidate')
+        except (TypeError, ValueError) as e:
+            return jsonify({'error': f'Noto\'g\'ri parametrlar: {str(e)}', 'success': False}), 400
+        
+        print(f"Taking {len(viewports)} screenshots of: {url}")
+        
+        try:
+            captures = take_screenshots(
+                url, viewports, use_cache=use_cache, revalidate=revalidate, blocking=blocking
+            )
+        except BrowserPoolTimeout as e:
+            print(f"Screenshot queue timeout: {str(e)}")
+            return jsonify({
+                'error': 'Barcha browser lar band, keyinroq urinib ko\'ring',
+                'success': False
+            }), 503
+        
+        # Hamma rasm worker larda parallel encode qilinadi; blob rejimida natija kutilmaydi
+        blob_mode = data.get('mode') == 'blob'
+        submit = screenshot_encoder.submit_blob if blob_mode else screenshot_encoder.submit
+        encodings = [submit(png, fmt, quality, max_width) for png, _ in captures]
+        screenshots = []
+        for name, encoding, (_, info) in zip(names, encodings, captures):
+            item = {
+                'name': name if isinstance(name, str) else info['viewport'],
+                **info,
+            }
+            if blob_mode:
+                item['image'] = format_info(fmt)
+                item['blob_url'] = f'/api/screenshot/blob/{encoding}'
+            else:
+                image = encoding.result(timeout=30)
+                item['image'] = image.to_dict()
+                item['screenshot'] = f"data:{image.mime_type};base64,{base64.b64encode(image.data).decode('utf-8')}"
+            screenshots.append(item)
+        
+        return jsonify({
+            'screenshots': screenshots,
+            'url': url,
+            'timestamp': int(time.time()),
+            'success': True
+        })
+        
+    except Exception as e:
+        print(f"Multi screenshot error: {str(e)}")
+        return jsonify({
+            'error': f'Screenshot olishda xatolik: {str(e)}',
+            'success': False
+        }), 500
+
+@app.route('/api/screenshot/blob/<blob_id>', methods=['GET'])
+def get_screenshot_blob(blob_id):
+    """Blob rejimida saqlangan screenshot (encoding tugamagan bo'lsa kutiladi)"""
+    try:
+        image = screenshot_encoder.get_blob(blob_id)
+    except Exception as e:
+        print(f"Screenshot blob encode error: {str(e)}")
+        return jsonify({'error': f'Screenshot ni encode qilib bo\'lmadi: {str(e)}', 'success': False}), 500
+    if image is None:
+        return jsonify({'error': 'Blob topilmadi yoki muddati o\'tgan', 'success': False}), 404
+    return Response(image.data, mimetype=image.mime_type, headers={
+        'Cache-Control': f'private, max-age={int(screenshot_encoder.blob_ttl)}',
+        'X-Screenshot-Width': str(image.width),
+        'X-Screenshot-Height': str(image.height),
+    })
+
+def extract_page_content(doc, url):
+    """Parse qilingan sahifadan content, HTML excerpt va meta ma'lumotlar (statik va render qilingan DOM uchun)"""
+    extractor = PageExtractor(url)
+    extract = extractor.extract(doc)
+    meta = extract.meta_data
+    
+    # Clean text content (5000 belgigacha) - noscript fallback matni ham tashlanadi
+    parts, size = [], 0
+    for node in doc.iter_nodes(CONTENT_SKIP_TAGS):
+        if isinstance(node, str):
+            text = node.strip()
+            if text:
+                parts.append(text)
+                size += len(text) + 1
+                if size >= CONTENT_TEXT_LIMIT:
+                    break
+    
+    # Favicon: rel="icon" / "shortcut icon", bo'lmasa apple-touch-icon
+    favicon_url = ''
+    for link in doc.find_all('link'):
+        rels = (link.get('rel') or '').lower().split()
+        href = link.get('href')
+        if href and ('icon' in rels or (not favicon_url and 'apple-touch-icon' in rels)):
+            favicon_url = extractor.resolver.resolve(href)
+            if 'icon' in rels:
+                break
+    
+    return {
+        'content': ' '.join(parts)[:CONTENT_TEXT_LIMIT],
+        # Faqat 10000 belgigacha serialize qilinadi (butun document emas)
+        'html': excerpt_html(doc, 10000),
+        'title': (extract.title or '').strip(),
+        'description': meta.get('description', meta.get('og_description', '')).strip(),
+        'keywords': meta.get('keywords', ''),
+        'favicon': favicon_url,
+        'language': meta.get('language', 'en'),
+        'og_data': {key[3:]: value for key, value in meta.items() if key.startswith('og_')},
+    }
+
 @app.route('/api/fetch-content', methods=['POST'])
 @limiter.limit("20 per minute")
 def fetch_website_content():
@@ -436,68 +789,21 @@ def fetch_website_content():
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
             'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
             'Accept-Language': 'en-US,en;q=0.5',
-            'Accept-Encoding': 'gzip, deflate',
             'Connection': 'keep-alive',
         }
         
         timeout = int(os.getenv('API_TIMEOUT', 30))
-        response = requests.get(url, headers=headers, timeout=timeout)
-        response.raise_for_status()
+        max_bytes = int(os.getenv('FETCH_MAX_DECODED_BYTES', 50 * 1024 * 1024))
+        # br/zstd/gzip body streaming decode qilinadi (decode limiti bilan)
+        response, body, transfer = http_pool.get_decoded(url, max_bytes, headers=headers, timeout=timeout)
         
         # HTML content ni olish
-        soup = BeautifulSoup(response.content, 'html.parser')
-        
-        # Script va style taglarni olib tashlash
-        for script in soup(["script", "style", "noscript"]):
-            script.decompose()
-        
-        # Clean text content
-        content = soup.get_text(separator=' ', strip=True)
-        html = str(soup.prettify())
-        
-        # Meta ma'lumotlarni olish
-        title = soup.find('title')
-        title_text = title.get_text().strip() if title else ''
-        
-        description = soup.find('meta', attrs={'name': 'description'}) or soup.find('meta', attrs={'property': 'og:description'})
-        description_text = description.get('content', '').strip() if description else ''
-        
-        # Keywords
-        keywords = soup.find('meta', attrs={'name': 'keywords'})
-        keywords_text = keywords.get('content', '') if keywords else ''
-        
-        # Favicon olish
-        favicon = soup.find('link', rel=['icon', 'shortcut icon']) or soup.find('link', rel='apple-touch-icon')
-        favicon_url = ''
-        if favicon:
-            href = favicon.get('href', '')
-            if href.startswith('//'):
-                favicon_url = 'https:' + href
-            elif href.startswith('/'):
-                from urllib.parse import urljoin
-                favicon_url = urljoin(url, href)
-            elif href.startswith('http'):
-                favicon_url = href
-        
-        # Language detection
-        lang = soup.find('html', lang=True)
-        language = lang.get('lang', 'en') if lang else 'en'
-        
-        # Open Graph data
-        og_data = {}
-        for meta in soup.find_all('meta', property=lambda x: x and x.startswith('og:')):
-            property_name = meta.get('property', '').replace('og:', '')
-            og_data[property_name] = meta.get('content', '')
+        charset = content_type_charset(response.headers.get('Content-Type'))
+        page = extract_page_content(html_parser.parse(body, encoding=charset), url)
         
         return jsonify({
-            'content': content[:5000],  # Limit content size
-            'html': html[:10000],       # Limit HTML size
-            'title': title_text,
-            'description': description_text,
-            'keywords': keywords_text,
-            'favicon': favicon_url,
-            'language': language,
-            'og_data': og_data,
+            **page,
+            'transfer': transfer.to_dict(),
             'url': url,
             'timestamp': int(time.time()),
             'success': True
@@ -517,6 +823,89 @@ def fetch_website_content():
             'success': False
         }), 500
 
+@app.route('/api/capture', methods=['POST'])
+@limiter.limit("10 per minute")
+def capture_website():
+    """Bitta brauzer yuklashida screenshot + render qilingan DOM + content / meta.
+    
+    /api/screenshot va /api/fetch-content ni birlashtiradi: sahifa bir marta yuklanadi
+    va extraction JS render qilgan DOM ustida ishlaydi.
+    """
+    try:
+        data = request.get_json() or {}
+        url = data.get('url')
+        
+        if not url:
+            return jsonify({'error': 'URL required', 'success': False}), 400
+        
+        if not url.startswith(('http://', 'https://')):
+            url = 'https://' + url
+        
+        try:
+            viewport = parse_viewport(data.get('viewport'))
+            blocking = parse_blocking(data)
+            image_options = parse_image_options(data) if data.get('format') else None
+            styles, include_html = parse_flag(data, 'styles'), parse_flag(data, 'include_html')
+        except (TypeError, ValueError) as e:
+            return jsonify({'error': f'Noto\'g\'ri parametrlar: {str(e)}', 'success': False}), 400
+        
+        print(f"Capturing rendered page: {url}")
+        
+        try:
+            png, rendered_html, final_url, readiness, report, harvest = capture_rendered(
+                url, viewport, blocking, styles=styles
+            )
+        except BrowserPoolTimeout as e:
+            print(f"Screenshot queue timeout: {str(e)}")
+            return jsonify({
+                'error': 'Barcha browser lar band, keyinroq urinib ko\'ring',
+                'success': False
+            }), 503
+        
+        # Screenshot keyingi /api/screenshot so'rovlari uchun ham cache ga
+        if screenshot_cache:
+            screenshot_cache.put(url, viewport, png, {'readiness': readiness.to_dict(), 'blocking': report.to_dict()},
+                                 variant=blocking.key)
+        encoded = screenshot_encoder.submit(png, *image_options) if image_options else None
+        
+        # Render qilingan DOM - statik fetch bilan bir xil extraction
+        html_bytes = rendered_html.encode('utf-8')[:RENDERED_HTML_MAX_BYTES]
+        page = extract_page_content(html_parser.parse(html_bytes, encoding='utf-8'), final_url)
+        
+        if encoded:
+            image = encoded.result(timeout=30)
+            screenshot_url = f"data:{image.mime_type};base64,{base64.b64encode(image.data).decode('utf-8')}"
+        else:
+            screenshot_url = f"data:image/png;base64,{base64.b64encode(png).decode('utf-8')}"
+        
+        result = {
+            **page,
+            'screenshot': screenshot_url,
+            'source': 'rendered',
+            'rendered_bytes': len(html_bytes),
+            'readiness': readiness.to_dict(),
+            'blocking': report.to_dict(),
+            'viewport': viewport.key,
+            'url': url,
+            'final_url': final_url,
+            'timestamp': int(time.time()),
+            'success': True
+        }
+        if styles:
+            tokens = tokens_from_harvest(harvest)
+            result['styles'] = harvest.to_dict() if harvest else None
+            result['design_tokens'] = tokens.to_dict() if tokens else None
+        if include_html:
+            result['rendered_html'] = html_bytes.decode('utf-8', errors='ignore')
+        return jsonify(result)
+        
+    except Exception as e:
+        print(f"Capture error: {str(e)}")
+        return jsonify({
+            'error': f'Sahifani olishda xatolik: {str(e)}',
+            'success': False
+        }), 500
+
 @app.route('/api/ai-analyze', methods=['POST'])
 def ai_analyze_website():
     """AI orqali website ni analiz qilish - Dynamic provider"""
@@ -684,5 +1073,15 @@ def health_check():
     """API health check"""
     return jsonify({'status': 'OK', 'message': 'API is running'})
 
+@app.route('/api/pool-stats', methods=['GET'])
+def pool_stats():
+    """HTTP connection pool va browser pool statistikasi"""
+    return jsonify({
+        'pool': get_http_pool().snapshot(),
+        'browsers': browser_pool.stats(),
+        'screenshots': {**screenshot_encoder.stats(), 'cache': screenshot_cache.stats() if screenshot_cache else None},
+        'timestamp': int(time.time())
+    })
+
 if __name__ == '__main__':
     app.run(debug=True, host='0.0.0.0', port=8000)
@@ -11,24 +11,39 @@ Features:
 - Professional error handling
 """
 
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request, jsonify, stream_with_context
 from flask_cors import CORS
 from flask_limiter import Limiter
 from flask_limiter.util import get_remote_address
-import requests
-from bs4 import BeautifulSoup
+import asyncio
 import base64
 import json
 import os
 import time
 import re
-from urllib.parse import urljoin, urlparse
 from dotenv import load_dotenv
 from groq import Groq
 import logging
-from dataclasses import dataclass
-from typing import List, Dict, Optional
-import hashlib
+from dataclasses import dataclass, asdict, field, fields
+from functools import partial
+from typing import Callable, List, Dict, Optional, Tuple
+
+from fetch_engine import AsyncFetchEngine, HTML_CONTENT_TYPES
+from http_pool import get_http_pool
+from http_cache import HTTPCache
+from html_parsers import HTMLDocument, get_parser_backend
+from html_excerpt import excerpt_html, structured_excerpt
+from dom_distill import SkeletonCollector, distill_dom
+from analysis_store import AnalysisStore, ContentFingerprint
+from dom_extract import PageExtract, PageExtractor, visit_document
+from stylesheets import StylesheetStage
+from image_probe import ImageProbe
+from batch_pipeline import BatchPipeline
+from site_crawler import SiteCrawler
+from adaptive_render import AdaptiveRenderer, BrowserRenderer, RenderDecision, ShellSignalCollector
+from design_tokens import design_system, tokens_from_harvest, tokens_from_stylesheets
+from style_harvest import StyleHarvest
+from browser_pool import BrowserPool, create_chrome_driver
 
 # Load environment variables
 load_dotenv()
@@ -76,6 +91,16 @@ class WebsiteData:
     styles: Dict[str, str]
     meta_data: Dict[str, str]
     screenshot: Optional[str] = None
+    internal_links: List[str] = field(default_factory=list)
+    stylesheets: List[Dict] = field(default_factory=list)
+    html_outline: str = ''
+    dom_skeleton: str = ''
+    content_hash: str = ''
+    render_mode: str = 'static'
+    design_tokens: Dict = field(default_factory=dict)
+
+# HTTP cache payload i: stylesheets (parse qilingan rule lar) saqlanmaydi, faqat url / hash lari
+CACHE_PAYLOAD_KEYS = frozenset(f.name for f in fields(WebsiteData) if f.name != 'stylesheets') | {'stylesheet_refs'}
 
 @dataclass
 class ComponentData:
@@ -91,18 +116,33 @@ class ComponentData:
 class AdvancedWebScraper:
     """Professional web scraping va analysis"""
     
-    def __init__(self):
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-            'Accept-Language': 'en-US,en;q=0.5',
-            'Accept-Encoding': 'gzip, deflate',
-            'Connection': 'keep-alive',
-        })
+    def __init__(
+        self,
+        engine: Optional[AsyncFetchEngine] = None,
+        cache: Optional[HTTPCache] = None,
+        parser=None,
+        adaptive: Optional[AdaptiveRenderer] = None,
+    ):
+        self.engine = engine or AsyncFetchEngine()
+        self.cache = cache
+        self.parser = parser or get_parser_backend()
+        # Client-rendered shell sahifalar uchun headless brauzer (statik fetch dan keyin)
+        self.adaptive = adaptive or AdaptiveRenderer()
+        self.max_bytes = int(os.getenv('SCRAPER_MAX_BYTES', 5 * 1024 * 1024))
+        # HTML excerpt budjetlari - butun document serialize qilinmaydi
+        self.html_excerpt_chars = int(os.getenv('SCRAPER_HTML_EXCERPT_CHARS', 50000))
+        self.outline_chars = int(os.getenv('SCRAPER_OUTLINE_CHARS', 3000))
+        self.outline_sections = int(os.getenv('SCRAPER_OUTLINE_SECTIONS', 5))
+        self.skeleton_tokens = int(os.getenv('PROMPT_SKELETON_TOKENS', 800))
+        self.stylesheets = (
+            StylesheetStage(self.engine)
+            if os.getenv('SCRAPE_STYLESHEETS', 'true').lower() == 'true' else None
+        )
+        self.image_probe = ImageProbe(self.engine)
+        self.probe_images = os.getenv('SCRAPE_PROBE_IMAGES', 'false').lower() == 'true'
     
-    def scrape_website(self, url: str) -> WebsiteData:
-        """Website ni to'liq analiz qilish"""
+    async def scrape_website_async(self, url: str, probe_images: Optional[bool] = None) -> WebsiteData:
+        """Website ni to'liq analiz qilish (async)"""
         try:
             # URL ni normalize qilish
             if not url.startswith(('http://', 'https://')):
@@ -110,158 +150,209 @@ class AdvancedWebScraper:
             
             logger.info(f"🌐 Scraping website: {url}")
             
-            # Main page ni olish
-            response = self.session.get(url, timeout=30)
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # Title
-            title = soup.find('title')
-            title_text = title.get_text().strip() if title else 'Untitled'
-            
-            # Meta data
-            meta_data = self._extract_meta_data(soup)
-            
-            # Text content
-            text_content = self._extract_text_content(soup)
+            website_data = await self._fetch_website_data(url)
             
-            # Links
-            links = self._extract_links(soup, url)
+            # Rasmlarning haqiqiy o'lcham va formatini aniqlash (ixtiyoriy)
+            if self.probe_images if probe_images is None else probe_images:
+                await self.image_probe.probe_all(website_data.images)
             
-            # Images
-            images = self._extract_images(soup, url)
-            
-            # Styles
-            styles = self._extract_styles(soup, url)
-            
-            return WebsiteData(
-                url=url,
-                title=title_text,
-                html=str(soup)[:50000],  # Limit size
-                text_content=text_content[:10000],  # Limit size
-                links=links[:20],  # Limit number
-                images=images[:50],  # Limit number
-                styles=styles,
-                meta_data=meta_data
-            )
+            return website_data
             
         except Exception as e:
             logger.error(f"❌ Scraping error: {str(e)}")
             raise Exception(f"Website scraping failed: {str(e)}")
     
-    def _extract_meta_data(self, soup: BeautifulSoup) -> Dict[str, str]:
-        """Meta ma'lumotlarni olish"""
-        meta_data = {}
+    def scrape_website(self, url: str, **kwargs) -> WebsiteData:
+        """Sync wrapper - mavjud route lar uchun"""
+        return self.engine.run(self.scrape_website_async(url, **kwargs))
+    
+    async def _fetch_website_data(self, url: str) -> WebsiteData:
+        """Sahifani yuklash (cache bilan), parse qilish va CSS stage"""
+        loop = asyncio.get_running_loop()
         
-        # Description
-        description = soup.find('meta', attrs={'name': 'description'})
-        if description:
-            meta_data['description'] = description.get('content', '')
+        # Avval shell deb topilgan domen - statik fetch siz to'g'ridan-to'g'ri brauzerda
+        if self.adaptive.remembered(url):
+            rendered = await self._render(url)
+            if rendered:
+                self.adaptive.counters['direct'] += 1
+                website_data, page = rendered
+                await self._collect_stylesheets(website_data, page)
+                await self._extract_design_tokens(website_data)
+                return website_data
         
-        # Keywords
-        keywords = soup.find('meta', attrs={'name': 'keywords'})
-        if keywords:
-            meta_data['keywords'] = keywords.get('content', '')
+        # Cache dagi nusxa bo'lsa - conditional GET
+        entry = None
+        if self.cache:
+            entry = await loop.run_in_executor(None, self.cache.get, url)
+            if entry and not CACHE_PAYLOAD_KEYS <= entry.payload.keys():
+                # Eski formatdagi payload (yangi field lar yo'q) - qayta parse qilinadi
+                entry = None
+        headers = entry.conditional_headers() if entry and entry.revalidatable else None
         
-        # Open Graph
-        og_tags = soup.find_all('meta', property=lambda x: x and x.startswith('og:'))
-        for tag in og_tags:
-            property_name = tag.get('property', '').replace('og:', '')
-            meta_data[f'og_{property_name}'] = tag.get('content', '')
+        # Main page ni olish - chunk lar yuklanish davomida parser ga uzatiladi
+        # (feeder javob header laridagi charset bilan yaratiladi)
+        feeders = []
         
-        # Language
-        html_tag = soup.find('html')
-        if html_tag and html_tag.get('lang'):
-            meta_data['language'] = html_tag.get('lang')
+        def open_feed(charset: Optional[str]):
+            feeders.append(self.parser.feeder(encoding=charset))
+            return feeders[-1].feed
         
-        return meta_data
-    
-    def _extract_text_content(self, soup: BeautifulSoup) -> str:
-        """Matn kontent ni olish"""
-        # Script va style taglarini olib tashlash
-        for script in soup(["script", "style"]):
-            script.decompose()
+        response = await self.engine.fetch(
+            url,
+            headers=headers,
+            max_bytes=self.max_bytes,
+            content_types=HTML_CONTENT_TYPES,
+            open_feed=open_feed,
+        )
+        feeder = feeders[-1] if feeders else self.parser.feeder()
         
-        # Text ni olish
-        text = soup.get_text()
+        if entry and response.status == 304:
+            logger.info(f"♻️ Not modified, using cached page: {url}")
+            await loop.run_in_executor(None, self.cache.refresh, entry, response.headers)
+            return await self._from_cache_payload(url, entry.payload)
         
-        # Tozalash
-        lines = (line.strip() for line in text.splitlines())
-        chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
-        text = ' '.join(chunk for chunk in chunks if chunk)
+        # Parsing CPU ishi - event loop ni bloklamaslik uchun executor da
+        website_data, page, decision, build = await loop.run_in_executor(
+            None, self._parse, url, feeder, len(response.content)
+        )
         
-        return text
-    
-    def _extract_links(self, soup: BeautifulSoup, base_url: str) -> List[Dict[str, str]]:
-        """Linklar ni olish"""
-        links = []
+        # Client-rendered shell (bo'sh #root, noscript, matn yo'q) - brauzerda qayta olish
+        if decision and decision.needs_browser:
+            rendered = await self._render(url)
+            if rendered:
+                self.adaptive.counters['escalated'] += 1
+                website_data, page = rendered
+            else:
+                # Render bo'lmadi - statik shell dan excerpt lar endi quriladi
+                website_data = await loop.run_in_executor(None, build)
+        elif decision:
+            self.adaptive.counters['static'] += 1
         
-        for link in soup.find_all('a', href=True):
-            href = link.get('href')
-            text = link.get_text().strip()
-            
-            if href:
-                # Absolute URL yasash
-                absolute_url = urljoin(base_url, href)
-                
-                links.append({
-                    'text': text,
-                    'href': href,
-                    'absolute_url': absolute_url,
-                    'is_external': not absolute_url.startswith(base_url.split('/')[0] + '//' + urlparse(base_url).netloc)
-                })
-        
-        return links
-    
-    def _extract_images(self, soup: BeautifulSoup, base_url: str) -> List[Dict[str, str]]:
-        """Rasmlar ni olish"""
-        images = []
-        
-        for img in soup.find_all('img'):
-            src = img.get('src')
-            alt = img.get('alt', '')
-            
-            if src:
-                # Absolute URL yasash
-                absolute_url = urljoin(base_url, src)
-                
-                images.append({
-                    'src': src,
-                    'absolute_url': absolute_url,
-                    'alt': alt,
-                    'width': img.get('width', ''),
-                    'height': img.get('height', '')
-                })
+        await self._collect_stylesheets(website_data, page)
+        await self._extract_design_tokens(website_data)
         
-        return images
+        if self.cache:
+            await loop.run_in_executor(
+                None, self.cache.put, url, response.headers, response.content, self._cache_payload(website_data)
+            )
+        return website_data
     
-    def _extract_styles(self, soup: BeautifulSoup, base_url: str) -> Dict[str, str]:
-        """CSS styles ni olish"""
-        styles = {}
-        
-        # Inline styles
-        style_tags = soup.find_all('style')
-        inline_css = ''
-        for style in style_tags:
-            inline_css += style.get_text() + '\n'
+    @staticmethod
+    def _cache_payload(website_data: WebsiteData) -> Dict:
+        """HTTP cache ga yoziladigan payload - parse qilingan CSS rule lar o'rniga stylesheet url / hash lari"""
+        payload = {name: getattr(website_data, name) for name in CACHE_PAYLOAD_KEYS if name != 'stylesheet_refs'}
+        payload['stylesheet_refs'] = StylesheetStage.refs(website_data.stylesheets)
+        return payload
+    
+    async def _from_cache_payload(self, url: str, payload: Dict) -> WebsiteData:
+        """Cache payload dan WebsiteData - stylesheet lar StylesheetStage cache idan tiklanadi"""
+        payload = dict(payload)
+        refs = payload.pop('stylesheet_refs')
+        website_data = WebsiteData(**{**payload, 'url': url})
+        if self.stylesheets:
+            website_data.stylesheets = await self.stylesheets.rehydrate(refs)
+        return website_data
+    
+    async def _collect_stylesheets(self, website_data: WebsiteData, page: PageExtract):
+        """Tashqi va inline CSS ni yuklab parse qilish"""
+        if self.stylesheets:
+            website_data.stylesheets = await self.stylesheets.collect(
+                website_data.styles.get('external', []), page.inline_css
+            )
+    
+    async def _extract_design_tokens(self, website_data: WebsiteData):
+        """Brauzerda olingan computed style lar bo'lmasa - CSS declaration lardan design token lar"""
+        if not website_data.design_tokens and website_data.stylesheets:
+            loop = asyncio.get_running_loop()
+            tokens = await loop.run_in_executor(None, tokens_from_stylesheets, website_data.stylesheets)
+            website_data.design_tokens = tokens.to_dict() if tokens else {}
+    
+    async def _render(self, url: str) -> Optional[Tuple[WebsiteData, PageExtract]]:
+        """Headless brauzerda render qilib parse qilish - xatolikda None (statik natija qoladi)"""
+        loop = asyncio.get_running_loop()
+        try:
+            final_url, html, harvest = await loop.run_in_executor(self.adaptive.executor, self.adaptive.render, url)
+        except Exception as e:
+            self.adaptive.counters['fallback'] += 1
+            logger.warning(f"⚠️ Browser render failed, using static HTML: {str(e)}")
+            return None
+        return await loop.run_in_executor(None, self._parse_rendered, url, final_url, html, harvest)
+    
+    def _parse(self, url: str, feeder, html_bytes: int = 0) -> Tuple[
+            Optional[WebsiteData], PageExtract, Optional[RenderDecision], Callable[[], WebsiteData]]:
+        """Document ni parse qilib WebsiteData yaratish (va render qarori)
         
-        if inline_css.strip():
-            styles['inline'] = inline_css[:5000]  # Limit size
+        Brauzerga yuboriladigan shell uchun WebsiteData qurilmaydi (None) - render
+        muvaffaqiyatsiz bo'lsa build() chaqiriladi.
+        """
+        doc = feeder.close()
         
-        # External stylesheets
-        link_tags = soup.find_all('link', rel='stylesheet')
-        external_css = []
+        # Title, meta, links, images, styles, text, fingerprint, skelet statistikasi
+        # va shell signal lari - bitta aylanishda
+        extractor = PageExtractor(url)
+        fingerprint = ContentFingerprint(url)
+        skeleton = SkeletonCollector()
+        visitors = [extractor, fingerprint, skeleton]
+        signals = None
+        if self.adaptive.enabled:
+            signals = ShellSignalCollector(html_bytes)
+            visitors.append(signals)
+        visit_document(doc, visitors)
         
-        for link in link_tags:
-            href = link.get('href')
-            if href:
-                absolute_url = urljoin(base_url, href)
-                external_css.append(absolute_url)
+        page = extractor.result()
+        decision = self.adaptive.decide(url, signals.signals) if signals else None
+        build = partial(self._build_website_data, url, doc, page, fingerprint.hexdigest(), skeleton)
+        if decision and decision.needs_browser:
+            return None, page, decision, build
+        return build(), page, decision, build
+    
+    def _parse_rendered(self, url: str, final_url: str, html: bytes,
+                        harvest: Optional[StyleHarvest] = None) -> Tuple[WebsiteData, PageExtract]:
+        """Brauzer render qilgan DOM (va computed style lar) dan WebsiteData"""
+        doc = self.parser.parse(html, encoding='utf-8')
+        extractor = PageExtractor(final_url)
+        fingerprint = ContentFingerprint(url)
+        skeleton = SkeletonCollector()
+        visit_document(doc, [extractor, fingerprint, skeleton])
+        page = extractor.result()
+        website_data = self._build_website_data(url, doc, page, fingerprint.hexdigest(), skeleton)
+        website_data.render_mode = 'browser'
+        tokens = tokens_from_harvest(harvest)
+        if tokens:
+            website_data.design_tokens = tokens.to_dict()
+        return website_data, page
+    
+    def _build_website_data(self, url: str, doc: HTMLDocument, page: PageExtract,
+                            content_hash: str, skeleton: SkeletonCollector) -> WebsiteData:
+        """Extraction natijasidan WebsiteData yaratish (fingerprint va skelet statistikasi shu aylanishdan)"""
+        # Text content
+        text_content = self._clean_text(page.text)
         
-        styles['external'] = external_css[:10]  # Limit number
+        return WebsiteData(
+            url=url,
+            title=page.title.strip() if page.title is not None else 'Untitled',
+            html=excerpt_html(doc, self.html_excerpt_chars),  # Limit size
+            text_content=text_content[:10000],  # Limit size
+            links=page.links,  # LINK_LIMIT gacha
+            images=page.images,  # IMAGE_LIMIT gacha
+            styles=page.styles,
+            meta_data=page.meta_data,
+            internal_links=page.internal_links,
+            # Prompt uchun: head, landmark lar va birinchi bo'limlar
+            html_outline=structured_excerpt(doc, self.outline_chars, self.outline_sections),
+            # Prompt uchun ixcham tuzilma skeleti (landmark, heading, class lar)
+            dom_skeleton=distill_dom(doc, self.skeleton_tokens, collector=skeleton),
+            # Analysis store kaliti - URL emas, normalizatsiya qilingan kontent
+            content_hash=content_hash
+        )
+    
+    def _clean_text(self, text: str) -> str:
+        """Matn kontent ni tozalash"""
+        lines = (line.strip() for line in text.splitlines())
+        chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
+        text = ' '.join(chunk for chunk in chunks if chunk)
         
-        return styles
+        return text
 
 class AIComponentGenerator:
     """AI bilan React komponent yaratish"""
@@ -316,6 +407,12 @@ class AIComponentGenerator:
                 if start_idx != -1 and end_idx != -1 and end_idx > start_idx:
                     json_content = cleaned_response[start_idx:end_idx+1]
                     result = json.loads(json_content)
+                    if website_data.design_tokens:
+                        # Hisoblangan token lar LLM taxminidan ustun
+                        llm_design = result.get('designSystem')
+                        result['designSystem'] = design_system(
+                            website_data.design_tokens, llm_design if isinstance(llm_design, dict) else {}
+                        )
                     result['ai_provider'] = 'groq'
                     result['timestamp'] = int(time.time())
                     logger.info("✅ AI JSON successfully parsed")
@@ -414,8 +511,8 @@ Analyze this website data and provide a comprehensive analysis for React compone
 URL: {website_data.url}
 Title: {website_data.title}
 
-HTML Structure (excerpt):
-{website_data.html[:3000]}
+Page Structure (skeleton - tags with #id/.class, ×N = repeated siblings):
+{website_data.dom_skeleton or website_data.html_outline or website_data.html[:3000]}
 
 Text Content:
 {website_data.text_content[:1000]}
@@ -428,13 +525,24 @@ Links ({len(website_data.links)} total):
 
 Images ({len(website_data.images)} total):
 {json.dumps(website_data.images[:5], indent=2)}
-
+{self._design_tokens_section(website_data)}
 Please analyze and return a JSON response with:
 1. Website structure analysis
 2. Component identification
 3. Design system elements
 4. Recommended React components
 5. Styling approach
+"""
+    
+    def _design_tokens_section(self, website_data: WebsiteData) -> str:
+        """Prompt uchun hisoblangan design token lar (palette ni LLM taxmin qilmasligi uchun)"""
+        measured = design_system(website_data.design_tokens, base={})
+        if not measured:
+            return ''
+        source = 'rendered computed styles' if website_data.design_tokens.get('source') == 'computed' else 'CSS declarations'
+        return f"""
+Design Tokens (measured from {source} - use these exact values for designSystem):
+{json.dumps(measured, separators=(',', ':'))}
 """
     
     def _create_generation_prompt(self, analysis: Dict) -> str:
@@ -521,11 +629,7 @@ Always return valid JSON responses.
                     "description": "Website footer"
                 }
             ],
-            "designSystem": {
-                "colors": {"primary": "#3B82F6", "secondary": "#64748B"},
-                "typography": {"fontFamily": "Inter, sans-serif"},
-                "spacing": {"unit": "8px"}
-            },
+            "designSystem": design_system(website_data.design_tokens),
             "timestamp": int(time.time())
         }
     
@@ -607,8 +711,46 @@ export const MainContent: React.FC<MainContentProps> = ({ children }) => {
 };'''
 
 # Initialize services
-scraper = AdvancedWebScraper()
+# Headless brauzer faqat client-rendered shell sahifalar uchun (Chrome birinchi kerak bo'lganda ishga tushadi)
+adaptive_renderer = AdaptiveRenderer(
+    BrowserRenderer(BrowserPool(create_chrome_driver))
+    if os.getenv('RENDER_ESCALATION', 'true').lower() == 'true' else None
+)
+scraper = AdvancedWebScraper(
+    cache=HTTPCache() if os.getenv('HTTP_CACHE_ENABLED', 'true').lower() == 'true' else None,
+    adaptive=adaptive_renderer,
+)
 ai_generator = AIComponentGenerator(groq_client)
+analysis_store = AnalysisStore() if os.getenv('ANALYSIS_STORE_ENABLED', 'true').lower() == 'true' else None
+batch_pipeline = BatchPipeline(scraper, ai_generator, analysis_store=analysis_store)
+
+BATCH_MAX_URLS = int(os.getenv('BATCH_MAX_URLS', 500))
+CRAWL_MAX_PAGES = int(os.getenv('CRAWL_MAX_PAGES', 50))
+CRAWL_MAX_DEPTH = int(os.getenv('CRAWL_MAX_DEPTH', 2))
+
+def int_param(data: Dict, name: str, default: int, minimum: int, maximum: int) -> int:
+    """So'rovdagi butun son - maximum ga cheklanadi; son bo'lmasa yoki minimum dan kichik bo'lsa ValueError"""
+    value = data.get(name, default)
+    if isinstance(value, bool) or (isinstance(value, float) and not value.is_integer()):
+        raise ValueError(f'{name} must be an integer')
+    try:
+        number = int(value)
+    except (TypeError, ValueError):
+        raise ValueError(f'{name} must be an integer')
+    if number < minimum:
+        raise ValueError(f'{name} must be at least {minimum}')
+    return min(number, maximum)
+
+def bool_param(data: Dict, name: str, default: Optional[bool] = None) -> Optional[bool]:
+    """So'rovdagi boolean - true/false, 1/0 yoki "true"/"false" satrlari; boshqasida ValueError"""
+    value = data.get(name, default)
+    if value is None or isinstance(value, bool):
+        return value
+    if isinstance(value, int) and value in (0, 1):
+        return bool(value)
+    if isinstance(value, str) and value.strip().lower() in ('true', 'false', '1', '0', 'yes', 'no'):
+        return value.strip().lower() in ('true', '1', 'yes')
+    raise ValueError(f'{name} must be a boolean')
 
 # API Routes
 @app.route('/health', methods=['GET'])
@@ -622,6 +764,15 @@ def health_check():
         'version': '2.0.0'
     })
 
+@app.route('/api/pool-stats', methods=['GET'])
+def pool_stats():
+    """HTTP connection pool va adaptive render statistikasi"""
+    return jsonify({
+        'pool': get_http_pool().snapshot(),
+        'render': adaptive_renderer.stats(),
+        'timestamp': int(time.time())
+    })
+
 @app.route('/api/analyze-website', methods=['POST'])
 @limiter.limit("10 per minute")
 def analyze_website():
@@ -639,31 +790,30 @@ def analyze_website():
         website_data = scraper.scrape_website(url)
         logger.info("✅ Website scraping completed")
         
-        # 2. AI analysis
-        analysis = ai_generator.analyze_website(website_data)
-        logger.info("✅ AI analysis completed")
-        
-        # 3. Component generation
-        components = ai_generator.generate_components(analysis)
-        logger.info("✅ Component generation completed")
+        # Bir xil kontent avval tahlil qilingan bo'lsa - AI bosqichlari o'tkazib yuboriladi
+        stored = analysis_store.get(website_data.content_hash) if analysis_store else None
+        if stored:
+            logger.info(f"🧬 Same content already analyzed ({stored['url']}), returning stored result")
+            analysis = stored['analysis']
+            components = stored['components']
+        else:
+            # 2. AI analysis
+            analysis = ai_generator.analyze_website(website_data)
+            logger.info("✅ AI analysis completed")
+            
+            # 3. Component generation
+            components = [asdict(comp) for comp in ai_generator.generate_components(analysis)]
+            logger.info("✅ Component generation completed")
+            
+            if analysis_store:
+                analysis_store.put(website_data.content_hash, url, analysis, components)
         
         # 4. Response yaratish
         result = {
             'success': True,
             'url': url,
             'analysis': analysis,
-            'components': [
-                {
-                    'name': comp.name,
-                    'type': comp.type,
-                    'tsx_code': comp.tsx_code,
-                    'css_code': comp.css_code,
-                    'props': comp.props,
-                    'dependencies': comp.dependencies,
-                    'description': comp.description
-                }
-                for comp in components
-            ],
+            'components': components,
             'website_data': {
                 'title': website_data.title,
                 'meta_data': website_data.meta_data,
@@ -673,7 +823,9 @@ def analyze_website():
             'stats': {
                 'total_components': len(components),
                 'processing_time': time.time(),
-                'ai_provider': analysis.get('ai_provider', 'unknown')
+                'ai_provider': analysis.get('ai_provider', 'unknown'),
+                'content_hash': website_data.content_hash,
+                'from_store': stored is not None
             },
             'timestamp': int(time.time())
         }
@@ -694,13 +846,17 @@ def analyze_website():
 def scrape_content():
     """Website content ni olish"""
     try:
-        data = request.get_json()
+        data = request.get_json(silent=True) or {}
         url = data.get('url')
         
         if not url:
             return jsonify({'error': 'URL is required'}), 400
+        try:
+            probe_images = bool_param(data, 'probe_images')
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
         
-        website_data = scraper.scrape_website(url)
+        website_data = scraper.scrape_website(url, probe_images=probe_images)
         
         return jsonify({
             'success': True,
@@ -710,6 +866,7 @@ def scrape_content():
             'meta_data': website_data.meta_data,
             'links': website_data.links[:10],  # Limit for API
             'images': website_data.images[:10],  # Limit for API
+            'design_tokens': website_data.design_tokens,
             'timestamp': int(time.time())
         })
         
@@ -758,6 +915,93 @@ def generate_components():
             'error': str(e)
         }), 500
 
+@app.route('/api/analyze-batch', methods=['POST'])
+@limiter.limit("2 per minute")
+def analyze_batch():
+    """Ko'p website ni birdaniga analiz qilish - NDJSON stream"""
+    data = request.get_json(silent=True) or {}
+    urls = data.get('urls')
+    
+    if not urls or not isinstance(urls, list):
+        return jsonify({'error': 'urls list is required'}), 400
+    
+    urls = [url.strip() for url in urls if isinstance(url, str) and url.strip()]
+    if len(urls) > BATCH_MAX_URLS:
+        return jsonify({'error': f'Too many URLs (max {BATCH_MAX_URLS})'}), 400
+    
+    logger.info(f"📦 Starting batch analysis: {len(urls)} URLs")
+    
+    def generate():
+        started = time.time()
+        succeeded = 0
+        for result in batch_pipeline.run(urls):
+            succeeded += result['success']
+            yield json.dumps(result) + '\n'
+        
+        logger.info(f"🎉 Batch completed: {succeeded}/{len(urls)} succeeded")
+        yield json.dumps({
+            'done': True,
+            'total': len(urls),
+            'succeeded': succeeded,
+            'failed': len(urls) - succeeded,
+            'processing_time': round(time.time() - started, 3),
+            'timestamp': int(time.time())
+        }) + '\n'
+    
+    return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+
+@app.route('/api/crawl', methods=['POST'])
+@limiter.limit("5 per minute")
+def crawl_site():
+    """Website ning ichki sahifalarini crawl qilish"""
+    try:
+        data = request.get_json(silent=True) or {}
+        url = data.get('url')
+        
+        if not url:
+            return jsonify({'error': 'URL is required'}), 400
+        try:
+            # Server sozlamasidagi chegaradan oshgan qiymatlar chegaraga tushiriladi
+            max_pages = int_param(data, 'max_pages', CRAWL_MAX_PAGES, 1, CRAWL_MAX_PAGES)
+            max_depth = int_param(data, 'max_depth', CRAWL_MAX_DEPTH, 0, CRAWL_MAX_DEPTH)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        
+        crawler = SiteCrawler(scraper, max_pages=max_pages, max_depth=max_depth)
+        result = crawler.crawl(url)
+        
+        return jsonify({
+            'success': True,
+            'url': result.start_url,
+            'pages': [
+                {
+                    'url': page.url,
+                    'depth': page.depth,
+                    'success': page.error is None,
+                    'error': page.error,
+                    'title': page.website_data.title if page.website_data else None,
+                    'meta_data': page.website_data.meta_data if page.website_data else {},
+                    'text_content': page.website_data.text_content[:500] if page.website_data else '',
+                    'links_count': len(page.website_data.internal_links) if page.website_data else 0,
+                    'images_count': len(page.website_data.images) if page.website_data else 0
+                }
+                for page in result.pages
+            ],
+            'stats': {
+                'pages_crawled': len(result.pages),
+                'pages_discovered': result.discovered,
+                'processing_time': round(result.elapsed, 3)
+            },
+            'timestamp': int(time.time())
+        })
+        
+    except Exception as e:
+        logger.error(f"❌ Crawl failed: {str(e)}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
 @app.route('/api/providers', methods=['GET'])
 def get_providers():
     """Available AI providers"""
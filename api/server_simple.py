@@ -8,9 +8,16 @@ import os
 import time
 from dotenv import load_dotenv
 
+from http_pool import get_http_pool
+from html_parsers import SoupDocument
+from html_excerpt import excerpt_html
+
 # Load environment variables
 load_dotenv()
 
+# Umumiy connection pool (keep-alive, DNS cache)
+http_pool = get_http_pool()
+
 app = Flask(__name__)
 
 # CORS configuration
@@ -70,16 +77,16 @@ def fetch_website_content():
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
             'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
             'Accept-Language': 'en-US,en;q=0.5',
-            'Accept-Encoding': 'gzip, deflate',
             'Connection': 'keep-alive',
         }
         
         timeout = int(os.getenv('API_TIMEOUT', 30))
-        response = requests.get(url, headers=headers, timeout=timeout)
-        response.raise_for_status()
+        max_bytes = int(os.getenv('FETCH_MAX_DECODED_BYTES', 50 * 1024 * 1024))
+        # br/zstd/gzip body streaming decode qilinadi (decode limiti bilan)
+        response, body, transfer = http_pool.get_decoded(url, max_bytes, headers=headers, timeout=timeout)
         
         # HTML content ni olish
-        soup = BeautifulSoup(response.content, 'html.parser')
+        soup = BeautifulSoup(body, 'html.parser')
         
         # Script va style taglarni olib tashlash
         for script in soup(["script", "style", "noscript"]):
@@ -87,7 +94,8 @@ def fetch_website_content():
         
         # Clean text content
         content = soup.get_text(separator=' ', strip=True)
-        html = str(soup.prettify())
+        # Faqat 10000 belgigacha serialize qilinadi (butun document emas)
+        html = excerpt_html(SoupDocument(soup, 'html.parser'), 10000)
         
         # Meta ma'lumotlarni olish
         title = soup.find('title')
@@ -125,13 +133,14 @@ def fetch_website_content():
         
         return jsonify({
             'content': content[:5000],  # Limit content size
-            'html': html[:10000],       # Limit HTML size
+            'html': html,               # 10000 belgigacha excerpt
             'title': title_text,
             'description': description_text,
             'keywords': keywords_text,
             'favicon': favicon_url,
             'language': language,
             'og_data': og_data,
+            'transfer': transfer.to_dict(),
             'url': url,
             'timestamp': int(time.time()),
             'success': True
@@ -151,6 +160,8 @@ def fetch_website_content():
             'success': False
         }), 500
 
+MOCK_SCREENSHOT = "data:image/png;base64,iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAYAAAAfFcSJAAAADUlEQVR42mNkYPhfDwAChwGA60e6kgAAAABJRU5ErkJggg=="
+
 @app.route('/api/screenshot', methods=['POST'])
 def capture_screenshot():
     """Website screenshot olish (mock implementation)"""
@@ -176,10 +187,8 @@ def capture_screenshot():
         
         # Since this is a mock implementation, we'll return a placeholder
         # In production, you would use Playwright or Puppeteer
-        mock_screenshot = "data:image/png;base64,iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAYAAAAfFcSJAAAADUlEQVR42mNkYPhfDwAChwGA60e6kgAAAABJRU5ErkJggg=="
-        
         return jsonify({
-            'screenshot': mock_screenshot,
+            'screenshot': MOCK_SCREENSHOT,
             'url': url,
             'timestamp': int(time.time()),
             'success': True,
@@ -193,6 +202,25 @@ def capture_screenshot():
             'success': False
         }), 500
 
+@app.route('/api/capture', methods=['POST'])
+def capture_website():
+    """Screenshot + content bitta so'rovda (mock: content statik fetch dan, screenshot placeholder)"""
+    result = fetch_website_content()
+    if isinstance(result, tuple):
+        # Xatolik javobi (status code bilan)
+        return result
+    
+    payload = result.get_json()
+    payload.update({
+        'screenshot': MOCK_SCREENSHOT,
+        'source': 'static',
+        'message': 'Mock capture (in production, content comes from the rendered DOM)'
+    })
+    if (request.get_json() or {}).get('styles'):
+        # Computed style lar faqat brauzer capture da bor
+        payload['styles'] = None
+    return jsonify(payload)
+
 @app.route('/api/ai-analyze', methods=['POST'])
 def ai_analyze_website():
     """AI analiz - hozircha mock data"""
@@ -711,6 +739,14 @@ def health_check():
         'version': '1.0.0'
     })
 
+@app.route('/api/pool-stats', methods=['GET'])
+def pool_stats():
+    """HTTP connection pool statistikasi"""
+    return jsonify({
+        'pool': get_http_pool().snapshot(),
+        'timestamp': int(time.time())
+    })
+
 @app.route('/', methods=['GET'])
 def home():
     """API home page"""
@@ -722,7 +758,8 @@ def home():
             '/api/fetch-content',
             '/api/ai-analyze', 
             '/api/generate-components',
-            '/api/providers'
+            '/api/providers',
+            '/api/pool-stats'
         ],
         'status': 'running'
     })
@@ -0,0 +1,153 @@
+"""
+🕷️ Multi-page Site Crawler
+Ichki linklar bo'ylab bir nechta sahifani scrape qilish
+
+- Takrorlanmas frontier: kalit - canonical URL, scheme va www siz (Origin.same_site qoidalari);
+  yuklashda esa topilgan link o'zi ishlatiladi
+- Depth va sahifa soni limiti
+- Host bo'yicha politeness delay
+- Parallel fetch (scraper ning fetch engine i orqali)
+"""
+
+import asyncio
+import logging
+import os
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+from urllib.parse import urlparse
+
+from url_normalize import UrlResolver, canonicalize_url, parse_origin
+
+logger = logging.getLogger(__name__)
+
+# Sahifa bo'lmagan resurslar - frontier ga qo'shilmaydi
+SKIP_EXTENSIONS = (
+    '.pdf', '.zip', '.gz', '.rar', '.7z', '.exe', '.dmg', '.jpg', '.jpeg', '.png',
+    '.gif', '.webp', '.svg', '.ico', '.mp3', '.mp4', '.webm', '.avi', '.mov',
+    '.css', '.js', '.json', '.xml', '.rss', '.woff', '.woff2', '.ttf',
+)
+
+
+def _frontier_key(url: str) -> str:
+    """Bitta sahifa variantlari (http / https, www / apex, tracking parametrlar, fragment) - bitta kalit"""
+    canonical = canonicalize_url(url)
+    origin = parse_origin(canonical)
+    if origin is None:
+        return canonical
+    host = origin.site if origin.has_default_port else f'{origin.site}:{origin.port}'
+    return f'//{host}/' + canonical.partition('://')[2].partition('/')[2]
+
+
+@dataclass
+class CrawledPage:
+    """Crawl qilingan sahifa"""
+    url: str
+    depth: int
+    website_data: object = None
+    error: Optional[str] = None
+    fetched_at: float = field(default_factory=time.time)
+
+
+@dataclass
+class CrawlResult:
+    """Crawl natijasi"""
+    start_url: str
+    pages: List[CrawledPage]
+    discovered: int
+    elapsed: float
+
+
+class SiteCrawler:
+    """Scraper ustidagi BFS crawler"""
+
+    def __init__(
+        self,
+        scraper,
+        max_pages: Optional[int] = None,
+        max_depth: Optional[int] = None,
+        concurrency: Optional[int] = None,
+        politeness_delay: Optional[float] = None,
+    ):
+        self.scraper = scraper
+        self.max_pages = max_pages or int(os.getenv('CRAWL_MAX_PAGES', 50))
+        self.max_depth = max_depth if max_depth is not None else int(os.getenv('CRAWL_MAX_DEPTH', 2))
+        self.concurrency = concurrency or int(os.getenv('CRAWL_CONCURRENCY', 8))
+        self.politeness_delay = (
+            politeness_delay if politeness_delay is not None
+            else float(os.getenv('CRAWL_POLITENESS_DELAY', 0.25))
+        )
+
+    def crawl(self, start_url: str) -> CrawlResult:
+        """Sync wrapper"""
+        return self.scraper.engine.run(self.crawl_async(start_url))
+
+    async def crawl_async(self, start_url: str) -> CrawlResult:
+        """start_url dan boshlab ichki sahifalarni crawl qilish"""
+        if not start_url.startswith(('http://', 'https://')):
+            start_url = 'https://' + start_url
+        # Scope - start sahifa bilan bir xil sayt (www / apex, http / https)
+        scope = UrlResolver(start_url)
+
+        started = time.time()
+        queue: 'asyncio.Queue' = asyncio.Queue()
+        # http / https va www / apex variantlari bitta sahifa hisoblanadi
+        seen = {_frontier_key(start_url)}
+        pages: List[CrawledPage] = []
+        host_next_slot: Dict[str, float] = {}
+        host_locks: Dict[str, asyncio.Lock] = {}
+
+        queue.put_nowait((start_url, 0))
+        logger.info(f"🕷️ Crawling {start_url} (max_pages={self.max_pages}, max_depth={self.max_depth})")
+
+        async def wait_politely(url: str):
+            # Bir host ga so'rovlar orasida kamida politeness_delay
+            host = urlparse(url).netloc
+            lock = host_locks.setdefault(host, asyncio.Lock())
+            async with lock:
+                now = time.monotonic()
+                slot = max(now, host_next_slot.get(host, now))
+                host_next_slot[host] = slot + self.politeness_delay
+            if slot > now:
+                await asyncio.sleep(slot - now)
+
+        def enqueue(links: List[str], depth: int):
+            for link in links:
+                if len(seen) >= self.max_pages:
+                    return
+                if not scope.is_internal(link):
+                    continue
+                if urlparse(link).path.lower().endswith(SKIP_EXTENSIONS):
+                    continue
+                # Canonical ko'rinish faqat takrorni aniqlash uchun - sahifa topilgan link bo'yicha yuklanadi
+                key = _frontier_key(link)
+                if key in seen:
+                    continue
+                seen.add(key)
+                queue.put_nowait((link, depth))
+
+        async def worker():
+            while True:
+                url, depth = await queue.get()
+                try:
+                    await wait_politely(url)
+                    website_data = await self.scraper.scrape_website_async(url)
+                    pages.append(CrawledPage(url=url, depth=depth, website_data=website_data))
+                    if depth < self.max_depth:
+                        enqueue(website_data.internal_links, depth + 1)
+                except Exception as e:
+                    pages.append(CrawledPage(url=url, depth=depth, error=str(e)))
+                finally:
+                    queue.task_done()
+
+        workers = [asyncio.ensure_future(worker()) for _ in range(self.concurrency)]
+        try:
+            await queue.join()
+        finally:
+            for task in workers:
+                task.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+
+        elapsed = time.time() - started
+        logger.info(f"✅ Crawl completed: {len(pages)} pages in {elapsed:.1f}s")
+        return CrawlResult(start_url=start_url, pages=pages, discovered=len(seen), elapsed=elapsed)
@@ -0,0 +1,182 @@
+"""
+🎨 Computed Style Harvest
+Render qilingan sahifadagi ko'rinadigan elementlarning computed style lari - bitta WebDriver so'rovida
+
+Har element uchun find_element / value_of_css_property chaqirish o'rniga brauzer ichida
+bitta skript ishlaydi va natija ustunli (columnar) massivlar ko'rinishida qaytadi:
+- box        - x, y, w, h (document koordinatalari)
+- color      - color, background, border_color (colors jadvalidagi indeks, -1 = transparent)
+- typography - font (fonts jadvalidagi indeks), font_size, font_weight, line_height, text (to'g'ridan-to'g'ri matn uzunligi)
+- spacing    - margin_*, padding_*, gap, radius, border_width
+Takrorlanuvchi qiymatlar (tag, rang, font stack) jadvalga bir marta yoziladi.
+"""
+
+import logging
+import os
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Brauzer ichida ishlaydigan harvest skripti (execute_script)
+HARVEST_SCRIPT = """
+const maxElements = arguments[0], minArea = arguments[1];
+const start = performance.now();
+const SKIP = new Set(['SCRIPT', 'STYLE', 'NOSCRIPT', 'TEMPLATE', 'LINK', 'META', 'BR', 'WBR', 'SOURCE', 'TRACK']);
+const NUMERIC = ['x', 'y', 'w', 'h', 'color', 'background', 'border_color', 'border_width', 'radius',
+  'font', 'font_size', 'font_weight', 'line_height', 'text',
+  'margin_top', 'margin_right', 'margin_bottom', 'margin_left',
+  'padding_top', 'padding_right', 'padding_bottom', 'padding_left', 'gap'];
+const columns = {tag: []};
+NUMERIC.forEach(name => { columns[name] = []; });
+const tables = {tags: [], colors: [], fonts: []};
+const lookup = {tags: new Map(), colors: new Map(), fonts: new Map()};
+
+function intern(table, value) {
+  let index = lookup[table].get(value);
+  if (index === undefined) {
+    index = tables[table].length;
+    tables[table].push(value);
+    lookup[table].set(value, index);
+  }
+  return index;
+}
+
+function hex(n) { return Math.round(n).toString(16).padStart(2, '0'); }
+
+// rgb(a) -> #rrggbb / #rrggbbaa, to'liq shaffof -> -1
+function color(value) {
+  const m = /^rgba?\\(([\\d.]+),\\s*([\\d.]+),\\s*([\\d.]+)(?:,\\s*([\\d.]+))?\\)$/.exec(value);
+  if (!m) return value && value !== 'transparent' ? intern('colors', value) : -1;
+  const alpha = m[4] === undefined ? 1 : parseFloat(m[4]);
+  if (alpha === 0) return -1;
+  return intern('colors', '#' + hex(m[1]) + hex(m[2]) + hex(m[3]) + (alpha < 1 ? hex(alpha * 255) : ''));
+}
+
+function px(value) { const n = parseFloat(value); return isNaN(n) ? 0 : Math.round(n * 10) / 10; }
+
+const scrollX = window.scrollX, scrollY = window.scrollY;
+const elements = document.body ? document.body.getElementsByTagName('*') : [];
+let scanned = 0, count = 0, truncated = false;
+for (const el of elements) {
+  if (SKIP.has(el.tagName)) continue;
+  scanned++;
+  const rect = el.getBoundingClientRect();
+  if (rect.width * rect.height < minArea) continue;
+  if (el.checkVisibility && !el.checkVisibility({checkOpacity: true, checkVisibilityCSS: true})) continue;
+  const style = getComputedStyle(el);
+  if (style.display === 'none' || style.visibility === 'hidden' || style.opacity === '0') continue;
+  if (count >= maxElements) { truncated = true; break; }
+
+  let text = 0;
+  for (const node of el.childNodes) {
+    if (node.nodeType === 3) text += node.textContent.trim().length;
+  }
+  const fontSize = px(style.fontSize);
+  const borderWidth = px(style.borderTopWidth);
+
+  columns.tag.push(intern('tags', el.tagName.toLowerCase()));
+  columns.x.push(Math.round(rect.left + scrollX));
+  columns.y.push(Math.round(rect.top + scrollY));
+  columns.w.push(Math.round(rect.width));
+  columns.h.push(Math.round(rect.height));
+  columns.color.push(color(style.color));
+  columns.background.push(color(style.backgroundColor));
+  columns.border_color.push(borderWidth > 0 && style.borderTopStyle !== 'none' ? color(style.borderTopColor) : -1);
+  columns.border_width.push(style.borderTopStyle !== 'none' ? borderWidth : 0);
+  columns.radius.push(px(style.borderTopLeftRadius));
+  columns.font.push(intern('fonts', style.fontFamily));
+  columns.font_size.push(fontSize);
+  columns.font_weight.push(parseInt(style.fontWeight, 10) || 400);
+  columns.line_height.push(style.lineHeight === 'normal' ? Math.round(fontSize * 12) / 10 : px(style.lineHeight));
+  columns.text.push(text);
+  columns.margin_top.push(px(style.marginTop));
+  columns.margin_right.push(px(style.marginRight));
+  columns.margin_bottom.push(px(style.marginBottom));
+  columns.margin_left.push(px(style.marginLeft));
+  columns.padding_top.push(px(style.paddingTop));
+  columns.padding_right.push(px(style.paddingRight));
+  columns.padding_bottom.push(px(style.paddingBottom));
+  columns.padding_left.push(px(style.paddingLeft));
+  columns.gap.push(px(style.rowGap));
+  count++;
+}
+
+return {
+  columns: columns,
+  tables: tables,
+  count: count,
+  scanned: scanned,
+  truncated: truncated,
+  viewport: {
+    width: window.innerWidth,
+    height: window.innerHeight,
+    scroll_height: document.documentElement.scrollHeight
+  },
+  elapsed_ms: Math.round(performance.now() - start)
+};
+"""
+
+# Jadval indeksi saqlanadigan ustunlar -> jadval nomi
+TABLE_COLUMNS = {
+    'tag': 'tags',
+    'color': 'colors',
+    'background': 'colors',
+    'border_color': 'colors',
+    'font': 'fonts',
+}
+MIN_ELEMENT_AREA = 1
+
+
+@dataclass
+class StyleHarvest:
+    """Ko'rinadigan elementlarning computed style lari (ustunli)"""
+    columns: Dict[str, List] = field(default_factory=dict)
+    tables: Dict[str, List[str]] = field(default_factory=dict)
+    count: int = 0
+    scanned: int = 0
+    truncated: bool = False
+    viewport: Dict[str, int] = field(default_factory=dict)
+    elapsed_ms: int = 0
+
+    def column(self, name: str) -> List:
+        return self.columns.get(name, [])
+
+    def decode(self, name: str) -> List[Optional[str]]:
+        """Indeksli ustun -> qiymatlar (-1 -> None)"""
+        table = self.tables.get(TABLE_COLUMNS[name], [])
+        return [table[index] if 0 <= index < len(table) else None for index in self.column(name)]
+
+    def to_dict(self):
+        return {
+            'columns': self.columns,
+            'tables': self.tables,
+            'count': self.count,
+            'scanned': self.scanned,
+            'truncated': self.truncated,
+            'viewport': self.viewport,
+            'elapsed_ms': self.elapsed_ms,
+        }
+
+
+def harvest_styles(driver, max_elements: Optional[int] = None) -> Optional[StyleHarvest]:
+    """Yuklangan sahifadan computed style larni bitta execute_script bilan olish (xatolikda None)"""
+    max_elements = max_elements or int(os.getenv('STYLE_HARVEST_MAX_ELEMENTS', 3000))
+    try:
+        result = driver.execute_script(HARVEST_SCRIPT, max_elements, MIN_ELEMENT_AREA) or {}
+        harvest = StyleHarvest(
+            columns=result.get('columns') or {},
+            tables=result.get('tables') or {},
+            count=int(result.get('count', 0)),
+            scanned=int(result.get('scanned', 0)),
+            truncated=bool(result.get('truncated')),
+            viewport=result.get('viewport') or {},
+            elapsed_ms=int(result.get('elapsed_ms', 0)),
+        )
+    except Exception as e:
+        logger.warning(f"⚠️ Style harvest failed: {str(e)}")
+        return None
+    if any(len(values) != harvest.count for values in harvest.columns.values()):
+        logger.warning('⚠️ Style harvest returned columns of unequal length')
+        return None
+    return harvest
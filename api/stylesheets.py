@@ -0,0 +1,270 @@
+"""
+🎨 Stylesheet Stage
+Tashqi stylesheet larni parallel yuklash va CSS ni rule / declaration larga parse qilish
+
+- Fetch lar fetch engine orqali parallel
+- URL bo'yicha cache (TTL) - bir xil URL qayta yuklanmaydi
+- Content hash bo'yicha cache - bir xil CDN fayl (Bootstrap, Tailwind build)
+  qaysi sayt yoki URL dan kelishidan qat'i nazar faqat bir marta parse qilinadi
+"""
+
+import asyncio
+import hashlib
+import logging
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+from url_normalize import canonicalize_url
+
+logger = logging.getLogger(__name__)
+
+CSS_CONTENT_TYPES = ('text/css', 'text/plain', 'application/octet-stream')
+
+# Qavs ichida rule saqlaydigan at-rule lar
+GROUP_AT_RULES = ('@media', '@supports', '@layer', '@container', '@document', '@scope')
+# Ichi tahlil qilinmaydigan at-rule lar (faqat nomi yoziladi)
+SKIP_AT_RULES = ('@keyframes', '@-webkit-keyframes', '@-moz-keyframes', '@font-feature-values')
+
+_COMMENT_RE = re.compile(r'("(?:\\.|[^"\\])*"|\'(?:\\.|[^\'\\])*\')|/\*.*?(?:\*/|$)', re.S)
+_TOKEN_RE = re.compile(r'"(?:\\.|[^"\\])*"|\'(?:\\.|[^\'\\])*\'|[{};()]')
+
+
+def _strip_comments(css: str) -> str:
+    return _COMMENT_RE.sub(lambda m: m.group(1) or '', css)
+
+
+def _split_commas(text: str) -> List[str]:
+    """Qavs va string lardan tashqaridagi vergul bo'yicha bo'lish"""
+    parts, depth, start, quote = [], 0, 0, None
+    for i, char in enumerate(text):
+        if quote:
+            if char == quote and text[i - 1] != '\\':
+                quote = None
+        elif char in '"\'':
+            quote = char
+        elif char in '([':
+            depth += 1
+        elif char in ')]':
+            depth = max(depth - 1, 0)
+        elif char == ',' and depth == 0:
+            parts.append(text[start:i])
+            start = i + 1
+    parts.append(text[start:])
+    return parts
+
+
+def _parse_declaration(text: str) -> Optional[Dict]:
+    name, sep, value = text.partition(':')
+    name = name.strip()
+    value = value.strip()
+    if not sep or not name or not value:
+        return None
+    important = False
+    if value.lower().endswith('!important'):
+        important = True
+        value = value[:-len('!important')].rstrip()
+    return {'property': name.lower() if not name.startswith('--') else name, 'value': value, 'important': important}
+
+
+def _nest_selectors(parents: List[str], children: List[str]) -> List[str]:
+    """CSS nesting - child selector larni parent bilan birlashtirish"""
+    if not parents:
+        return children
+    nested = []
+    for parent in parents:
+        for child in children:
+            nested.append(child.replace('&', parent) if '&' in child else f'{parent} {child}')
+    return nested
+
+
+def parse_css(css: str, max_rules: int = 20000) -> Dict:
+    """CSS matnini rule va declaration larga ajratish.
+
+    Natija:
+    {
+      'rules': [{'selectors': [...], 'declarations': [{'property', 'value', 'important'}], 'media': str|None}],
+      'imports': [...],
+      'keyframes': [...],
+    }
+    """
+    css = _strip_comments(css)
+    rules: List[Dict] = []
+    imports: List[str] = []
+    keyframes: List[str] = []
+
+    # Kontekst: (kind, selectors, media, declarations)
+    # kind: 'group' (@media va top-level), 'rule' (selector yoki @font-face), 'skip' (@keyframes)
+    stack = [('group', [], None, None)]
+    boundary = 0
+    depth = 0
+
+    for match in _TOKEN_RE.finditer(css):
+        token = match.group()
+        if token == '(':
+            depth += 1
+            continue
+        if token == ')':
+            depth = max(depth - 1, 0)
+            continue
+        if token[0] in '"\'' or depth:
+            continue
+
+        kind, selectors, media, declarations = stack[-1]
+        position = match.start()
+        text = css[boundary:position].strip()
+        boundary = match.end()
+
+        if token == '{':
+            if kind == 'skip':
+                stack.append(('skip', selectors, media, None))
+            elif text.startswith(SKIP_AT_RULES):
+                keyframes.append(text.split(None, 1)[1] if ' ' in text else text)
+                stack.append(('skip', [], media, None))
+            elif text.startswith(GROUP_AT_RULES):
+                condition = text
+                if media and text.startswith('@media'):
+                    condition = f'{media} and {text[len("@media"):].strip()}'
+                elif media:
+                    condition = f'{media} {text}'
+                stack.append(('group', selectors, condition, None))
+            elif text.startswith('@'):
+                stack.append(('rule', [text], media, []))
+            else:
+                child = [s.strip() for s in _split_commas(text) if s.strip()]
+                stack.append(('rule', _nest_selectors(selectors, child), media, []))
+        elif token == ';':
+            if kind == 'rule':
+                declaration = _parse_declaration(text)
+                if declaration:
+                    declarations.append(declaration)
+            elif kind == 'group' and text.startswith('@import'):
+                imports.append(text[len('@import'):].strip())
+        elif token == '}':
+            if len(stack) == 1:
+                # Ortiqcha '}' - e'tiborsiz
+                continue
+            if kind == 'rule':
+                declaration = _parse_declaration(text)
+                if declaration:
+                    declarations.append(declaration)
+                if declarations and len(rules) < max_rules:
+                    rules.append({'selectors': selectors, 'declarations': declarations, 'media': media})
+            stack.pop()
+
+    return {'rules': rules, 'imports': imports, 'keyframes': keyframes}
+
+
+class _LRU:
+    """Oddiy thread-safe LRU"""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._data: 'OrderedDict' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            if key not in self._data:
+                return None
+            self._data.move_to_end(key)
+            return self._data[key]
+
+    def put(self, key, value):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def __len__(self):
+        return len(self._data)
+
+
+class StylesheetStage:
+    """Stylesheet larni parallel yuklab, parse qilib, cache lab beruvchi stage"""
+
+    def __init__(self, engine, ttl: Optional[float] = None, max_bytes: Optional[int] = None):
+        self.engine = engine
+        self.ttl = ttl if ttl is not None else float(os.getenv('STYLESHEET_CACHE_TTL', 3600))
+        self.max_bytes = max_bytes or int(os.getenv('STYLESHEET_MAX_BYTES', 2 * 1024 * 1024))
+        max_entries = int(os.getenv('STYLESHEET_CACHE_ENTRIES', 500))
+        self._by_url = _LRU(max_entries)     # url -> (content_hash, fetched_at)
+        self._by_hash = _LRU(max_entries)    # content_hash -> parsed
+        self.stats = {'fetched': 0, 'url_hits': 0, 'hash_hits': 0, 'parsed': 0, 'errors': 0}
+
+    async def collect(self, urls: List[str], inline_css: str = '') -> List[Dict]:
+        """Tashqi va inline CSS ni parse qilingan ko'rinishda qaytarish"""
+        results = await asyncio.gather(*(self._load(url) for url in urls))
+        stylesheets = [sheet for sheet in results if sheet is not None]
+        if inline_css.strip():
+            stylesheets.append(await self._parse(None, inline_css.encode('utf-8')))
+        return stylesheets
+
+    @staticmethod
+    def refs(stylesheets: List[Dict]) -> List[Dict]:
+        """Persist qilish uchun ixcham ko'rinish - parse qilingan rule lar o'rniga url + content hash"""
+        return [{'url': sheet['url'], 'content_hash': sheet['content_hash']} for sheet in stylesheets]
+
+    async def rehydrate(self, refs: List[Dict]) -> List[Dict]:
+        """refs() dan stylesheet larni tiklash: hash cache da bo'lsa o'sha, aks holda url dan qayta yuklash
+
+        Cache dan chiqib ketgan inline CSS tiklanmaydi (manba matni saqlanmaydi).
+        """
+        async def restore(ref: Dict) -> Optional[Dict]:
+            parsed = self._by_hash.get(ref.get('content_hash'))
+            if parsed is not None:
+                self.stats['hash_hits'] += 1
+                return self._sheet(ref.get('url'), ref['content_hash'], parsed)
+            return await self._load(ref['url']) if ref.get('url') else None
+
+        results = await asyncio.gather(*(restore(ref) for ref in refs))
+        return [sheet for sheet in results if sheet is not None]
+
+    async def _load(self, url: str) -> Optional[Dict]:
+        cached = self._by_url.get(canonicalize_url(url))
+        if cached and time.time() - cached[1] < self.ttl:
+            parsed = self._by_hash.get(cached[0])
+            if parsed is not None:
+                self.stats['url_hits'] += 1
+                return self._sheet(url, cached[0], parsed)
+
+        try:
+            response = await self.engine.fetch(url, max_bytes=self.max_bytes, content_types=CSS_CONTENT_TYPES)
+        except Exception as e:
+            self.stats['errors'] += 1
+            logger.warning(f"⚠️ Stylesheet fetch failed {url}: {str(e)}")
+            return None
+        self.stats['fetched'] += 1
+        return await self._parse(url, response.content)
+
+    async def _parse(self, url: Optional[str], content: bytes) -> Dict:
+        content_hash = hashlib.sha256(content).hexdigest()
+        parsed = self._by_hash.get(content_hash)
+        if parsed is not None:
+            self.stats['hash_hits'] += 1
+        else:
+            loop = asyncio.get_running_loop()
+            text = content.decode('utf-8', errors='replace')
+            parsed = await loop.run_in_executor(None, parse_css, text)
+            parsed['size'] = len(content)
+            self._by_hash.put(content_hash, parsed)
+            self.stats['parsed'] += 1
+        if url:
+            self._by_url.put(canonicalize_url(url), (content_hash, time.time()))
+        return self._sheet(url, content_hash, parsed)
+
+    @staticmethod
+    def _sheet(url: Optional[str], content_hash: str, parsed: Dict) -> Dict:
+        return {
+            'url': url,
+            'inline': url is None,
+            'content_hash': content_hash,
+            'size': parsed.get('size', 0),
+            'rules': parsed['rules'],
+            'imports': parsed['imports'],
+            'keyframes': parsed['keyframes'],
+        }
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# api/ modullari (flat script lar) test lardan import qilinadi
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
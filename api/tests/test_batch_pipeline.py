@@ -0,0 +1,85 @@
+"""
+BatchPipeline - natijalar oqimi, xatoliklar va LLM navbati chegarasi
+"""
+
+import asyncio
+import threading
+import time
+from types import SimpleNamespace
+
+from batch_pipeline import BatchPipeline
+from fetch_engine import AsyncFetchEngine
+
+
+class FakeScraper:
+    def __init__(self, engine):
+        self.engine = engine
+        self.lock = threading.Lock()
+        self.held = 0
+        self.peak_held = 0
+
+    async def scrape_website_async(self, url):
+        if 'bad' in url:
+            raise ValueError('scrape failed')
+        await asyncio.sleep(0.001)
+        with self.lock:
+            # Scrape qilingan, lekin hali analysis qilinmagan sahifalar
+            self.held += 1
+            self.peak_held = max(self.peak_held, self.held)
+        return SimpleNamespace(content_hash='', title=url, meta_data={}, links=[], images=[])
+
+
+class FakeGenerator:
+    def __init__(self, scraper):
+        self.scraper = scraper
+
+    def analyze_website(self, website_data):
+        time.sleep(0.02)
+        with self.scraper.lock:
+            self.scraper.held -= 1
+        return {'ai_provider': 'test'}
+
+    def generate_components(self, analysis):
+        return []
+
+
+def _pipeline(**kwargs):
+    engine = AsyncFetchEngine()
+    scraper = FakeScraper(engine)
+    return BatchPipeline(scraper, FakeGenerator(scraper), **kwargs), scraper, engine
+
+
+def test_results_and_errors_are_streamed():
+    pipeline, _, engine = _pipeline(scrape_concurrency=8, llm_concurrency=2)
+    try:
+        urls = [f'https://example.com/{index}' for index in range(6)] + ['https://bad.example.com/']
+        results = list(pipeline.run(urls))
+    finally:
+        engine.close()
+    assert sorted(result['index'] for result in results) == list(range(len(urls)))
+    failed = [result for result in results if not result['success']]
+    assert [(result['url'], result['stage']) for result in failed] == [('https://bad.example.com/', 'scrape')]
+
+
+def test_full_llm_queue_stops_new_scrapes():
+    pipeline, scraper, engine = _pipeline(scrape_concurrency=32, llm_concurrency=1, llm_queue_size=2)
+    try:
+        results = list(pipeline.run([f'https://example.com/{index}' for index in range(20)]))
+    finally:
+        engine.close()
+    assert len(results) == 20
+    assert scraper.peak_held <= 3
+
+
+def test_failed_batch_reports_every_pending_url():
+    pipeline, _, engine = _pipeline()
+
+    async def crash(*args):
+        raise RuntimeError('engine died')
+
+    pipeline._scrape_all = crash
+    try:
+        results = list(pipeline.run(['https://a.example.com/', 'https://b.example.com/']))
+    finally:
+        engine.close()
+    assert [(result['stage'], result['error']) for result in results] == [('batch', 'engine died')] * 2
@@ -0,0 +1,105 @@
+"""
+Content-Encoding streaming decode - limit bilan kesish va encoding lar
+"""
+
+import gzip
+import zlib
+
+import pytest
+
+import content_encoding
+from content_encoding import ContentDecodingError, StreamDecoder, UnsupportedEncodingError
+
+brotli = pytest.importorskip('brotli')
+zstandard = pytest.importorskip('zstandard')
+
+BODY = b'<p>hello world</p>' * 20000
+Decompressor = brotli.Decompressor
+
+
+class _LegacyDecompressor:
+    """brotli < 1.2.0: process() output_buffer_limit ni qabul qilmaydi"""
+
+    def __init__(self):
+        self._decoder = Decompressor()
+
+    def process(self, data):
+        return self._decoder.process(data)
+
+    def is_finished(self):
+        return self._decoder.is_finished()
+
+
+def test_brotli_without_output_buffer_limit(monkeypatch):
+    monkeypatch.setattr(content_encoding.brotli, 'Decompressor', _LegacyDecompressor)
+    monkeypatch.setattr(content_encoding._BrotliDecoder, 'bounded', True)
+    compressed = brotli.compress(BODY)
+
+    decoder = StreamDecoder('br', 1000)
+    assert decoder.feed(compressed) == BODY[:1000]
+    assert decoder.finished
+
+    decoder = StreamDecoder('br', len(BODY) * 2)
+    assert decoder.feed(compressed) == BODY
+    assert not decoder.finished
+
+
+def _raw_deflate(data):
+    compressor = zlib.compressobj(wbits=-zlib.MAX_WBITS)
+    return compressor.compress(data) + compressor.flush()
+
+
+ENCODERS = {
+    'identity': lambda data: data,
+    'gzip': gzip.compress,
+    'deflate': zlib.compress,
+    'br': brotli.compress,
+    'zstd': lambda data: zstandard.ZstdCompressor().compress(data),
+    'gzip, br': lambda data: brotli.compress(gzip.compress(data)),
+}
+
+
+def _feed_chunks(decoder, payload, size=4096):
+    return b''.join(decoder.feed(payload[i:i + size]) for i in range(0, len(payload), size))
+
+
+@pytest.mark.parametrize('encoding', sorted(ENCODERS))
+def test_decode_full_body(encoding):
+    payload = ENCODERS[encoding](BODY)
+    decoder = StreamDecoder(encoding, len(BODY) * 2)
+    assert _feed_chunks(decoder, payload) == BODY
+    assert not decoder.finished
+    assert decoder.metrics.wire_bytes == len(payload)
+    assert decoder.metrics.decoded_bytes == len(BODY)
+
+
+@pytest.mark.parametrize('encoding', sorted(ENCODERS))
+def test_decode_truncates_at_limit(encoding):
+    payload = ENCODERS[encoding](BODY)
+    decoder = StreamDecoder(encoding, 1000)
+    output = _feed_chunks(decoder, payload)
+    assert output == BODY[:1000]
+    assert decoder.finished
+    assert decoder.metrics.truncated
+    assert decoder.metrics.decoded_bytes == 1000
+    # Limitdan keyingi chunk lar decode qilinmaydi
+    assert decoder.feed(payload[:10]) == b''
+
+
+def test_raw_deflate_fallback():
+    decoder = StreamDecoder('deflate', 1000)
+    assert decoder.feed(_raw_deflate(BODY)) == BODY[:1000]
+    assert decoder.finished
+
+
+def test_limit_exactly_at_body_size_is_not_truncated():
+    decoder = StreamDecoder('gzip', len(BODY))
+    assert _feed_chunks(decoder, gzip.compress(BODY)) == BODY
+    assert not decoder.finished
+
+
+def test_corrupt_and_unknown_encodings():
+    with pytest.raises(ContentDecodingError):
+        StreamDecoder('gzip', 1000).feed(b'not gzip data')
+    with pytest.raises(UnsupportedEncodingError):
+        StreamDecoder('compress', 1000)
@@ -0,0 +1,192 @@
+"""
+Design token lar - rang parse, klasterlash, spacing birligi va designSystem birlashtirish
+"""
+
+import numpy as np
+import pytest
+
+from design_tokens import (
+    DEFAULT_DESIGN_SYSTEM, ROLES, cluster_colors, design_system, detect_unit, find_colors,
+    parse_color, radius_scale, spacing_scale, tokens_from_stylesheets,
+)
+
+
+@pytest.mark.parametrize('text, expected', [
+    ('#3b82f6', (59, 130, 246, 1.0)),
+    ('#3B82F6', (59, 130, 246, 1.0)),
+    ('#fff', (255, 255, 255, 1.0)),
+    ('#f008', (255, 0, 0, 0x88 / 255)),
+    ('#00000080', (0, 0, 0, 0x80 / 255)),
+    ('  #000  ', (0, 0, 0, 1.0)),
+    ('rgb(59, 130, 246)', (59, 130, 246, 1.0)),
+    ('rgba(59, 130, 246, 0.5)', (59, 130, 246, 0.5)),
+    ('rgb(59 130 246 / 50%)', (59, 130, 246, 0.5)),
+    ('rgb(100%, 0%, 0%)', (255, 0, 0, 1.0)),
+    ('rgb(300, -5, 0)', (255, 0, 0, 1.0)),
+    ('rgba(0, 0, 0, 2)', (0, 0, 0, 1.0)),
+    ('hsl(0, 100%, 50%)', (255, 0, 0, 1.0)),
+    ('hsl(120deg 100% 25% / 0.25)', (0, 128, 0, 0.25)),
+    ('hsl(360, 0%, 100%)', (255, 255, 255, 1.0)),
+    ('White', (255, 255, 255, 1.0)),
+    ('black', (0, 0, 0, 1.0)),
+])
+def test_parse_color(text, expected):
+    red, green, blue, alpha = parse_color(text)
+    assert (red, green, blue) == expected[:3]
+    assert alpha == pytest.approx(expected[3])
+
+
+@pytest.mark.parametrize('text', [
+    '#12', '#12345', '#1234567', '#ggg', 'rgb(1, 2)', 'rgb(a, b, c)', 'hsl(red, 1%, 2%)',
+    'transparent', 'red', 'var(--primary)', '',
+])
+def test_parse_color_rejects_invalid(text):
+    assert parse_color(text) is None
+
+
+def test_find_colors_in_declarations():
+    assert find_colors('1px solid #ddd') == [(221, 221, 221, 1.0)]
+    assert find_colors('linear-gradient(#fff, rgba(0, 0, 0, .5))') == [(255, 255, 255, 1.0), (0, 0, 0, 0.5)]
+    assert find_colors('none') == []
+
+
+def _clusters(samples):
+    rgb = np.array([color for color, _, _ in samples])
+    weights = np.array([weight for _, weight, _ in samples], dtype=float)
+    roles = np.array([ROLES.index(role) for _, _, role in samples])
+    return cluster_colors(rgb, weights, roles)
+
+
+def test_cluster_colors_merges_near_colors_and_assigns_roles():
+    palette, roles = _clusters([
+        ((255, 255, 255), 1000, 'background'),
+        ((250, 250, 250), 100, 'background'),   # ΔE < 10 - oq bilan birlashadi
+        ((17, 24, 39), 300, 'text'),
+        ((59, 130, 246), 80, 'background'),
+        ((60, 131, 245), 20, 'border'),         # ko'k bilan birlashadi
+        ((239, 68, 68), 10, 'other'),
+    ])
+    assert [color['hex'] for color in palette] == ['#ffffff', '#111827', '#3b82f6', '#ef4444']
+    assert palette[0]['share'] == pytest.approx(1100 / 1510, abs=1e-4)
+    assert palette[2]['role'] == 'background'
+    assert roles == {
+        'background': '#ffffff',
+        'text': '#111827',
+        'primary': '#3b82f6',
+        'secondary': '#ef4444',
+    }
+
+
+def test_cluster_colors_falls_back_to_neutrals():
+    _, roles = _clusters([
+        ((255, 255, 255), 100, 'background'),
+        ((0, 0, 0), 50, 'text'),
+        ((128, 128, 128), 10, 'border'),
+    ])
+    assert roles == {'background': '#ffffff', 'text': '#000000', 'primary': '#808080'}
+
+
+def test_cluster_colors_empty():
+    assert cluster_colors(np.zeros((0, 3), dtype=int), np.array([]), np.array([], dtype=int)) == ([], {})
+
+
+@pytest.mark.parametrize('values, unit', [
+    ([8, 16, 24, 32, 8, 16], 8.0),
+    ([4, 8, 12, 20, 4, 28], 4.0),
+    ([5, 10, 15, 20, 25], 5.0),
+    ([12, 24, 36], 12.0),
+    ([9, 17, 25, 33], 8.0),         # 1px tolerance
+])
+def test_detect_unit(values, unit):
+    values = np.array(values, dtype=float)
+    assert detect_unit(values, np.ones(len(values))) == unit
+
+
+def test_spacing_scale_snaps_to_unit():
+    values = np.array([8, 16, 15, 24, 32, 0, 0, 500, -8], dtype=float)
+    unit, scale = spacing_scale(values, np.ones(len(values)))
+    assert unit == 8.0
+    assert scale == [8.0, 16.0, 24.0, 32.0]
+
+
+def test_spacing_scale_small_values_snap_to_one_unit():
+    values = np.array([2, 8, 16, 16], dtype=float)
+    unit, scale = spacing_scale(values, np.ones(len(values)))
+    assert unit == 8.0
+    assert scale == [8.0, 16.0]
+
+
+@pytest.mark.parametrize('values', [[], [0, 0], [200, 129], [-4]])
+def test_spacing_scale_without_usable_values(values):
+    values = np.array(values, dtype=float)
+    assert spacing_scale(values, np.ones(len(values))) == (None, [])
+
+
+def test_radius_scale_collapses_pills():
+    values = np.array([4, 4, 8, 100, 9999, 0], dtype=float)
+    assert radius_scale(values, np.ones(len(values))) == [4.0, 8.0, 9999.0]
+
+
+def test_design_system_defaults_without_tokens():
+    assert design_system(None) == DEFAULT_DESIGN_SYSTEM
+    assert design_system({}) == DEFAULT_DESIGN_SYSTEM
+    assert design_system(None) is not DEFAULT_DESIGN_SYSTEM
+
+
+def test_design_system_merges_measured_tokens():
+    result = design_system({
+        'roles': {'primary': '#ff0000', 'text': '#111111'},
+        'palette': [{'hex': '#ff0000'}, {'hex': '#111111'}],
+        'fonts': [{'family': 'Roboto, sans-serif'}, {'family': 'Georgia'}],
+        'font_sizes': [14.0, 16.0, 24.5],
+        'spacing_unit': 4.0,
+        'spacing_scale': [4.0, 8.0],
+        'radii': [6.0, 9999.0],
+    })
+    assert result == {
+        'colors': {'primary': '#ff0000', 'secondary': '#64748B', 'text': '#111111',
+                   'palette': ['#ff0000', '#111111']},
+        'typography': {'fontFamily': 'Roboto, sans-serif', 'fonts': ['Roboto, sans-serif', 'Georgia'],
+                       'scale': ['14px', '16px', '24.5px']},
+        'spacing': {'unit': '4px', 'scale': ['4px', '8px']},
+        'borderRadius': ['6px', '9999px'],
+    }
+    # Default lar o'zgartirilmaydi
+    assert DEFAULT_DESIGN_SYSTEM['colors'] == {'primary': '#3B82F6', 'secondary': '#64748B'}
+
+
+def test_design_system_drops_empty_sections():
+    result = design_system({'roles': {'primary': '#000000'}}, base={'colors': {}, 'layout': {}, 'name': 'x'})
+    assert result == {'colors': {'primary': '#000000'}}
+
+
+def test_tokens_from_stylesheets():
+    assert tokens_from_stylesheets([]) is None
+    assert tokens_from_stylesheets([{'rules': [{'selectors': ['a'], 'declarations': [
+        {'property': 'display', 'value': 'block'},
+    ]}]}]) is None
+
+    tokens = tokens_from_stylesheets([{'rules': [
+        {'selectors': ['body'], 'declarations': [
+            {'property': 'background-color', 'value': '#fff'},
+            {'property': 'color', 'value': '#111827'},
+            {'property': 'font-family', 'value': '"Inter", sans-serif'},
+            {'property': 'font-size', 'value': '1rem'},
+        ]},
+        {'selectors': ['.btn'], 'declarations': [
+            {'property': 'background', 'value': 'rgb(59, 130, 246)'},
+            {'property': 'padding', 'value': '8px 16px'},
+            {'property': 'margin', 'value': '0 auto 24px'},
+            {'property': 'border-radius', 'value': '6px / 4px'},
+            {'property': 'font-family', 'value': 'var(--font)'},
+        ]},
+    ]}])
+    assert tokens.source == 'stylesheets'
+    assert tokens.roles['background'] == '#ffffff'
+    assert tokens.roles['text'] == '#111827'
+    assert tokens.roles['primary'] == '#3b82f6'
+    assert tokens.fonts == [{'family': 'Inter, sans-serif', 'share': 1.0}]
+    assert tokens.font_sizes == [16.0]
+    assert tokens.spacing_unit == 8.0
+    assert tokens.spacing_scale == [8.0, 16.0, 24.0]
+    assert tokens.radii == [6.0]
@@ -0,0 +1,71 @@
+"""
+DiskStore - saqlash, LRU eviction va restartdan keyin hajm
+"""
+
+import os
+
+from disk_store import DiskStore
+
+
+def _age(store, key, seconds_ago):
+    meta_path, _ = store._paths(key)
+    mtime = os.path.getmtime(meta_path) - seconds_ago
+    os.utime(meta_path, (mtime, mtime))
+
+
+def test_put_get_update_delete(tmp_path):
+    store = DiskStore(str(tmp_path), 1024 * 1024)
+    assert store.get('a') is None
+
+    store.put('a', {'n': 1}, b'blob')
+    assert store.get('a') == ({'n': 1}, None)
+    assert store.get('a', with_blob=True) == ({'n': 1}, b'blob')
+
+    store.update_meta('a', {'n': 2})
+    assert store.get('a', with_blob=True) == ({'n': 2}, b'blob')
+
+    store.put('a', {'n': 3})
+    assert store.get('a', with_blob=True) == ({'n': 3}, None)
+
+    store.delete('a')
+    assert store.get('a') is None
+    assert store.stats()['total_bytes'] == 0
+
+
+def test_lru_eviction_drops_least_recently_used(tmp_path):
+    blob = b'x' * 1000
+    store = DiskStore(str(tmp_path), 3500)
+    for age, key in ((30, 'a'), (20, 'b'), (10, 'c')):
+        store.put(key, {'key': key}, blob)
+        _age(store, key, age)
+
+    # 'a' eng eski, lekin o'qilgani uchun eng yangi bo'ladi
+    assert store.get('a') is not None
+    store.put('d', {'key': 'd'}, blob)
+
+    assert store.get('b') is None
+    assert store.get('a') is not None
+    assert store.get('d') is not None
+    assert store.stats()['total_bytes'] <= 3500
+
+
+def test_corrupted_entry_is_dropped(tmp_path):
+    store = DiskStore(str(tmp_path), 1024 * 1024)
+    store.put('a', {'n': 1})
+    meta_path, _ = store._paths('a')
+    with open(meta_path, 'wb') as f:
+        f.write(b'{not json')
+    assert store.get('a') is None
+    assert not os.path.exists(meta_path)
+
+
+def test_size_is_rescanned_on_restart(tmp_path):
+    store = DiskStore(str(tmp_path), 1024 * 1024)
+    store.put('a', {'n': 1}, b'x' * 500)
+    store.put('b', {'n': 2}, b'y' * 700)
+    total = store.stats()['total_bytes']
+    assert total > 1200
+
+    reopened = DiskStore(str(tmp_path), 1024 * 1024)
+    assert reopened.stats()['total_bytes'] == total
+    assert reopened.get('b', with_blob=True) == ({'n': 2}, b'y' * 700)
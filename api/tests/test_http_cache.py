@@ -0,0 +1,46 @@
+"""
+HTTPCache - validator lar bilan put / refresh
+"""
+
+from http_cache import HTTPCache
+
+URL = 'https://www.example.com/page?utm_source=x'
+
+
+def _cache(tmp_path):
+    return HTTPCache(directory=str(tmp_path), max_bytes=1024 * 1024)
+
+
+def test_put_with_any_header_spelling(tmp_path):
+    cache = _cache(tmp_path)
+    for headers in ({'ETag': '"a"'}, {'Etag': '"a"'}, {'etag': '"a"'}):
+        cache.put(URL, headers, b'<html></html>', {'title': 'x'})
+        entry = cache.get(URL)
+        assert entry is not None and entry.etag == '"a"'
+        cache.delete(URL)
+
+    cache.put(URL, {'Last-modified': 'Mon, 01 Jan 2024 00:00:00 GMT'}, b'', {})
+    entry = cache.get(URL)
+    assert entry.conditional_headers() == {'If-Modified-Since': 'Mon, 01 Jan 2024 00:00:00 GMT'}
+
+
+def test_put_requires_validator_and_respects_no_store(tmp_path):
+    cache = _cache(tmp_path)
+    cache.put(URL, {'Content-Type': 'text/html'}, b'', {})
+    assert cache.get(URL) is None
+    cache.put(URL, {'ETag': '"a"', 'cache-control': 'private, no-store'}, b'', {})
+    assert cache.get(URL) is None
+
+
+def test_refresh_keeps_payload_and_updates_validators(tmp_path):
+    cache = _cache(tmp_path)
+    cache.put(URL, {'ETag': '"a"'}, b'body', {'title': 'x'})
+    entry = cache.get(URL)
+    cache.refresh(entry, {'Etag': '"b"'})
+    refreshed = cache.get(URL)
+    assert refreshed.etag == '"b"'
+    assert refreshed.payload == {'title': 'x'}
+    assert refreshed.stored_at >= entry.stored_at
+    assert cache.get_body(URL) == b'body'
+    # Tracking parametrsiz URL - bir xil yozuv
+    assert cache.get('https://www.example.com/page').etag == '"b"'
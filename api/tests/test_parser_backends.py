@@ -0,0 +1,167 @@
+"""
+Parser backend equivalence - bir xil fixture html.parser, lxml va selectolax da
+bir xil extraction, matn va fingerprint berishi kerak
+"""
+
+import os
+from dataclasses import asdict
+
+import pytest
+
+from adaptive_render import ShellSignalCollector, collect_signals
+from analysis_store import FINGERPRINT_SKIP_TAGS, ContentFingerprint, content_fingerprint
+from dom_distill import SkeletonCollector, distill_dom
+from dom_extract import PageExtractor, visit_document
+from html_parsers import BACKENDS, content_type_charset, get_parser_backend
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+# no_charset.html - <meta charset> siz UTF-8 (encoding HTTP header yoki default dan)
+FIXTURE_NAMES = ('article.html', 'spa_shell.html', 'no_charset.html')
+BASE_URL = 'https://www.example.com/page'
+BASELINE = 'html.parser'
+
+
+def _backend(name):
+    try:
+        return get_parser_backend(name)
+    except ImportError as e:
+        pytest.skip(str(e))
+
+
+def _load(fixture):
+    with open(os.path.join(FIXTURES, fixture), 'rb') as f:
+        return f.read()
+
+
+def _normalize(text):
+    # Backend lar orasidagi whitespace-only node farqlari (head / body orasidagi yangi qatorlar)
+    return ' '.join(text.split())
+
+
+def _node_text(doc, skip):
+    return _normalize(' '.join(node for node in doc.iter_nodes(skip) if isinstance(node, str)))
+
+
+def _extract(doc):
+    result = asdict(PageExtractor(BASE_URL).extract(doc))
+    result['text'] = _normalize(result['text'])
+    return result
+
+
+OTHER_BACKENDS = [name for name in BACKENDS if name != BASELINE]
+
+
+@pytest.mark.parametrize('fixture', FIXTURE_NAMES)
+@pytest.mark.parametrize('backend', OTHER_BACKENDS)
+class TestBackendEquivalence:
+    def test_page_extract(self, fixture, backend):
+        html = _load(fixture)
+        expected = _extract(_backend(BASELINE).parse(html))
+        assert _extract(_backend(backend).parse(html)) == expected
+
+    def test_document_text(self, fixture, backend):
+        html = _load(fixture)
+        expected = _backend(BASELINE).parse(html)
+        actual = _backend(backend).parse(html)
+        assert _normalize(actual.text()) == _normalize(expected.text())
+        for skip in (('script', 'style'), FINGERPRINT_SKIP_TAGS):
+            assert _node_text(actual, skip) == _node_text(expected, skip)
+
+    def test_fingerprint(self, fixture, backend):
+        html = _load(fixture)
+        # min_text_chars=0 - shell fixture ham hash lanadi (backend farqi ko'rinishi uchun)
+        expected = content_fingerprint(_backend(BASELINE).parse(html), BASE_URL, min_text_chars=0)
+        assert content_fingerprint(_backend(backend).parse(html), BASE_URL, min_text_chars=0) == expected
+
+    def test_shell_signals(self, fixture, backend):
+        html = _load(fixture)
+        expected = collect_signals(_backend(BASELINE).parse(html), len(html))
+        actual = collect_signals(_backend(backend).parse(html), len(html))
+        assert actual.text_chars == expected.text_chars
+        assert actual.scripts == expected.scripts
+        assert actual.empty_roots == expected.empty_roots
+        assert actual.noscript_warning == expected.noscript_warning
+
+
+@pytest.mark.parametrize('backend', list(BACKENDS))
+def test_skip_tags_exclude_nested_text(backend):
+    doc = _backend(backend).parse(_load('article.html'))
+    text = _node_text(doc, FINGERPRINT_SKIP_TAGS)
+    assert 'JavaScript' not in text
+    assert 'should not appear' not in text
+    # <template> ichi inert - default skip da ham chiqmaydi
+    assert 'Template content' not in _normalize(doc.text())
+
+
+@pytest.mark.parametrize('fixture', FIXTURE_NAMES)
+@pytest.mark.parametrize('backend', list(BACKENDS))
+def test_feeder_matches_parse(fixture, backend):
+    html = _load(fixture)
+    parser = _backend(backend)
+    feeder = parser.feeder()
+    for start in range(0, len(html), 97):
+        feeder.feed(html[start:start + 97])
+    assert _extract(feeder.close()) == _extract(parser.parse(html))
+
+
+@pytest.mark.parametrize('fixture', FIXTURE_NAMES)
+@pytest.mark.parametrize('backend', list(BACKENDS))
+def test_single_pass_matches_separate_walks(fixture, backend):
+    # Har visitor o'z skip taglari bilan - birgalikdagi aylanish alohida aylanishlar bilan bir xil
+    html = _load(fixture)
+    parser = _backend(backend)
+    doc = parser.parse(html)
+    extractor = PageExtractor(BASE_URL)
+    fingerprint = ContentFingerprint(BASE_URL, min_text_chars=0)
+    skeleton = SkeletonCollector()
+    signals = ShellSignalCollector(len(html))
+    visit_document(doc, [extractor, fingerprint, skeleton, signals])
+
+    assert asdict(extractor.result()) == asdict(PageExtractor(BASE_URL).extract(parser.parse(html)))
+    assert fingerprint.hexdigest() == content_fingerprint(parser.parse(html), BASE_URL, min_text_chars=0)
+    assert signals.signals.to_dict() == collect_signals(parser.parse(html), len(html)).to_dict()
+    assert distill_dom(doc, 800, collector=skeleton) == distill_dom(parser.parse(html), 800)
+
+
+@pytest.mark.parametrize('backend', list(BACKENDS))
+def test_fingerprint_shells_and_mirrors(backend):
+    parser = _backend(backend)
+    shell = parser.parse(_load('spa_shell.html'))
+    article = _load('article.html')
+    # Boilerplate shell - kalit yo'q, boshqa shell ning analysis i qaytmaydi
+    assert content_fingerprint(shell, BASE_URL) == ''
+    # www / apex va mirror dagi bir xil kontent - bir xil kalit
+    key = content_fingerprint(parser.parse(article), BASE_URL)
+    assert key
+    assert content_fingerprint(parser.parse(article), 'http://example.com/page') == key
+    assert content_fingerprint(parser.parse(article), 'https://mirror.example.org/page') == key
+
+
+@pytest.mark.parametrize('backend', list(BACKENDS))
+def test_non_ascii_without_meta_charset(backend):
+    html = _load('no_charset.html')
+    parser = _backend(backend)
+    for doc in (parser.parse(html), parser.parse(html, encoding='utf-8')):
+        assert doc.find('title').text() == 'Привет — café'
+        assert 'Заголовок “в кавычках”' in doc.text()
+    feeder = parser.feeder()
+    for start in range(0, len(html), 7):
+        feeder.feed(html[start:start + 7])
+    assert feeder.close().find('title').text() == 'Привет — café'
+
+
+@pytest.mark.parametrize('backend', list(BACKENDS))
+def test_http_charset_overrides_default(backend):
+    html = '<html><head><title>Привет</title></head><body><p>Текст</p></body></html>'.encode('windows-1251')
+    parser = _backend(backend)
+    assert parser.parse(html, encoding='windows-1251').find('title').text() == 'Привет'
+    feeder = parser.feeder(encoding='windows-1251')
+    feeder.feed(html)
+    assert feeder.close().find('title').text() == 'Привет'
+
+
+def test_content_type_charset():
+    assert content_type_charset('text/html; charset="Windows-1251"') == 'Windows-1251'
+    assert content_type_charset('text/html;charset=utf-8') == 'utf-8'
+    assert content_type_charset('text/html') is None
+    assert content_type_charset(None) is None
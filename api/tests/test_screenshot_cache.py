@@ -0,0 +1,189 @@
+"""
+ScreenshotCache - TTL, HEAD revalidatsiya va screenshot encoding
+"""
+
+import io
+import threading
+
+import pytest
+from PIL import Image
+
+import screenshot_encode
+from screenshot_cache import ScreenshotCache, Viewport
+from screenshot_encode import ScreenshotEncoder, UnsupportedImageFormat, encode_screenshot, format_info
+
+URL = 'https://example.com/page'
+VIEWPORT = Viewport(1280, 800)
+
+
+class FakeResponse:
+    def __init__(self, status_code, headers=None):
+        self.status_code = status_code
+        self.headers = headers or {}
+
+    def close(self):
+        pass
+
+
+class FakeHttpPool:
+    """HEAD so'rovlarini yozib boradi, oldindan berilgan javobni qaytaradi"""
+
+    def __init__(self, response=None, error=None):
+        self.response = response
+        self.error = error
+        self.requests = []
+
+    def request(self, method, url, headers=None, **kwargs):
+        self.requests.append((method, url, headers))
+        if self.error:
+            raise self.error
+        return self.response
+
+
+def _cache(tmp_path, pool=None, ttl=600):
+    return ScreenshotCache(pool or FakeHttpPool(), directory=str(tmp_path), max_bytes=1024 * 1024, ttl=ttl)
+
+
+def _png(width=64, height=32):
+    output = io.BytesIO()
+    Image.new('RGB', (width, height), (59, 130, 246)).save(output, 'PNG')
+    return output.getvalue()
+
+
+def test_fresh_hit_and_miss(tmp_path):
+    pool = FakeHttpPool()
+    cache = _cache(tmp_path, pool)
+    assert cache.get(URL, VIEWPORT) == (None, None)
+
+    cache.put(URL, VIEWPORT, b'png-bytes', extra={'title': 'Page'})
+    png, meta = cache.get(URL + '#top', VIEWPORT)
+    assert png == b'png-bytes'
+    assert meta['cache'] == 'hit'
+    assert meta['title'] == 'Page'
+    assert cache.get(URL, Viewport(390, 844, 3.0, mobile=True)) == (None, None)
+    assert cache.get(URL, VIEWPORT, variant='no-fonts') == (None, None)
+    assert pool.requests == []
+    assert cache.stats()['hits'] == 1
+    assert cache.stats()['misses'] == 3
+
+
+def test_stale_entry_without_validators_is_dropped(tmp_path):
+    cache = _cache(tmp_path, ttl=0)
+    cache.put(URL, VIEWPORT, b'png-bytes')
+    png, meta = cache.get(URL, VIEWPORT)
+    assert png is None
+    assert meta['url'] == URL
+    assert cache.get(URL, VIEWPORT) == (None, None)
+
+
+def test_stale_entry_revalidated_with_304(tmp_path):
+    pool = FakeHttpPool(FakeResponse(304))
+    cache = _cache(tmp_path, pool, ttl=0)
+    cache.put(URL, VIEWPORT, b'png-bytes', validators={'etag': '"v1"', 'last_modified': 'Mon, 01 Jan 2024 00:00:00 GMT'})
+
+    png, meta = cache.get(URL, VIEWPORT)
+    assert png == b'png-bytes'
+    assert meta['cache'] == 'revalidated'
+    method, url, headers = pool.requests[0]
+    assert (method, url) == ('HEAD', URL)
+    assert headers == {'If-None-Match': '"v1"', 'If-Modified-Since': 'Mon, 01 Jan 2024 00:00:00 GMT'}
+
+
+@pytest.mark.parametrize('etag, reused', [('"v1"', True), ('"v2"', False)])
+def test_revalidation_compares_etag_when_server_ignores_conditionals(tmp_path, etag, reused):
+    pool = FakeHttpPool(FakeResponse(200, {'ETag': etag}))
+    cache = _cache(tmp_path, pool)
+    cache.put(URL, VIEWPORT, b'png-bytes', validators={'etag': '"v1"'})
+
+    png, meta = cache.get(URL, VIEWPORT, revalidate=True)
+    if reused:
+        assert png == b'png-bytes' and meta['cache'] == 'revalidated'
+    else:
+        assert png is None and meta['etag'] == '"v1"'
+        assert cache.stats()['stale'] == 1
+
+
+def test_failed_head_keeps_fresh_entry(tmp_path):
+    pool = FakeHttpPool(error=ConnectionError('offline'))
+    cache = _cache(tmp_path, pool)
+    cache.put(URL, VIEWPORT, b'png-bytes', validators={'etag': '"v1"'})
+
+    png, meta = cache.get(URL, VIEWPORT, revalidate=True)
+    assert png == b'png-bytes'
+    assert meta['cache'] == 'hit'
+
+
+def test_fetch_validators(tmp_path):
+    pool = FakeHttpPool(FakeResponse(200, {'ETag': '"v3"', 'Last-Modified': 'Tue, 02 Jan 2024 00:00:00 GMT'}))
+    assert _cache(tmp_path, pool).fetch_validators(URL) == {
+        'etag': '"v3"', 'last_modified': 'Tue, 02 Jan 2024 00:00:00 GMT',
+    }
+
+
+@pytest.mark.parametrize('fmt, mime_type, magic', [
+    ('webp', 'image/webp', b'RIFF'),
+    ('jpg', 'image/jpeg', b'\xff\xd8'),
+    ('png', 'image/png', b'\x89PNG'),
+])
+def test_encode_screenshot_formats(fmt, mime_type, magic):
+    png = _png()
+    image = encode_screenshot(png, fmt)
+    assert image.mime_type == mime_type
+    assert image.data.startswith(magic)
+    assert (image.width, image.height) == (64, 32)
+    assert image.source_bytes == len(png)
+    assert image.to_dict()['bytes'] == len(image.data)
+
+
+def test_encode_screenshot_resizes_proportionally():
+    image = encode_screenshot(_png(200, 100), 'png', max_width=50)
+    assert (image.width, image.height) == (50, 25)
+    # MIN_WIDTH dan kichraytirilmaydi
+    image = encode_screenshot(_png(200, 100), 'png', max_width=1)
+    assert image.width == 16
+
+
+def test_encode_screenshot_rejects_unknown_format():
+    with pytest.raises(UnsupportedImageFormat):
+        encode_screenshot(_png(), 'gif')
+
+
+def test_blob_store_evicts_oldest():
+    encoder = ScreenshotEncoder(workers=1, blob_entries=2, blob_ttl=60)
+    image = encode_screenshot(_png(), 'png')
+    first, second, third = (encoder.put_blob(image) for _ in range(3))
+    assert encoder.get_blob(first) is None
+    assert encoder.get_blob(second) is image
+    assert encoder.get_blob(third) is image
+    assert encoder.stats() == {'blobs': 2, 'pending_blobs': 0, 'blob_bytes': 2 * len(image.data)}
+
+
+def test_submit_blob_returns_before_encoding_finishes(monkeypatch):
+    started, release = threading.Event(), threading.Event()
+
+    def slow_encode(*args):
+        started.set()
+        release.wait(5)
+        return encode_screenshot(*args)
+
+    monkeypatch.setattr(screenshot_encode, 'encode_screenshot', slow_encode)
+    encoder = ScreenshotEncoder(workers=1, blob_entries=5, blob_ttl=60)
+    blob_id = encoder.submit_blob(_png(), 'jpg')
+    assert started.wait(5)
+    assert encoder.stats()['pending_blobs'] == 1
+
+    release.set()
+    image = encoder.get_blob(blob_id)
+    assert image.mime_type == format_info('jpg')['mime_type'] == 'image/jpeg'
+    assert encoder.stats() == {'blobs': 1, 'pending_blobs': 0, 'blob_bytes': len(image.data)}
+
+
+def test_failed_blob_encoding_is_raised_and_dropped():
+    encoder = ScreenshotEncoder(workers=1, blob_entries=5, blob_ttl=60)
+    with pytest.raises(UnsupportedImageFormat):
+        encoder.submit_blob(_png(), 'gif')
+
+    blob_id = encoder.submit_blob(b'not a png', 'png')
+    with pytest.raises(Exception):
+        encoder.get_blob(blob_id)
+    assert encoder.get_blob(blob_id) is None
@@ -0,0 +1,42 @@
+"""
+server.py so'rov parametrlari - noto'g'ri viewport 400 qaytaradi
+"""
+
+import pytest
+
+import server
+from screenshot_cache import VIEWPORT_PRESETS
+
+
+@pytest.fixture
+def client():
+    server.limiter.enabled = False
+    try:
+        yield server.app.test_client()
+    finally:
+        server.limiter.enabled = True
+
+
+def test_parse_viewport():
+    assert server.parse_viewport(None) == server.DEFAULT_VIEWPORT
+    assert server.parse_viewport('mobile') == VIEWPORT_PRESETS['mobile']
+    viewport = server.parse_viewport({'width': 100, 'height': 5000, 'device_scale_factor': 2, 'mobile': 'true'})
+    assert (viewport.width, viewport.height, viewport.device_scale_factor, viewport.mobile) == (240, 4320, 2.0, True)
+
+
+@pytest.mark.parametrize('value', ['watch', [1280, 800], 1280, True, {'width': 'wide'}])
+def test_parse_viewport_rejects_invalid(value):
+    with pytest.raises(ValueError):
+        server.parse_viewport(value)
+
+
+@pytest.mark.parametrize('path, body', [
+    ('/api/screenshot', {'viewport': [1280, 800]}),
+    ('/api/screenshot/image', {'viewport': 'watch'}),
+    ('/api/screenshot/multi', {'viewports': ['desktop', [390, 844]]}),
+    ('/api/capture', {'viewport': 1280}),
+])
+def test_invalid_viewport_is_bad_request(client, path, body):
+    response = client.post(path, json={'url': 'https://example.com', **body})
+    assert response.status_code == 400
+    assert response.get_json()['success'] is False
@@ -0,0 +1,50 @@
+"""
+SiteCrawler - frontier kaliti va yuklanadigan URL lar
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+from fetch_engine import AsyncFetchEngine
+from site_crawler import SiteCrawler, _frontier_key
+
+
+def test_frontier_key_matches_same_site_rules():
+    key = _frontier_key('https://example.com/a')
+    assert _frontier_key('http://example.com/a') == key
+    assert _frontier_key('https://www.example.com/a#top') == key
+    assert _frontier_key('http://WWW.example.com:80/a?utm_source=x') == key
+    assert _frontier_key('https://example.com/b') != key
+    assert _frontier_key('https://example.com:8443/a') != key
+    assert _frontier_key('https://example.com/a?b=2&a=1') == _frontier_key('http://example.com/a?a=1&b=2')
+
+
+class FakeScraper:
+    def __init__(self, engine, links):
+        self.engine = engine
+        self.links = links
+        self.fetched = []
+
+    async def scrape_website_async(self, url):
+        self.fetched.append(url)
+        await asyncio.sleep(0)
+        return SimpleNamespace(internal_links=self.links.get(url, []))
+
+
+def test_crawl_fetches_discovered_links_once():
+    engine = AsyncFetchEngine()
+    scraper = FakeScraper(engine, {
+        'https://example.com/': [
+            'http://example.com/a?z=1&y=2#frag',
+            'https://www.example.com/a?y=2&z=1',
+            'https://example.com/logo.png',
+            'https://other.example.org/',
+        ],
+    })
+    try:
+        result = SiteCrawler(scraper, max_pages=10, max_depth=2, politeness_delay=0).crawl('https://example.com/')
+    finally:
+        engine.close()
+    # Birinchi topilgan variant o'zgartirilmasdan yuklanadi, qolganlari takror
+    assert scraper.fetched == ['https://example.com/', 'http://example.com/a?z=1&y=2#frag']
+    assert result.discovered == 2
@@ -0,0 +1,77 @@
+"""
+URL canonicalization, same_site va UrlResolver
+"""
+
+import pytest
+
+from url_normalize import UrlResolver, canonicalize_url, is_tracking_param, parse_origin
+
+
+@pytest.mark.parametrize('url, expected', [
+    ('HTTPS://Example.COM', 'https://example.com/'),
+    ('https://example.com:443/a', 'https://example.com/a'),
+    ('http://example.com:80/a', 'http://example.com/a'),
+    ('http://example.com:8080/a', 'http://example.com:8080/a'),
+    ('https://example.com./a', 'https://example.com/a'),
+    ('https://example.com/a#section', 'https://example.com/a'),
+    ('https://example.com/a?b=2&a=1', 'https://example.com/a?a=1&b=2'),
+    ('https://example.com/a?utm_source=x&id=5&gclid=y&fbclid=z', 'https://example.com/a?id=5'),
+    ('https://example.com/a?utm_source=x', 'https://example.com/a'),
+    ('https://example.com/a?flag=', 'https://example.com/a?flag='),
+    ('https://user@Example.com:443/', 'https://user@example.com/'),
+    ('https://[::1]:8443/x', 'https://[::1]:8443/x'),
+    ('  https://example.com/Path  ', 'https://example.com/Path'),
+])
+def test_canonicalize_url(url, expected):
+    assert canonicalize_url(url) == expected
+
+
+def test_canonicalize_can_keep_tracking_params():
+    assert canonicalize_url('https://example.com/?utm_source=x', strip_tracking=False) == \
+        'https://example.com/?utm_source=x'
+
+
+@pytest.mark.parametrize('name, tracking', [
+    ('utm_campaign', True), ('UTM_Source', True), ('gclid', True), ('pk_kwd', True),
+    ('id', False), ('page', False), ('ref', False),
+])
+def test_is_tracking_param(name, tracking):
+    assert is_tracking_param(name) is tracking
+
+
+@pytest.mark.parametrize('a, b, same', [
+    ('https://example.com/', 'https://www.example.com/x', True),
+    ('http://example.com/', 'https://example.com/', True),
+    ('http://example.com:80/', 'https://www.example.com:443/', True),
+    ('http://example.com:8080/', 'http://example.com:8080/a', True),
+    ('http://example.com:8080/', 'http://example.com/', False),
+    ('http://example.com:8080/', 'http://example.com:9090/', False),
+    ('https://example.com/', 'https://blog.example.com/', False),
+    ('https://example.com/', 'https://example.org/', False),
+])
+def test_same_site(a, b, same):
+    assert parse_origin(a).same_site(parse_origin(b)) is same
+    assert parse_origin(b).same_site(parse_origin(a)) is same
+
+
+def test_parse_origin():
+    origin = parse_origin('HTTPS://WWW.Example.com/path?q=1')
+    assert (origin.scheme, origin.host, origin.port) == ('https', 'www.example.com', 443)
+    assert origin.site == 'example.com'
+    assert origin.has_default_port
+    assert parse_origin('mailto:someone@example.com') is None
+    assert parse_origin('ftp://example.com/') is None
+
+
+def test_url_resolver():
+    resolver = UrlResolver('https://www.example.com/blog/post')
+    assert resolver.resolve('/about') == 'https://www.example.com/about'
+    assert resolver.resolve('next') == 'https://www.example.com/blog/next'
+    assert resolver.resolve('../up') == 'https://www.example.com/up'
+    assert resolver.resolve('//cdn.example.net/x.js') == 'https://cdn.example.net/x.js'
+    assert resolver.resolve(' https://other.com/ ') == 'https://other.com/'
+
+    assert resolver.is_internal('https://example.com/x')
+    assert resolver.is_internal('http://www.example.com/y?z=1')
+    assert not resolver.is_internal('https://cdn.example.net/x.js')
+    assert not resolver.is_internal('mailto:someone@example.com')
@@ -0,0 +1,140 @@
+"""
+🔗 URL Normalization
+Scraper, crawler va cache kalitlari uchun yagona URL canonicalization va origin taqqoslash
+
+- canonicalize_url - scheme/host kichik harf, default port yo'q, fragment yo'q,
+  tracking parametrlar (utm_*, gclid, fbclid, ...) olib tashlangan, query tartiblangan
+- Origin           - (scheme, host, port); www / apex, default port va http/https
+  variantlari bir xil sayt hisoblanadi
+- UrlResolver      - sahifa base URL i bir marta parse qilinadi, origin lar memoize qilinadi
+"""
+
+from functools import lru_cache
+from typing import Dict, NamedTuple, Optional
+from urllib.parse import parse_qsl, urlencode, urljoin, urlsplit, urlunsplit
+
+DEFAULT_PORTS = {'http': 80, 'https': 443}
+
+TRACKING_PARAMS = frozenset((
+    'gclid', 'dclid', 'gbraid', 'wbraid', 'fbclid', 'msclkid', 'yclid', 'igshid', 'twclid',
+    'mc_cid', 'mc_eid', '_ga', '_gl', '_hsenc', '_hsmi', 'mkt_tok', 'ref_src', 'spm', 'srsltid',
+))
+TRACKING_PREFIXES = ('utm_', 'pk_', 'hsa_')
+
+
+def is_tracking_param(name: str) -> bool:
+    name = name.lower()
+    return name in TRACKING_PARAMS or name.startswith(TRACKING_PREFIXES)
+
+
+class Origin(NamedTuple):
+    """URL origin i (port doim aniq ko'rsatilgan)"""
+    scheme: str
+    host: str
+    port: Optional[int]
+
+    @property
+    def site(self) -> str:
+        """www siz host - sayt identifikatori"""
+        return self.host[4:] if self.host.startswith('www.') else self.host
+
+    @property
+    def has_default_port(self) -> bool:
+        return self.port is None or self.port == DEFAULT_PORTS.get(self.scheme)
+
+    def same_site(self, other: 'Origin') -> bool:
+        """Bir xil sayt: www / apex, http / https va default port farqlari e'tiborga olinmaydi"""
+        if self.site != other.site or not self.site:
+            return False
+        if self.has_default_port and other.has_default_port:
+            return True
+        return self.port == other.port
+
+
+@lru_cache(maxsize=4096)
+def _origin(scheme: str, netloc: str) -> Origin:
+    scheme = scheme.lower()
+    hostport = netloc.rpartition('@')[2].lower()
+    host, port = hostport, None
+    if hostport.startswith('['):
+        # IPv6 - [::1]:8080
+        end = hostport.find(']')
+        host = hostport[:end + 1]
+        rest = hostport[end + 1:]
+        if rest.startswith(':') and rest[1:].isdigit():
+            port = int(rest[1:])
+    elif ':' in hostport:
+        name, _, value = hostport.rpartition(':')
+        if value.isdigit():
+            host, port = name, int(value)
+        elif not value:
+            host = name
+    if port is None:
+        port = DEFAULT_PORTS.get(scheme)
+    return Origin(scheme, host.rstrip('.'), port)
+
+
+def parse_origin(url: str) -> Optional[Origin]:
+    """URL ning origin i (http / https bo'lmasa None) - natijalar memoize qilinadi"""
+    scheme, sep, rest = url.partition('://')
+    if not sep or scheme.lower() not in DEFAULT_PORTS:
+        return None
+    netloc = rest.split('/', 1)[0].split('?', 1)[0].split('#', 1)[0]
+    return _origin(scheme, netloc)
+
+
+@lru_cache(maxsize=16384)
+def canonicalize_url(url: str, strip_tracking: bool = True) -> str:
+    """URL ni yagona ko'rinishga keltirish (crawler frontier, cache kalitlari uchun)"""
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    netloc = parts.netloc
+    if scheme in DEFAULT_PORTS:
+        origin = _origin(scheme, netloc)
+        userinfo = netloc.rpartition('@')[0]
+        netloc = origin.host
+        if not origin.has_default_port:
+            netloc += f':{origin.port}'
+        if userinfo:
+            netloc = f'{userinfo}@{netloc}'
+    else:
+        netloc = netloc.lower()
+
+    query = parts.query
+    if query:
+        params = parse_qsl(query, keep_blank_values=True)
+        if strip_tracking:
+            params = [(name, value) for name, value in params if not is_tracking_param(name)]
+        query = urlencode(sorted(params), doseq=True)
+    return urlunsplit((scheme, netloc, parts.path or '/', query, ''))
+
+
+class UrlResolver:
+    """Bitta sahifa uchun: nisbiy URL larni resolve qilish va ichki / tashqi ajratish"""
+
+    def __init__(self, base_url: str):
+        self.base_url = base_url
+        parts = urlsplit(base_url)
+        self.scheme = parts.scheme.lower()
+        self.origin = _origin(self.scheme, parts.netloc)
+        self._prefix = f'{parts.scheme}://{parts.netloc}'
+        self._internal: Dict[str, bool] = {}  # 'scheme://netloc' -> ichkimi
+
+    def resolve(self, href: str) -> str:
+        """href -> absolute URL (eng ko'p uchraydigan holatlar urljoin siz)"""
+        href = href.strip()
+        if href.startswith('/') and not href.startswith('//') and '/.' not in href:
+            return self._prefix + href
+        if href.startswith(('http://', 'https://')) and '/.' not in href:
+            return href
+        return urljoin(self.base_url, href)
+
+    def is_internal(self, absolute_url: str) -> bool:
+        """absolute_url sahifa bilan bir xil saytdami"""
+        scheme, sep, rest = absolute_url.partition('://')
+        key = scheme + sep + rest.split('/', 1)[0].split('?', 1)[0].split('#', 1)[0]
+        internal = self._internal.get(key)
+        if internal is None:
+            origin = parse_origin(key)
+            internal = self._internal[key] = origin is not None and origin.same_site(self.origin)
+        return internal
@@ -17,13 +17,11 @@ export class AIWebsiteAnalyzer {
 	 */
 	async analyzeWebsite(url: string): Promise<WebsiteAnalysis> {
 		try {
-			// 1. Website screenshot olish
-			const screenshot = await this.captureScreenshot(url);
+			// 1. Screenshot va render qilingan content - bitta brauzer yuklashida
+			const { screenshot, content: htmlContent } =
+				await this.captureWebsite(url);
 
-			// 2. HTML content olish
-			const htmlContent = await this.fetchWebsiteContent(url);
-
-			// 3. AI orqali analiz qilish
+			// 2. AI orqali analiz qilish
 			const analysis = await this.performAIAnalysis(
 				url,
 				htmlContent,
@@ -45,40 +43,24 @@ export class AIWebsiteAnalyzer {
 	}
 
 	/**
-	 * Website screenshot oladi
-	 */
-	private async captureScreenshot(url: string): Promise<string> {
-		// Puppeteer yoki Playwright ishlatish mumkin
-		const response = await fetch(`${this.baseUrl}/api/screenshot`, {
-			method: 'POST',
-			headers: { 'Content-Type': 'application/json' },
-			body: JSON.stringify({ url }),
-		});
-
-		if (!response.ok) {
-			throw new Error('Screenshot capture failed');
-		}
-
-		const { screenshot } = await response.json();
-		return screenshot;
-	}
-
-	/**
-	 * Website HTML content ni oladi
+	 * Website screenshot va content ni bitta so'rovda oladi
+	 * (sahifa brauzerda bir marta yuklanadi, content render qilingan DOM dan)
 	 */
-	private async fetchWebsiteContent(url: string): Promise<string> {
-		const response = await fetch(`${this.baseUrl}/api/fetch-content`, {
+	private async captureWebsite(
+		url: string,
+	): Promise<{ screenshot: string; content: string }> {
+		const response = await fetch(`${this.baseUrl}/api/capture`, {
 			method: 'POST',
 			headers: { 'Content-Type': 'application/json' },
 			body: JSON.stringify({ url }),
 		});
 
 		if (!response.ok) {
-			throw new Error('Content fetch failed');
+			throw new Error('Website capture failed');
 		}
 
-		const { content } = await response.json();
-		return content;
+		const { screenshot, content } = await response.json();
+		return { screenshot, content };
 	}
 
 	/**